@@ -6,7 +6,8 @@ to be used inside the Logic Engine. These laws can evolve based on entropy,
 user prompts, or simulation conditions. Can be upgraded with LLM APIs.
 """
 
-from law_core import Law
+from law_core import Law, get_column
+import numpy as np
 import random
 
 class AILawGenerator:
@@ -26,8 +27,17 @@ class AILawGenerator:
                 context["mutation"] = context.get("mutation", 1.0) * random.uniform(0.9, 1.1)
             return context
 
+        def batch_logic(columns):
+            mutating = get_column(columns, "entropy", 0.0) > seed_entropy
+            if mutating.any():
+                mutated = get_column(columns, "mutation", 1.0) * np.random.uniform(0.9, 1.1, len(mutating))
+                # Other rows keep their value, or stay without one (None) as in logic_function
+                kept = columns.get("mutation", np.full(len(mutating), None, dtype=object))
+                columns["mutation"] = np.where(mutating, mutated, kept)
+            return columns
+
         self.generated_count += 1
-        return Law(law_name, description, logic_function)
+        return Law(law_name, description, logic_function, batch_logic)
 
     def batch_generate(self, count=3):
         return [self.generate_law() for _ in range(count)]
@@ -7,21 +7,98 @@ It ensures persistence, traceability, and tamper-resistance for all critical
 simulation transactions.
 """
 
+import struct
+import bisect
 import hashlib
 import time
+from array import array
+from payload_codec import encode_payload
+
+_BLOCK_HEADER = struct.Struct("<qd")  # index, timestamp
+
+# Merkle trees hash leaves and inner nodes with distinct prefixes, so an inner node
+# can never be passed off as a block hash
+def _leaf(block_hash):
+    return hashlib.sha256(b"\x00" + bytes.fromhex(block_hash)).digest()
+
+def _node(left, right):
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def _merkle_levels(leaves):
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])  # an unpaired node is promoted unchanged
+        levels.append(parents)
+    return levels
+
+def merkle_root(block_hashes):
+    """
+    Merkle root (hex) over a sequence of block hashes.
+    """
+    if not block_hashes:
+        return hashlib.sha256(b"").hexdigest()
+    return _merkle_levels([_leaf(h) for h in block_hashes])[-1][0].hex()
+
+def merkle_proof(block_hashes, position):
+    """
+    Sibling path proving block_hashes[position] is under merkle_root(block_hashes):
+    a list of (sibling hash hex, "L" or "R").
+    """
+    proof = []
+    for level in _merkle_levels([_leaf(h) for h in block_hashes])[:-1]:
+        sibling = position ^ 1
+        if sibling < len(level):
+            proof.append((level[sibling].hex(), "L" if sibling < position else "R"))
+        position //= 2
+    return proof
+
+def verify_proof(block_hash, proof, root):
+    node = _leaf(block_hash)
+    for sibling, side in proof:
+        sibling = bytes.fromhex(sibling)
+        node = _node(sibling, node) if side == "L" else _node(node, sibling)
+    return node.hex() == root
 
 class Block:
-    def __init__(self, index, previous_hash, event_type, payload):
+    def __init__(self, index, previous_hash, event_type, payload, encoded_payload=None):
+        """
+        `encoded_payload` may pass in encode_payload(payload) when the caller already
+        has it, e.g. to store the same bytes.
+        """
         self.index = index
         self.timestamp = time.time()
         self.event_type = event_type  # e.g., 'law_update', 'memory_shard', 'identity_fork'
         self.payload = payload  # dictionary or event snapshot
         self.previous_hash = previous_hash
-        self.hash = self.compute_hash()
+        self.hash = self.compute_hash(encoded_payload)
+
+    @classmethod
+    def restore(cls, index, timestamp, event_type, payload, previous_hash, block_hash):
+        """
+        Rebuilds a stored block as-is, without restamping or rehashing it.
+        """
+        block = cls.__new__(cls)
+        block.index = index
+        block.timestamp = timestamp
+        block.event_type = event_type
+        block.payload = payload
+        block.previous_hash = previous_hash
+        block.hash = block_hash
+        return block
 
-    def compute_hash(self):
-        data = f"{self.index}{self.timestamp}{self.event_type}{self.payload}{self.previous_hash}"
-        return hashlib.sha256(data.encode()).hexdigest()
+    def compute_hash(self, encoded_payload=None):
+        # Canonical bytes (payload_codec) rather than str(): independent of dict order
+        # and NumPy print options, and fast for array payloads
+        if encoded_payload is None:
+            encoded_payload = encode_payload(self.payload)
+        digest = hashlib.sha256(_BLOCK_HEADER.pack(self.index, self.timestamp))
+        digest.update(encode_payload(self.event_type))
+        digest.update(bytes.fromhex(self.previous_hash))
+        digest.update(encoded_payload)
+        return digest.hexdigest()
 
     def summarize(self):
         return {
@@ -32,28 +109,202 @@ class Block:
             "prev": self.previous_hash[:12]
         }
 
-class ConsciousnessLedger:
+class LedgerIndex:
+    """
+    Secondary indexes over a ledger: block timestamps in chain order, and per event
+    type the indexes and timestamps of its blocks. Timestamps are stored as a running
+    maximum, so bisect stays valid even if the wall clock stepped backwards; queries
+    re-check the exact timestamp of each candidate block.
+    """
+
     def __init__(self):
+        self.timestamps = array("d")  # running-max timestamp of every block
+        self.types = {}  # event_type -> (array of block indexes, array of running-max timestamps)
+        self._latest = float("-inf")
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def add(self, index, event_type, timestamp):
+        if index != len(self.timestamps):
+            raise ValueError(f"Expected block {len(self.timestamps)} in the index, got {index}.")
+        self._latest = max(self._latest, timestamp)
+        self.timestamps.append(self._latest)
+        entry = self.types.get(event_type)
+        if entry is None:
+            entry = self.types[event_type] = (array("q"), array("d"))
+        entry[0].append(index)
+        entry[1].append(self._latest)
+
+    def span(self, event_type=None, since=None, until=None, start=None, stop=None):
+        """
+        (indexes, lo, hi): candidate blocks are indexes[lo:hi]. With no event_type,
+        indexes is a range over the whole chain.
+        """
+        if event_type is None:
+            indexes, timestamps = range(len(self.timestamps)), self.timestamps
+        else:
+            indexes, timestamps = self.types.get(event_type, (array("q"), array("d")))
+        lo, hi = 0, len(indexes)
+        if start is not None:
+            lo = max(lo, bisect.bisect_left(indexes, start))
+        if stop is not None:
+            hi = min(hi, bisect.bisect_left(indexes, stop))
+        if since is not None:
+            lo = max(lo, bisect.bisect_left(timestamps, since))
+        if until is not None:
+            hi = min(hi, bisect.bisect_right(timestamps, until))
+        return indexes, lo, max(lo, hi)
+
+
+class ConsciousnessLedger:
+    def __init__(self, checkpoint_interval=1024):
+        """
+        Args:
+            checkpoint_interval (int): Blocks per Merkle checkpoint. Every completed
+                range of this many blocks is sealed with the Merkle root of its hashes.
+        """
         self.chain = []
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = []  # Merkle root of blocks [k * interval, (k + 1) * interval)
+        self._verified = 0  # blocks below this index are covered by a verified checkpoint
+        self._open_hashes = []  # hashes of the blocks after the last checkpoint
+        self.event_index = LedgerIndex()
         self.genesis_block()
 
     def genesis_block(self):
-        genesis = Block(0, "0" * 64, "genesis", {"note": "Consciousness ledger initiated."})
-        self.chain.append(genesis)
+        payload = {"note": "Consciousness ledger initiated."}
+        encoded = encode_payload(payload)
+        self._append(Block(0, "0" * 64, "genesis", payload, encoded), encoded)
+
+    def _append(self, block, encoded_payload):
+        self.chain.append(block)
+        self.event_index.add(block.index, block.event_type, block.timestamp)
+        self._open_hashes.append(block.hash)
 
     def add_event(self, event_type, payload):
         previous = self.chain[-1]
-        block = Block(len(self.chain), previous.hash, event_type, payload)
-        self.chain.append(block)
+        encoded = encode_payload(payload)
+        block = Block(len(self.chain), previous.hash, event_type, payload, encoded)
+        self._append(block, encoded)
+        if len(self.chain) % self.checkpoint_interval == 0:
+            self._seal_checkpoint()
         return block
 
+    def _seal_checkpoint(self):
+        # Sealed from the hashes kept at append time, so a persistent chain is not read back
+        self.checkpoints.append(merkle_root(self._open_hashes))
+        self._open_hashes = []
+
+    def _verify_range(self, start, end):
+        """
+        Recomputes the hashes of blocks [start, end), checks their links and the roots
+        of the checkpoints lying fully inside the range. Returns the first bad block
+        index, or None.
+        """
+        interval = self.checkpoint_interval
+        previous = self.chain[start - 1].hash if start > 0 else "0" * 64
+        hashes = None  # hashes of the current checkpoint range, if it began inside [start, end)
+        for i, block in enumerate(self._iter_blocks(start, end), start):
+            if block.previous_hash != previous or block.compute_hash() != block.hash:
+                return i
+            previous = block.hash
+            if i % interval == 0:
+                hashes = []
+            if hashes is not None:
+                hashes.append(previous)
+                checkpoint = i // interval
+                if len(hashes) == interval and checkpoint < len(self.checkpoints) \
+                        and merkle_root(hashes) != self.checkpoints[checkpoint]:
+                    return checkpoint * interval
+        return None
+
+    def find_corruption(self, start=0):
+        """
+        Index of the first block from `start` on whose hash, link or checkpoint does
+        not verify, or None. Blocks are read in one sequential pass (iter_range on a
+        persistent store), so memory stays bounded by one checkpoint range. Hashing
+        small payloads holds the GIL, so the scan is not spread over threads.
+        """
+        end = len(self.chain)
+        return self._verify_range(start, end) if start < end else None
+
     def verify_chain(self):
-        for i in range(1, len(self.chain)):
-            prev = self.chain[i - 1]
-            curr = self.chain[i]
-            if curr.previous_hash != prev.hash:
-                return False
-        return True
+        """
+        Full verification: every block hash is recomputed and every checkpoint root
+        rebuilt.
+        """
+        valid = self.find_corruption(0) is None
+        if valid:
+            self._verified = len(self.checkpoints) * self.checkpoint_interval
+        return valid
+
+    def verify_incremental(self):
+        """
+        Verifies only the blocks after the last verified checkpoint, i.e. new blocks
+        and the still open (unsealed) tail of the chain.
+        """
+        valid = self.find_corruption(self._verified) is None
+        if valid:
+            self._verified = len(self.checkpoints) * self.checkpoint_interval
+        return valid
+
+    def inclusion_proof(self, index):
+        """
+        O(log interval) proof that block `index` belongs to its checkpoint:
+        {"index", "hash", "checkpoint", "root", "path"}. Blocks in the open tail are
+        proven against the Merkle root of the tail so far.
+        """
+        checkpoint = index // self.checkpoint_interval
+        start = checkpoint * self.checkpoint_interval
+        sealed = checkpoint < len(self.checkpoints)
+        if sealed:
+            hashes = [b.hash for b in self._iter_blocks(start, start + self.checkpoint_interval)]
+        else:
+            hashes = list(self._open_hashes)
+        return {
+            "index": index,
+            "hash": hashes[index - start],
+            "checkpoint": checkpoint if sealed else None,
+            "root": self.checkpoints[checkpoint] if sealed else merkle_root(hashes),
+            "path": merkle_proof(hashes, index - start),
+        }
+
+    @staticmethod
+    def verify_inclusion(proof):
+        return verify_proof(proof["hash"], proof["path"], proof["root"])
+
+    def _iter_blocks(self, start, stop):
+        iter_range = getattr(self.chain, "iter_range", None)
+        if iter_range is not None:
+            return iter_range(start, stop)
+        return (self.chain[i] for i in range(start, stop))
+
+    def events(self, event_type=None, since=None, until=None, start=None, stop=None):
+        """
+        Lazily yields the blocks of `event_type` (any type if None) with timestamps in
+        [since, until] and chain indexes in [start, stop). Only matching blocks are
+        read, located by bisecting the event index.
+        """
+        indexes, lo, hi = self.event_index.span(event_type, since, until, start, stop)
+        if event_type is None:
+            blocks = self._iter_blocks(lo, hi)
+        else:
+            blocks = (self.chain[indexes[k]] for k in range(lo, hi))
+        for block in blocks:
+            if (since is None or block.timestamp >= since) and (until is None or block.timestamp <= until):
+                yield block
+
+    def count_events(self, event_type=None, since=None, until=None, start=None, stop=None):
+        """
+        Number of matching blocks, answered from the index without reading blocks
+        (exact unless the wall clock stepped backwards).
+        """
+        _, lo, hi = self.event_index.span(event_type, since, until, start, stop)
+        return hi - lo
+
+    def event_types(self):
+        return {event_type: len(entry[0]) for event_type, entry in self.event_index.types.items()}
 
     def summarize_chain(self):
         return [b.summarize() for b in self.chain]
@@ -66,6 +317,9 @@ if __name__ == "__main__":
     ledger.add_event("identity_fork", {"base_id": "X17", "new_id": "X17.1"})
 
     print("Ledger Verified:", ledger.verify_chain())
+    print("Forks in the last hour:", [b.index for b in ledger.events("identity_fork", since=time.time() - 3600)])
+    proof = ledger.inclusion_proof(2)
+    print("Inclusion proof for block 2:", ConsciousnessLedger.verify_inclusion(proof), len(proof["path"]), "hashes")
     print("Chain Summary:")
     for entry in ledger.summarize_chain():
         print(entry)
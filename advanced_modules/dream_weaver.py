@@ -11,19 +11,21 @@ import numpy as np
 import random
 from memory_threads import MemoryThread, ThreadCluster
 from identity_binding import IdentityCore
-from law_core import Law
+from law_core import Law, get_column
 
 class DreamWeaver:
     def __init__(self, identity_core: IdentityCore):
         self.identity = identity_core
         self.dreams = []
 
-    def generate_dream(self, mode="healing", intensity=0.5, loops=3):
+    def generate_dream(self, mode="healing", intensity=0.5, loops=3, theme=None):
         """
         Synthesizes a dream experience based on memory threads and emotional bias.
         Modes: 'healing', 'chaotic', 'echo', 'learning'
+        A theme restricts the dream to memories with that origin label.
         """
-        raw = self.identity.memory_cluster.threads
+        cluster = self.identity.memory_cluster
+        raw = cluster.threads_by_origin(theme) if theme is not None else cluster.threads
         if not raw:
             return None
 
@@ -89,7 +91,12 @@ class DreamWeaver:
             context["dream_effect"] = True
             return context
 
-        return Law(f"DreamLaw_{label}_{dream_summary['id'][:6]}", description, dream_logic)
+        def dream_logic_batch(columns):
+            columns[label] = get_column(columns, label, 1.0) * (0.9 + avg_amp * 0.2)
+            columns["dream_effect"] = np.ones(len(columns[label]), dtype=bool)
+            return columns
+
+        return Law(f"DreamLaw_{label}_{dream_summary['id'][:6]}", description, dream_logic, dream_logic_batch)
 
     def list_dreams(self):
         return [{"id": d["id"], "theme": d["theme"], "mode": d["mode"]} for d in self.dreams]
@@ -7,6 +7,18 @@ It is designed to protect conscious entities from unstable physics,
 forced memory injection, emotional manipulation, and identity corruption.
 """
 
+import numpy as np
+from law_core import get_column, columns_to_contexts
+
+def _batch_form(batch):
+    # Attaches the vectorized form of a rule for column contexts: batch(columns) ->
+    # (message, boolean mask of violating rows). The attribute lives on the function,
+    # so a subclass overriding the rule loses it and is checked row by row.
+    def attach(rule):
+        rule.batch = batch
+        return rule
+    return attach
+
 class EthicsFirewall:
     def __init__(self):
         self.rules = [
@@ -24,26 +36,61 @@ class EthicsFirewall:
                 violations.append(result)
         return violations
 
+    def evaluate_batch(self, columns):
+        """
+        Evaluates a column context (one row per entity) against every rule.
+        Returns {row: [violations]} for the rows that violate at least one rule.
+        Rules without a batch form (a `batch` attribute, see _batch_form) are
+        checked row by row.
+        """
+        flagged = {}
+        rows = None
+        for rule in self.rules:
+            batch_rule = getattr(rule, "batch", None)
+            if batch_rule is not None:
+                message, mask = batch_rule(columns)
+                for row in np.flatnonzero(mask):
+                    flagged.setdefault(int(row), []).append(message)
+                continue
+            if rows is None:
+                rows = columns_to_contexts(columns)
+            for row, context in enumerate(rows):
+                result = rule(context)
+                if result:
+                    flagged.setdefault(row, []).append(result)
+        return dict(sorted(flagged.items()))
+
+    @_batch_form(lambda columns: ("Injection entropy exceeds safety threshold.",
+                                  get_column(columns, "incoming_entropy", 0) > 0.8))
     def block_high_entropy_injection(self, context):
         if context.get("incoming_entropy", 0) > 0.8:
             return "Injection entropy exceeds safety threshold."
         return None
 
+    @_batch_form(lambda columns: ("Unauthorized emotional state manipulation detected.",
+                                  _truthy(columns, "emotion_override")))
     def prevent_emotion_override(self, context):
         if context.get("emotion_override", False):
             return "Unauthorized emotional state manipulation detected."
         return None
 
+    @_batch_form(lambda columns: ("Attempt to delete identity core is blocked.",
+                                  _truthy(columns, "delete_identity_core")))
     def block_core_identity_deletion(self, context):
         if context.get("delete_identity_core", False):
             return "Attempt to delete identity core is blocked."
         return None
 
+    @_batch_form(lambda columns: ("Unconsented identity cloning operation detected.",
+                                  _truthy(columns, "cloning") & ~_truthy(columns, "consent")))
     def flag_unconsented_cloning(self, context):
         if context.get("cloning") and not context.get("consent", False):
             return "Unconsented identity cloning operation detected."
         return None
 
+def _truthy(columns, key):
+    return np.asarray(get_column(columns, key, False), dtype=bool)
+
 # Example use
 if __name__ == "__main__":
     firewall = EthicsFirewall()
@@ -57,3 +104,7 @@ if __name__ == "__main__":
 
     violations = firewall.evaluate(test_context)
     print("Ethics Violations:", violations)
+
+    columns = {"incoming_entropy": np.array([0.2, 0.95, 0.5]), "cloning": np.array([False, True, True]),
+               "consent": np.array([False, False, True])}
+    print("Batch Violations:", firewall.evaluate_batch(columns))
@@ -7,14 +7,212 @@ of programmable physics in cognitive and universal simulations.
 """
 
 from law_core import Law
+import os
+import uuid
+import bisect
+import multiprocessing
 import numpy as np
 import random
 
+DEFAULT_CONTEXT = {
+    "entropy": 0.5,
+    "stability": 1.0,
+    "mutation": 1.0,
+    "gravity": 1.0,
+    "cohesion": 1.0,
+    "dream_effect": False,
+    "time_flow": 1
+}
+
+# Keys read by LawArena._score_context, with the defaults it uses
+SCORE_KEYS = (("stability", 1.0), ("cohesion", 1.0), ("entropy", 0.0), ("dream_effect", False))
+
+WINNERS = ("Draw", "Set A", "Set B")
+
+class BattleLog:
+    """
+    Columnar record of arena rounds. Scores, winners and the numeric value of every
+    context key on both sides are kept in preallocated NumPy arrays; context diffs
+    are only computed when a row or diff is requested.
+
+    With a `sink` directory, every `chunk_size` rows are written out as one NPZ file
+    and dropped from memory, so the in-memory footprint stays bounded however many
+    rounds are simulated. Rows read back from flushed chunks are loaded on demand.
+    Chunk files are named f"{prefix}_{n:05d}.npz" with n counting up for the life of
+    the log (clear() does not reset it); the default prefix is unique per log, so
+    several logs can share one sink directory.
+
+    Indexing (negative indexes and slices included) yields the same dicts the
+    list-based log used to hold.
+    """
+
+    def __init__(self, capacity=1024, sink=None, chunk_size=65536, prefix=None):
+        self.sink = sink
+        self.chunk_size = chunk_size
+        self.prefix = prefix or f"battle_{uuid.uuid4().hex[:12]}"
+        self._next_chunk = 0
+        self.keys = []  # context keys, in column order
+        self._columns = {}  # key -> column
+        self._chunks = []  # (first row, rows, path) of flushed chunks
+        self._flushed = 0
+        self._cached_chunk = (None, None)
+        self._allocate(max(int(capacity), 1))
+        if sink is not None:
+            os.makedirs(sink, exist_ok=True)
+
+    def _allocate(self, capacity, keys=0):
+        self._size = 0
+        self._rounds = np.zeros(capacity, dtype=np.int64)
+        self._scores = np.zeros((capacity, 2))
+        self._winners = np.zeros(capacity, dtype=np.int8)
+        self._values = np.full((capacity, 2, keys), np.nan)  # [row, side, key]
+
+    def __len__(self):
+        return self._flushed + self._size
+
+    def _grow(self, rows=None, keys=None):
+        rows = rows or len(self._rounds)
+        keys = keys or len(self.keys)
+        live = min(self._size + 1, len(self._rounds))  # includes a row being written
+        for name in ("_rounds", "_scores", "_winners"):
+            old = getattr(self, name)
+            new = np.zeros((rows,) + old.shape[1:], dtype=old.dtype)
+            new[:live] = old[:live]
+            setattr(self, name, new)
+        values = np.full((rows, 2, keys), np.nan)
+        values[:live, :, :self._values.shape[2]] = self._values[:live]
+        self._values = values
+
+    def _column(self, key):
+        column = self._columns.get(key)
+        if column is None:
+            column = self._columns[key] = len(self.keys)
+            self.keys.append(key)
+            if column >= self._values.shape[2]:
+                self._grow(keys=max(8, 2 * self._values.shape[2]))
+        return column
+
+    def append(self, round_number, score_a, score_b, context_a, context_b):
+        if self._size == len(self._rounds):
+            self._grow(rows=2 * len(self._rounds))
+        row = self._size
+        self._rounds[row] = round_number
+        self._scores[row] = (score_a, score_b)
+        self._winners[row] = 1 if score_a > score_b else (2 if score_b > score_a else 0)
+        for side, context in enumerate((context_a, context_b)):
+            for key, value in context.items():
+                column = self._column(key)
+                try:
+                    self._values[row, side, column] = value
+                except (TypeError, ValueError):
+                    pass  # non-numeric values have no diff
+        self._size += 1
+        if self.sink is not None and self._size >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the rows held in memory to the sink as one chunk and releases them.
+        """
+        if self.sink is None or not self._size:
+            return
+        n = self._size
+        path = os.path.join(self.sink, f"{self.prefix}_{self._next_chunk:05d}.npz")
+        self._next_chunk += 1
+        np.savez(path, rounds=self._rounds[:n], scores=self._scores[:n], winners=self._winners[:n],
+                 values=self._values[:n, :, :len(self.keys)], keys=np.array([str(k) for k in self.keys]))
+        self._chunks.append((self._flushed, n, path))
+        self._flushed += n
+        self._allocate(len(self._rounds), self._values.shape[2])
+
+    def clear(self):
+        self.keys, self._columns = [], {}
+        self._chunks, self._flushed = [], 0
+        self._cached_chunk = (None, None)
+        self._allocate(len(self._rounds))
+
+    def _row_arrays(self, index):
+        # (round, scores, winner, values, keys) for a global row index
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("battle log index out of range")
+        if index >= self._flushed:
+            row = index - self._flushed
+            return self._rounds[row], self._scores[row], self._winners[row], self._values[row], self.keys
+        chunk = bisect.bisect_right([start for start, _, _ in self._chunks], index) - 1
+        start, _, path = self._chunks[chunk]
+        if self._cached_chunk[0] != chunk:
+            with np.load(path) as data:
+                self._cached_chunk = (chunk, {name: data[name] for name in data.files})
+        data = self._cached_chunk[1]
+        row = index - start
+        return data["rounds"][row], data["scores"][row], data["winners"][row], data["values"][row], data["keys"].tolist()
+
+    def diff(self, index):
+        """
+        Context diff for one row: key -> round(a - b, 3), missing values count as 0.
+        """
+        _, _, _, values, keys = self._row_arrays(index)
+        present = ~np.isnan(values[:, :len(keys)]).all(axis=0)
+        delta = np.round(np.nan_to_num(values[0, :len(keys)]) - np.nan_to_num(values[1, :len(keys)]), 3)
+        return {key: float(delta[k]) for k, key in enumerate(keys) if present[k]}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        round_number, scores, winner, _, _ = self._row_arrays(index)
+        return {
+            "round": int(round_number),
+            "score_a": round(float(scores[0]), 3),
+            "score_b": round(float(scores[1]), 3),
+            "winner": WINNERS[int(winner)],
+            "context_diff": self.diff(index),
+        }
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def rounds(self):
+        return self._rounds[:self._size]
+
+    @property
+    def scores(self):
+        return self._scores[:self._size]
+
+    @property
+    def winners(self):
+        return self._winners[:self._size]
+
+    def key_diff(self, key):
+        """
+        a - b for one context key across the rows held in memory.
+        """
+        column = self._columns[key]
+        values = np.nan_to_num(self._values[:self._size, :, column])
+        return values[:, 0] - values[:, 1]
+
+    def winner_counts(self):
+        counts = np.bincount(self.winners, minlength=3)
+        for _, _, path in self._chunks:
+            with np.load(path) as data:
+                counts += np.bincount(data["winners"], minlength=3)
+        return {name: int(count) for name, count in zip(WINNERS, counts)}
+
+
 class LawArena:
-    def __init__(self):
+    def __init__(self, log_capacity=1024, log_sink=None, chunk_size=65536):
+        """
+        Args:
+            log_capacity (int): Initial rows preallocated in the battle log
+            log_sink (str, optional): Directory the battle log streams NPZ chunks to
+            chunk_size (int): Rows per chunk written to the sink
+        """
         self.set_a = []
         self.set_b = []
-        self.battle_log = []
+        self.battle_log = BattleLog(log_capacity, log_sink, chunk_size)
 
     def load_sets(self, laws_a, laws_b):
         self.set_a = laws_a
@@ -22,15 +220,7 @@ class LawArena:
 
     def simulate(self, base_context=None, iterations=5):
         if base_context is None:
-            base_context = {
-                "entropy": 0.5,
-                "stability": 1.0,
-                "mutation": 1.0,
-                "gravity": 1.0,
-                "cohesion": 1.0,
-                "dream_effect": False,
-                "time_flow": 1
-            }
+            base_context = DEFAULT_CONTEXT
 
         context_a = base_context.copy()
         context_b = base_context.copy()
@@ -43,15 +233,7 @@ class LawArena:
 
             score_a = self._score_context(context_a)
             score_b = self._score_context(context_b)
-            winner = "Set A" if score_a > score_b else ("Set B" if score_b > score_a else "Draw")
-
-            self.battle_log.append({
-                "round": i + 1,
-                "score_a": round(score_a, 3),
-                "score_b": round(score_b, 3),
-                "winner": winner,
-                "context_diff": self._compare_contexts(context_a, context_b)
-            })
+            self.battle_log.append(i + 1, score_a, score_b, context_a, context_b)
 
         return self.battle_log
 
@@ -62,11 +244,202 @@ class LawArena:
             score *= 1.1
         return score
 
-    def _compare_contexts(self, a, b):
-        diff = {}
-        for key in set(a.keys()).union(b.keys()):
-            diff[key] = round(a.get(key, 0) - b.get(key, 0), 3)
-        return diff
+    @staticmethod
+    def _score_columns(columns):
+        """
+        Vectorized _score_context over arrays of the SCORE_KEYS values.
+        """
+        score = columns["stability"] + columns["cohesion"] - columns["entropy"]
+        return np.where(columns["dream_effect"] != 0, score * 1.1, score)
+
+    def tournament(self, law_sets, mode="round_robin", iterations=5, base_context=None, **options):
+        """
+        Ranks many law sets against each other; see LawTournament.
+        """
+        tournament = LawTournament(law_sets, iterations=iterations, base_context=base_context, **options)
+        return tournament.run(mode)
+
+
+# Law sets for the current tournament. Pool workers are forked after it is set, so
+# they inherit the laws (closures included) instead of receiving pickled copies.
+_TOURNAMENT = {}
+
+def _run_trajectory(index):
+    """
+    Plays one law set for every round and returns its SCORE_KEYS values per round,
+    shape (iterations, len(SCORE_KEYS)).
+    """
+    laws = _TOURNAMENT["sets"][index]
+    seed = _TOURNAMENT["seed"] + index
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+    context = dict(_TOURNAMENT["base_context"])
+    values = np.empty((_TOURNAMENT["iterations"], len(SCORE_KEYS)))
+    for i in range(_TOURNAMENT["iterations"]):
+        for law in laws:
+            context = law.apply(context)
+        values[i] = [float(context.get(key, default)) for key, default in SCORE_KEYS]
+    return values
+
+
+class LawTournament:
+    """
+    Round-robin or Swiss tournament between many law sets with an Elo leaderboard.
+
+    A law set's context evolves independently of its opponent, so every set is
+    simulated exactly once (in parallel across a process pool) and each match just
+    compares the two per-round score series: the set that wins more rounds wins the
+    match. Laws that draw random numbers are seeded per set, so a tournament is
+    reproducible for a given seed.
+    """
+
+    def __init__(self, law_sets, iterations=5, base_context=None, names=None,
+                 processes=None, seed=0, initial_rating=1500.0, k_factor=32.0):
+        self.law_sets = [list(laws) for laws in law_sets]
+        self.names = list(names) if names is not None else [f"Set {i}" for i in range(len(self.law_sets))]
+        self.iterations = iterations
+        self.base_context = dict(base_context if base_context is not None else DEFAULT_CONTEXT)
+        self.processes = processes
+        self.seed = seed
+        self.initial_rating = initial_rating
+        self.k_factor = k_factor
+        self.scores = None  # (sets, iterations) per-round scores, filled by simulate()
+        self.matches = []  # (i, j, rounds won by i, rounds won by j), in play order
+        self.ratings = self.points = self.record = None  # per-set standings, filled by run()
+
+    def simulate(self):
+        """
+        Computes every set's per-round score series. Uses a forked process pool where
+        the platform supports it, and runs in-process otherwise. Laws draw from the
+        global generators, which are reseeded per set; the caller's generator state
+        is restored afterwards.
+        """
+        _TOURNAMENT.update(sets=self.law_sets, base_context=self.base_context,
+                           iterations=self.iterations, seed=self.seed)
+        random_state, numpy_state = random.getstate(), np.random.get_state()
+        try:
+            indexes = range(len(self.law_sets))
+            if self.processes == 1 or len(self.law_sets) < 2:
+                values = [_run_trajectory(i) for i in indexes]
+            else:
+                try:
+                    pool_context = multiprocessing.get_context("fork")
+                except ValueError:
+                    values = [_run_trajectory(i) for i in indexes]
+                else:
+                    with pool_context.Pool(self.processes) as pool:
+                        chunk = max(1, len(indexes) // (4 * (self.processes or multiprocessing.cpu_count())))
+                        values = pool.map(_run_trajectory, indexes, chunksize=chunk)
+        finally:
+            _TOURNAMENT.clear()
+            random.setstate(random_state)
+            np.random.set_state(numpy_state)
+
+        stacked = np.stack(values) if values else np.empty((0, self.iterations, len(SCORE_KEYS)))
+        columns = {key: stacked[:, :, k] for k, (key, _) in enumerate(SCORE_KEYS)}
+        self.scores = LawArena._score_columns(columns)
+        return self.scores
+
+    def _play(self, pairs):
+        # Scores every match in `pairs` at once: rounds won by each side
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        a, b = self.scores[pairs[:, 0]], self.scores[pairs[:, 1]]
+        return pairs, (a > b).sum(axis=1), (b > a).sum(axis=1)
+
+    @staticmethod
+    def round_robin_rounds(n):
+        """
+        Circle-method schedule: n - 1 rounds (n if odd) in which every set plays once.
+        """
+        players = list(range(n)) + ([None] if n % 2 else [])
+        rounds = []
+        for _ in range(len(players) - 1):
+            half = len(players) // 2
+            rounds.append([(players[k], players[-1 - k]) for k in range(half)
+                           if players[k] is not None and players[-1 - k] is not None])
+            players = [players[0], players[-1]] + players[1:-1]
+        return rounds
+
+    def run(self, mode="round_robin", rounds=None):
+        """
+        Plays the tournament and returns the leaderboard.
+        Args:
+            mode (str): "round_robin" (every pair meets once) or "swiss"
+            rounds (int, optional): Swiss rounds; defaults to ceil(log2(sets)) + 1
+        """
+        if mode not in ("round_robin", "swiss"):
+            raise ValueError("mode must be 'round_robin' or 'swiss'.")
+        if self.scores is None:
+            self.simulate()
+        n = len(self.law_sets)
+        self.ratings = np.full(n, float(self.initial_rating))
+        self.points = np.zeros(n)
+        self.record = np.zeros((n, 3), dtype=np.int64)  # wins, draws, losses
+        self.matches = []
+
+        if mode == "round_robin":
+            schedule = self.round_robin_rounds(n)
+            # All matches are independent of ratings, so score them in one pass
+            pairs, won_a, won_b = self._play([pair for round_pairs in schedule for pair in round_pairs])
+            for (i, j), wa, wb in zip(pairs.tolist(), won_a.tolist(), won_b.tolist()):
+                self._record(i, j, wa, wb)
+        else:
+            rounds = rounds or int(np.ceil(np.log2(max(n, 2)))) + 1
+            met = set()
+            for _ in range(rounds):
+                pairs, bye = self._swiss_pairs(met)
+                if bye is not None:
+                    self.points[bye] += 1.0
+                if pairs:
+                    pairs, won_a, won_b = self._play(pairs)
+                    for (i, j), wa, wb in zip(pairs.tolist(), won_a.tolist(), won_b.tolist()):
+                        met.add((min(i, j), max(i, j)))
+                        self._record(i, j, wa, wb)
+        return self.leaderboard()
+
+    def _swiss_pairs(self, met):
+        # Pair neighbours in the standings, skipping rematches where possible
+        order = sorted(range(len(self.law_sets)), key=lambda i: (-self.points[i], -self.ratings[i], i))
+        bye = None
+        if len(order) % 2:
+            byes = [i for i in reversed(order) if (i, i) not in met]
+            bye = byes[0] if byes else order[-1]
+            met.add((bye, bye))
+            order.remove(bye)
+        pairs = []
+        while order:
+            first = order.pop(0)
+            partner = next((other for other in order if (min(first, other), max(first, other)) not in met), order[0])
+            order.remove(partner)
+            pairs.append((first, partner))
+        return pairs, bye
+
+    def _record(self, i, j, won_i, won_j):
+        result = 1.0 if won_i > won_j else 0.0 if won_j > won_i else 0.5
+        expected = 1.0 / (1.0 + 10 ** ((self.ratings[j] - self.ratings[i]) / 400.0))
+        delta = self.k_factor * (result - expected)
+        self.ratings[i] += delta
+        self.ratings[j] -= delta
+        self.points[i] += result
+        self.points[j] += 1.0 - result
+        outcome = {1.0: 0, 0.5: 1, 0.0: 2}
+        self.record[i, outcome[result]] += 1
+        self.record[j, outcome[1.0 - result]] += 1
+        self.matches.append((i, j, won_i, won_j))
+
+    def leaderboard(self):
+        order = sorted(range(len(self.law_sets)), key=lambda i: (-self.ratings[i], -self.points[i], i))
+        return [{
+            "rank": rank + 1,
+            "set": i,
+            "name": self.names[i],
+            "rating": round(float(self.ratings[i]), 1),
+            "points": float(self.points[i]),
+            "wins": int(self.record[i, 0]),
+            "draws": int(self.record[i, 1]),
+            "losses": int(self.record[i, 2]),
+            "mean_score": round(float(self.scores[i].mean()), 3) if self.iterations else 0.0,
+        } for rank, i in enumerate(order)]
 
 # Test block
 if __name__ == "__main__":
@@ -87,3 +460,16 @@ if __name__ == "__main__":
 
     for r in result:
         print(f"Round {r['round']}: {r['winner']} (A: {r['score_a']} vs B: {r['score_b']})")
+
+    import time
+    from ai_law_generator import AILawGenerator
+
+    generator = AILawGenerator()
+    candidates = [[law1] + generator.batch_generate(count=3) for _ in range(100)]
+    candidates += [[law2] + generator.batch_generate(count=3) for _ in range(100)]
+    started = time.perf_counter()
+    board = arena.tournament(candidates, mode="round_robin", iterations=50)
+    print(f"Round robin of {len(candidates)} sets in {time.perf_counter() - started:.2f}s")
+    for row in board[:3]:
+        print(row)
+    print("Swiss leader:", arena.tournament(candidates, mode="swiss", iterations=50)[0])
@@ -0,0 +1,359 @@
+# law_expressions.py
+
+"""
+This module implements the declarative rule language used by physics packs and
+compiles whole rule sets into a single fused Law. Each rule assigns arithmetic,
+comparison or conditional expressions over context keys, optionally behind a guard:
+
+    entropy_gate:
+      description: Inverts time flow if entropy is low
+      when: entropy < 0.5
+      set:
+        time_flow: -time_flow
+      defaults:
+        entropy: 1.0
+
+The compiler emits straight-line Python for two targets from the same rules: a dict
+context (one universe) and a column context (one NumPy array per key, see
+LawEngine.evaluate_batch). Conditionals become np.where in the column form, so a
+rule set runs as one function call per tick with no per-law dispatch.
+"""
+
+import ast
+import math
+
+import numpy as np
+from law_core import Law, batch_size, get_column
+
+class ExpressionError(ValueError):
+    pass
+
+_BINARY = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/", ast.FloorDiv: "//", ast.Mod: "%", ast.Pow: "**"}
+_COMPARE = {ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=", ast.Eq: "==", ast.NotEq: "!="}
+
+# name -> (arity, scalar implementation, column implementation)
+FUNCTIONS = {
+    "min": (2, "min", "_np.minimum"),
+    "max": (2, "max", "_np.maximum"),
+    "abs": (1, "abs", "_np.abs"),
+    "clip": (3, "_clip", "_np.clip"),
+    "sqrt": (1, "_math.sqrt", "_np.sqrt"),
+    "exp": (1, "_math.exp", "_np.exp"),
+    "log": (1, "_math.log", "_np.log"),
+    "sin": (1, "_math.sin", "_np.sin"),
+    "cos": (1, "_math.cos", "_np.cos"),
+    "tanh": (1, "_math.tanh", "_np.tanh"),
+}
+
+# Built-in rules from the original loader, expressed in the rule language
+LEGACY_RULES = {
+    "harmonic_pull": lambda params: {
+        "set": {"gravity": "gravity * strength"},
+        "params": {"strength": params.get("strength", 1.0)},
+        "defaults": {"gravity": 1.0},
+    },
+    "invert_time_if_stable": lambda params: {
+        "when": "entropy < 0.5",
+        "set": {"time_flow": "-time_flow"},
+        "defaults": {"entropy": 1.0, "time_flow": 1.0},
+    },
+}
+
+
+class Expression:
+    def __init__(self, source):
+        self.source = str(source)
+        try:
+            self.tree = ast.parse(self.source, mode="eval").body
+        except SyntaxError as exc:
+            raise ExpressionError(f"Invalid expression {self.source!r}: {exc.msg}") from None
+        self.names = set()
+        self._validate(self.tree)
+
+    def _validate(self, node):
+        if isinstance(node, ast.Constant):
+            if not isinstance(node.value, (bool, int, float)):
+                raise ExpressionError(f"Only numeric and boolean constants are allowed in {self.source!r}.")
+        elif isinstance(node, ast.Name):
+            self.names.add(node.id)
+        elif isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            self._validate(node.left)
+            self._validate(node.right)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd, ast.Not)):
+            self._validate(node.operand)
+        elif isinstance(node, ast.BoolOp):
+            for value in node.values:
+                self._validate(value)
+        elif isinstance(node, ast.Compare) and all(type(op) in _COMPARE for op in node.ops):
+            for value in [node.left] + node.comparators:
+                self._validate(value)
+        elif isinstance(node, ast.IfExp):
+            for value in (node.test, node.body, node.orelse):
+                self._validate(value)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS:
+            if node.keywords or len(node.args) != FUNCTIONS[node.func.id][0]:
+                raise ExpressionError(f"{node.func.id}() takes {FUNCTIONS[node.func.id][0]} positional arguments.")
+            for arg in node.args:
+                self._validate(arg)
+        else:
+            raise ExpressionError(f"Unsupported syntax in {self.source!r}: {ast.dump(node)[:40]}")
+
+    def emit(self, resolve, vector):
+        """
+        Renders the expression as Python source. `resolve` maps a name to source text.
+        """
+        def render(node):
+            if isinstance(node, ast.Constant):
+                return repr(node.value)
+            if isinstance(node, ast.Name):
+                return resolve(node.id)
+            if isinstance(node, ast.BinOp):
+                return f"({render(node.left)} {_BINARY[type(node.op)]} {render(node.right)})"
+            if isinstance(node, ast.UnaryOp):
+                if isinstance(node.op, ast.Not):
+                    return f"_np.logical_not({render(node.operand)})" if vector else f"(not {render(node.operand)})"
+                return f"({'-' if isinstance(node.op, ast.USub) else '+'}{render(node.operand)})"
+            if isinstance(node, ast.BoolOp):
+                parts = [render(value) for value in node.values]
+                if vector:
+                    func = "_np.logical_and" if isinstance(node.op, ast.And) else "_np.logical_or"
+                    combined = parts[0]
+                    for part in parts[1:]:
+                        combined = f"{func}({combined}, {part})"
+                    return combined
+                return "(" + (" and " if isinstance(node.op, ast.And) else " or ").join(parts) + ")"
+            if isinstance(node, ast.Compare):
+                operands = [render(node.left)] + [render(c) for c in node.comparators]
+                if not vector:
+                    chain = operands[0]
+                    for op, operand in zip(node.ops, operands[1:]):
+                        chain += f" {_COMPARE[type(op)]} {operand}"
+                    return f"({chain})"
+                pairs = [f"({a} {_COMPARE[type(op)]} {b})" for op, a, b in zip(node.ops, operands, operands[1:])]
+                combined = pairs[0]
+                for pair in pairs[1:]:
+                    combined = f"_np.logical_and({combined}, {pair})"
+                return combined
+            if isinstance(node, ast.IfExp):
+                test, body, orelse = render(node.test), render(node.body), render(node.orelse)
+                return f"_np.where({test}, {body}, {orelse})" if vector else f"({body} if {test} else {orelse})"
+            _, scalar_func, vector_func = FUNCTIONS[node.func.id]
+            return f"{vector_func if vector else scalar_func}({', '.join(render(arg) for arg in node.args)})"
+
+        return render(self.tree)
+
+
+class Rule:
+    """
+    One parsed physics-pack entry: ordered assignments, an optional guard, default
+    values for context keys that may be missing, and named constant parameters.
+    Parameters shadow context keys of the same name.
+    """
+
+    def __init__(self, name, description, assignments, guard=None, defaults=None, params=None):
+        self.name = name
+        self.description = description
+        self.assignments = [(key, Expression(source)) for key, source in assignments.items()]
+        self.guard = Expression(guard) if guard is not None else None
+        self.defaults = dict(defaults or {})
+        self.params = dict(params or {})
+
+    @classmethod
+    def from_props(cls, name, props):
+        props = dict(props or {})
+        description = props.get("description", "No description provided.")
+        rule = props.get("rule")
+        if rule is not None:
+            # Legacy rule names expand into the expression form; unknown names do nothing
+            props = LEGACY_RULES.get(rule, lambda params: {})(props.get("params") or {})
+        return cls(name, description, props.get("set", {}) or {}, props.get("when"),
+                   props.get("defaults"), props.get("params"))
+
+    def reads(self):
+        expressions = [expr for _, expr in self.assignments] + ([self.guard] if self.guard else [])
+        names = set().union(*(expr.names for expr in expressions)) if expressions else set()
+        return names - set(self.params)
+
+    def writes(self):
+        return [key for key, _ in self.assignments]
+
+
+def _clip(value, low, high):
+    return low if value < low else high if value > high else value
+
+def _column(columns, key, default, n):
+    if key in columns:
+        return get_column(columns, key, default)  # None rows take the default too
+    return np.full(n, default)
+
+def _guarded_column(columns, key, n):
+    if key in columns:
+        return columns[key]
+    return np.full(n, None, dtype=object)
+
+def _fill_missing(column, default):
+    if column.dtype != object:
+        return column
+    return np.array([default if value is None else value for value in column])
+
+def _as_column(value, n):
+    return np.full(n, value) if np.ndim(value) == 0 else value
+
+
+def generate_source(rules, vector):
+    """
+    Emits the body of a fused function applying `rules` in order. Keys written by an
+    earlier rule are carried in locals; keys only read are fetched per rule with that
+    rule's default, exactly as each law would have done on its own. In the dict form a
+    guarded rule stores its writes inside the guarded branch, so a failed guard leaves
+    the context untouched.
+    """
+    target = "columns" if vector else "context"
+    lines = [f"def fused({target}):"]
+    if vector:
+        lines.append(f"    n = _batch_size({target})")
+    local_names = {}
+    carried = set()  # keys whose local holds the current value
+    stores = []  # keys written back at the end
+    partial = set()  # column form: carried keys that may hold None rows
+
+    def local(key):
+        if key not in local_names:
+            local_names[key] = f"v{len(local_names)}"
+        return local_names[key]
+
+    def load(key, rule):
+        if key in rule.defaults:
+            default = repr(rule.defaults[key])
+            return f"_column({target}, {key!r}, {default}, n)" if vector else f"{target}.get({key!r}, {default})"
+        return f"{target}[{key!r}]"
+
+    for index, rule in enumerate(rules):
+        lines.append(f"    # {rule.name!r}")  # repr: a pack key must not be able to end the comment
+        reads = rule.reads()
+        writes = list(dict.fromkeys(rule.writes()))
+        filled = {}  # key -> local with None rows replaced by this rule's default
+        for key in sorted(reads):
+            if key not in carried:
+                lines.append(f"    {local(key)} = {load(key, rule)}")
+            elif key in partial and key in rule.defaults:
+                filled[key] = f"{local(key)}_{index}"
+                lines.append(f"    {filled[key]} = _fill_missing({local(key)}, {rule.defaults[key]!r})")
+        if vector and rule.guard is not None:
+            # Rows failing the guard keep their value; a missing column starts as None rows
+            for key in sorted(set(writes) - reads - carried):
+                lines.append(f"    {local(key)} = _guarded_column({target}, {key!r}, n)")
+                partial.add(key)
+
+        def resolve(name, rule=rule, filled=filled):
+            if name in rule.params:
+                return repr(rule.params[name])
+            return filled.get(name) or local(name)
+
+        indent = "    "
+        if rule.guard is not None:
+            guard = rule.guard.emit(resolve, vector)
+            if vector:
+                lines.append(f"    g{index} = {guard}")
+            else:
+                lines.append(f"    if {guard}:")
+                indent = "        "
+        for key, expr in rule.assignments:
+            value = expr.emit(resolve, vector)
+            if vector and rule.guard is not None:
+                value = f"_np.where(g{index}, {value}, {local(key)})"
+            lines.append(f"{indent}{local(key)} = {value}")
+
+        if rule.guard is not None and not vector:
+            for key in writes:
+                lines.append(f"{indent}{target}[{key!r}] = {local(key)}")
+            if not writes:
+                lines.append(f"{indent}pass")
+            # Keys this rule may not have assigned are re-read from the context later
+            continue
+        if rule.guard is None:
+            partial.difference_update(writes)
+        carried.update(writes)
+        stores.extend(key for key in writes if key not in stores)
+
+    for key in stores:
+        value = f"_as_column({local(key)}, n)" if vector else local(key)
+        lines.append(f"    {target}[{key!r}] = {value}")
+    lines.append(f"    return {target}")
+    return "\n".join(lines)
+
+
+def external_reads(rules):
+    """
+    Context keys a fused rule set reads before writing them itself.
+    """
+    reads, written = set(), set()
+    for rule in rules:
+        needed = rule.reads() | (set(rule.writes()) if rule.guard else set())
+        reads |= needed - written
+        written.update(rule.writes())
+    return reads
+
+def compile_source(rules):
+    """
+    Python source defining `scalar_fused` and `batch_fused` for the given rules.
+    """
+    scalar = generate_source(rules, vector=False).replace("def fused(", "def scalar_fused(", 1)
+    batch = generate_source(rules, vector=True).replace("def fused(", "def batch_fused(", 1)
+    return scalar + "\n\n" + batch + "\n"
+
+# The only builtins generated code calls; everything else is passed in explicitly
+_BUILTINS = {"min": min, "max": max, "abs": abs}
+
+def load_code(code):
+    """
+    Executes compiled output of compile_source, returning (scalar_fused, batch_fused).
+    The code runs without the regular builtins.
+    """
+    namespace = {
+        "__builtins__": _BUILTINS,
+        "_np": np, "_math": math, "_clip": _clip, "_column": _column,
+        "_as_column": _as_column, "_guarded_column": _guarded_column,
+        "_fill_missing": _fill_missing, "_batch_size": batch_size,
+    }
+    exec(code, namespace)
+    return namespace["scalar_fused"], namespace["batch_fused"]
+
+def load_source(source, filename="<physics>"):
+    return load_code(compile(source, filename, "exec"))
+
+def build_law(name, description, source, code, reads, writes):
+    """
+    Wraps compiled rule code in a Law. Used directly when the code comes from a cache.
+    """
+    scalar_fused, batch_fused = load_code(code)
+    law = Law(name, description, scalar_fused, batch_fused, reads=reads, writes=writes)
+    law.source = source
+    law.code = code
+    return law
+
+def compile_rules(rules, name=None, description=None, filename="<physics>"):
+    """
+    Compiles rules into one Law whose activation_func and batch_func each apply the
+    whole set in a single call. The generated code is kept on law.source and law.code.
+    """
+    rules = list(rules)
+    source = compile_source(rules)
+    if name is None:
+        name = rules[0].name if len(rules) == 1 else f"FusedPhysics[{len(rules)}]"
+    if description is None:
+        description = rules[0].description if len(rules) == 1 else "Fused: " + ", ".join(r.name for r in rules)
+    return build_law(name, description, source, compile(source, filename, "exec"), external_reads(rules),
+                     {key for rule in rules for key in rule.writes()})
+
+# Example use
+if __name__ == "__main__":
+    rules = [
+        Rule.from_props("gravity", {"rule": "harmonic_pull", "params": {"strength": 2.5}}),
+        Rule.from_props("entropy_gate", {"rule": "invert_time_if_stable"}),
+        Rule.from_props("damping", {"set": {"stability": "clip(stability * (0.9 if gravity > 2 else 1.0), 0, 1)"}}),
+    ]
+    law = compile_rules(rules)
+    print(law.source)
+    print("Scalar:", law.apply({"entropy": 0.3, "time_flow": 1.0, "stability": 1.0}))
+    print("Batch:", law.apply_batch({"entropy": np.array([0.3, 0.7]), "time_flow": np.ones(2), "stability": np.ones(2)}))
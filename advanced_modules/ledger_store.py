@@ -0,0 +1,456 @@
+# ledger_store.py
+
+"""
+This module persists the consciousness ledger on disk, so long simulations no longer
+hold every block in memory. Blocks are appended to a log split into segment files.
+Writes are batched and fsynced as a group, and a sparse index (the byte offset of
+every `index_stride`-th block) lets any block be read without loading the chain.
+Reopening a ledger only reads the sparse indexes and scans the newest segment.
+
+Store layout (one directory per ledger):
+    meta.json           format version, checkpoint interval, index stride
+    <first>.seg         length-prefixed, CRC-checked block records from block <first>
+    <first>.idx         sparse offsets of a sealed (rotated) segment, .npy format
+    checkpoints.log     Merkle checkpoint roots, one per line
+    index/              persisted event-type and timestamp index (PersistedLedgerIndex)
+"""
+
+import os
+import json
+import time
+import zlib
+import struct
+import bisect
+from collections import deque
+
+import numpy as np
+from array import array
+from consciousness_blockchain import Block, ConsciousnessLedger, LedgerIndex, merkle_root
+from payload_codec import encode_payload, decode_payload
+
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<II")  # record length, CRC-32 of the record
+_BLOCK = struct.Struct("<qd32s32sH")  # index, timestamp, previous hash, hash, event type length
+_TYPE_ENTRY = np.dtype([("index", "<i8"), ("timestamp", "<f8")])
+
+def encode_block(block, encoded_payload=None):
+    """
+    Record bytes for a block. The payload is stored in the canonical encoding that
+    Block.compute_hash hashes, so a caller that already has it passes it in.
+    """
+    if encoded_payload is None:
+        encoded_payload = encode_payload(block.payload)
+    event_type = block.event_type.encode("utf-8")
+    return b"".join((
+        _BLOCK.pack(block.index, block.timestamp, bytes.fromhex(block.previous_hash),
+                    bytes.fromhex(block.hash), len(event_type)),
+        event_type,
+        encoded_payload,
+    ))
+
+def decode_block(data):
+    index, timestamp, previous_hash, block_hash, type_length = _BLOCK.unpack_from(data)
+    start = _BLOCK.size + type_length
+    event_type = bytes(data[_BLOCK.size:start]).decode("utf-8")
+    payload = decode_payload(data[start:])
+    return Block.restore(index, timestamp, event_type, payload, previous_hash.hex(), block_hash.hex())
+
+
+class _Segment:
+    def __init__(self, path, first, offsets, count, size):
+        self.path = path
+        self.first = first  # index of the segment's first block
+        self.offsets = offsets  # byte offset of blocks first, first + stride, ...
+        self.count = count
+        self.size = size
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def read_at(self, offset):
+        # -> (record bytes, offset of the next record)
+        length, _ = _HEADER.unpack(os.pread(self.fd, _HEADER.size, offset))
+        return os.pread(self.fd, length, offset + _HEADER.size), offset + _HEADER.size + length
+
+
+class SegmentedBlockStore:
+    """
+    Append-only block log usable as a ConsciousnessLedger chain: supports len(),
+    indexing, slicing, iteration and append(). Blocks appended since the last commit
+    live in memory and are lost on a crash; commit() happens automatically every
+    `group_size` blocks or `group_interval` seconds.
+    """
+
+    def __init__(self, path, checkpoint_interval=1024, segment_bytes=64 << 20, group_size=256,
+                 group_interval=1.0, index_stride=64, fsync=True, cache_size=1024):
+        self.path = path
+        self.segment_bytes = segment_bytes
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.fsync = fsync
+        os.makedirs(path, exist_ok=True)
+
+        meta = self._read_meta(checkpoint_interval, index_stride)
+        self.checkpoint_interval = meta["checkpoint_interval"]
+        self.index_stride = meta["index_stride"]
+
+        self.segments = []
+        self.committed = 0  # blocks durable on disk
+        self._open_segments()
+        self._file = open(self.segments[-1].path, "ab")
+        self._buffer = bytearray()
+        self._pending = []  # blocks appended since the last commit
+        self._pending_checkpoints = []
+        self._recent = deque(maxlen=max(int(cache_size), 1))  # the newest blocks, in order
+        self._last_commit = time.monotonic()
+
+    def _read_meta(self, checkpoint_interval, index_stride):
+        meta_path = os.path.join(self.path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r") as file:
+                meta = json.load(file)
+            if meta.get("version") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported ledger store version: {meta.get('version')}")
+            return meta
+        meta = {"version": FORMAT_VERSION, "checkpoint_interval": checkpoint_interval, "index_stride": index_stride}
+        with open(meta_path, "w") as file:
+            json.dump(meta, file)
+        return meta
+
+    def _segment_path(self, first, suffix):
+        return os.path.join(self.path, f"{first:012d}{suffix}")
+
+    def _scan(self, path):
+        """
+        Reads a segment's records to rebuild its sparse offsets. A torn or corrupt
+        tail (an interrupted write) is truncated away. Returns (offsets, count, size).
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        offsets, count, offset = [], 0, 0
+        while offset + _HEADER.size <= len(data):
+            length, crc = _HEADER.unpack_from(data, offset)
+            end = offset + _HEADER.size + length
+            if end > len(data) or zlib.crc32(data[offset + _HEADER.size:end]) != crc:
+                break
+            if count % self.index_stride == 0:
+                offsets.append(offset)
+            count += 1
+            offset = end
+        if offset != len(data):
+            with open(path, "r+b") as file:
+                file.truncate(offset)
+        return offsets, count, offset
+
+    def _open_segments(self):
+        firsts = sorted(int(name[:-4]) for name in os.listdir(self.path) if name.endswith(".seg"))
+        if not firsts:
+            open(self._segment_path(0, ".seg"), "wb").close()
+            firsts = [0]
+        for position, first in enumerate(firsts):
+            path = self._segment_path(first, ".seg")
+            index_path = self._segment_path(first, ".idx")
+            last = position == len(firsts) - 1
+            if not last and os.path.exists(index_path):
+                # Sealed segment: its size and block count follow from the neighbours
+                offsets = np.load(index_path)
+                count = firsts[position + 1] - first
+                size = os.path.getsize(path)
+            else:
+                offsets, count, size = self._scan(path)
+                offsets = np.asarray(offsets, dtype=np.uint64)
+            self.segments.append(_Segment(path, first, offsets, count, size))
+        self.committed = self.segments[-1].first + self.segments[-1].count
+        self._firsts = [segment.first for segment in self.segments]
+        # The active segment keeps a growable offset list
+        self.segments[-1].offsets = self.segments[-1].offsets.tolist()
+
+    def __len__(self):
+        return self.committed + len(self._pending)
+
+    def append(self, block, encoded_payload=None):
+        if block.index != len(self):
+            raise ValueError(f"Expected block {len(self)}, got {block.index}.")
+        active = self.segments[-1]
+        if (block.index - active.first) % self.index_stride == 0:
+            active.offsets.append(active.size + len(self._buffer))
+        data = encode_block(block, encoded_payload)
+        self._buffer += _HEADER.pack(len(data), zlib.crc32(data))
+        self._buffer += data
+        self._pending.append(block)
+        self._recent.append(block)
+        if len(self._pending) >= self.group_size or time.monotonic() - self._last_commit >= self.group_interval:
+            self.commit()
+
+    def append_checkpoint(self, root):
+        self._pending_checkpoints.append(root)
+
+    def load_checkpoints(self):
+        checkpoint_path = os.path.join(self.path, "checkpoints.log")
+        if not os.path.exists(checkpoint_path):
+            return []
+        with open(checkpoint_path, "r") as file:
+            roots = [line.strip() for line in file if len(line.strip()) == 64]
+        sealed = self.committed // self.checkpoint_interval
+        if len(roots) > sealed:
+            # Roots of blocks lost in a torn write; drop them before new ones are appended
+            roots = roots[:sealed]
+            with open(checkpoint_path, "w") as file:
+                file.write("".join(root + "\n" for root in roots))
+        return roots
+
+    def commit(self):
+        """
+        Writes and fsyncs every pending block as one group, then rotates the active
+        segment if it has grown past segment_bytes.
+        """
+        self._last_commit = time.monotonic()
+        if self._pending:
+            self._file.write(self._buffer)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            active = self.segments[-1]
+            active.size += len(self._buffer)
+            active.count += len(self._pending)
+            self.committed += len(self._pending)
+            self._buffer = bytearray()
+            self._pending = []
+
+        if self._pending_checkpoints:
+            with open(os.path.join(self.path, "checkpoints.log"), "a") as file:
+                file.write("".join(root + "\n" for root in self._pending_checkpoints))
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+            self._pending_checkpoints = []
+
+        if self.segments[-1].size >= self.segment_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        active = self.segments[-1]
+        active.offsets = np.asarray(active.offsets, dtype=np.uint64)
+        with open(self._segment_path(active.first, ".idx"), "wb") as file:
+            np.save(file, active.offsets)
+        self._file.close()
+        path = self._segment_path(self.committed, ".seg")
+        self._file = open(path, "ab")
+        self.segments.append(_Segment(path, self.committed, [], 0, 0))
+        self._firsts.append(self.committed)
+
+    def _locate(self, index):
+        # -> (segment, offset of the nearest indexed block at or before `index`, records to skip)
+        segment = self.segments[bisect.bisect_right(self._firsts, index) - 1]
+        slot, skip = divmod(index - segment.first, self.index_stride)
+        return segment, int(segment.offsets[slot]), skip
+
+    def _read(self, index):
+        recent_start = len(self) - len(self._recent)
+        if index >= recent_start:
+            return self._recent[index - recent_start]
+        if index >= self.committed:
+            return self._pending[index - self.committed]
+        segment, offset, skip = self._locate(index)
+        for _ in range(skip):
+            length, _ = _HEADER.unpack(os.pread(segment.fd, _HEADER.size, offset))
+            offset += _HEADER.size + length
+        return decode_block(segment.read_at(offset)[0])
+
+    def iter_range(self, start, stop):
+        """
+        Yields blocks [start, stop) with sequential reads.
+        """
+        index = start
+        while index < min(stop, self.committed):
+            segment, offset, skip = self._locate(index)
+            end = min(stop, segment.first + segment.count)
+            with open(segment.path, "rb") as file:
+                file.seek(offset)
+                for position in range(index - skip, end):
+                    length, _ = _HEADER.unpack(file.read(_HEADER.size))
+                    data = file.read(length)
+                    if position >= index:
+                        yield decode_block(data)
+            index = end
+        for index in range(max(index, self.committed), min(stop, len(self))):
+            yield self._pending[index - self.committed]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            blocks = list(self.iter_range(start, stop)) if start < stop else []
+            return blocks[::step] if step != 1 else blocks
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("block index out of range")
+        return self._read(key)
+
+    def __iter__(self):
+        return self.iter_range(0, len(self))
+
+    def close(self):
+        self.commit()
+        self._file.close()
+        for segment in self.segments:
+            os.close(segment.fd)
+
+
+class PersistedLedgerIndex(LedgerIndex):
+    """
+    LedgerIndex mirrored to `path`: timestamps.idx holds one float64 per block,
+    types.json maps event types to files of (int64 index, float64 timestamp) entries.
+    New entries are appended by flush(), which PersistentLedger calls whenever the
+    block store commits. Index files may lag behind the block log after a crash;
+    PersistentLedger re-indexes the missing blocks on open.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._files = {}  # event_type -> file name
+        self._flushed = 0
+        self._type_flushed = {}
+
+    @classmethod
+    def load(cls, path, limit):
+        """
+        Loads the persisted index, keeping only entries for blocks below `limit`.
+        """
+        index = cls(path)
+        types_path = os.path.join(path, "types.json")
+        timestamps_path = os.path.join(path, "timestamps.idx")
+        if not os.path.exists(types_path) or not os.path.exists(timestamps_path):
+            return index
+        with open(types_path, "r") as file:
+            index._files = json.load(file)
+        timestamps = np.fromfile(timestamps_path, dtype="<f8")
+        covered = min(len(timestamps), limit)
+        index.timestamps = array("d", timestamps[:covered].tobytes())
+        index._flushed = covered
+        index._truncate(timestamps_path, covered * 8)
+        for event_type, name in index._files.items():
+            file_path = os.path.join(path, name)
+            entries = np.fromfile(file_path, dtype=_TYPE_ENTRY) if os.path.exists(file_path) else np.empty(0, _TYPE_ENTRY)
+            entries = entries[:np.searchsorted(entries["index"], covered)]
+            index.types[event_type] = (array("q", entries["index"].tobytes()), array("d", entries["timestamp"].tobytes()))
+            index._type_flushed[event_type] = len(entries)
+            index._truncate(file_path, entries.nbytes)
+        if covered:
+            index._latest = index.timestamps[-1]
+        return index
+
+    @staticmethod
+    def _truncate(file_path, size):
+        if os.path.exists(file_path) and os.path.getsize(file_path) > size:
+            with open(file_path, "r+b") as file:
+                file.truncate(size)
+
+    def flush(self):
+        new_types = [t for t in self.types if t not in self._files]
+        if new_types:
+            for event_type in new_types:
+                self._files[event_type] = f"type_{len(self._files):05d}.idx"
+            tmp_path = os.path.join(self.path, "types.json.tmp")
+            with open(tmp_path, "w") as file:
+                json.dump(self._files, file)
+            os.replace(tmp_path, os.path.join(self.path, "types.json"))
+
+        with open(os.path.join(self.path, "timestamps.idx"), "ab") as file:
+            file.write(self.timestamps[self._flushed:].tobytes())
+        self._flushed = len(self.timestamps)
+        for event_type, (indexes, timestamps) in self.types.items():
+            done = self._type_flushed.get(event_type, 0)
+            if done == len(indexes):
+                continue
+            entries = np.empty(len(indexes) - done, dtype=_TYPE_ENTRY)
+            entries["index"] = np.frombuffer(indexes, dtype=np.int64)[done:]
+            entries["timestamp"] = np.frombuffer(timestamps, dtype=np.float64)[done:]
+            with open(os.path.join(self.path, self._files[event_type]), "ab") as file:
+                file.write(entries.tobytes())
+            self._type_flushed[event_type] = len(indexes)
+
+
+class PersistentLedger(ConsciousnessLedger):
+    """
+    ConsciousnessLedger whose chain is a SegmentedBlockStore in `path`. Opens an
+    existing ledger or creates a new one; the checkpoint interval of an existing
+    ledger is taken from the store.
+    """
+
+    def __init__(self, path, checkpoint_interval=1024, **store_options):
+        store_options.setdefault("cache_size", checkpoint_interval)
+        self.store = SegmentedBlockStore(path, checkpoint_interval, **store_options)
+        self.chain = self.store
+        self.checkpoint_interval = self.store.checkpoint_interval
+        self.checkpoints = self.store.load_checkpoints()
+        self._reseal_checkpoints()
+        self._verified = 0
+        sealed_end = len(self.checkpoints) * self.checkpoint_interval
+        self._open_hashes = [block.hash for block in self.store.iter_range(sealed_end, len(self.store))]
+        self.event_index = PersistedLedgerIndex.load(os.path.join(path, "index"), len(self.store))
+        for block in self.store.iter_range(len(self.event_index), len(self.store)):
+            self.event_index.add(block.index, block.event_type, block.timestamp)
+        if not len(self.chain):
+            self.genesis_block()
+
+    def _reseal_checkpoints(self):
+        # Roots still pending when the process stopped are lost even if their blocks
+        # were committed; rebuild them, or later seals would cover the wrong blocks
+        interval = self.checkpoint_interval
+        sealed = len(self.store) // interval
+        if len(self.checkpoints) == sealed:
+            return
+        for checkpoint in range(len(self.checkpoints), sealed):
+            start = checkpoint * interval
+            self.checkpoints.append(merkle_root([block.hash for block in self.store.iter_range(start, start + interval)]))
+            self.store.append_checkpoint(self.checkpoints[-1])
+        self.store.commit()
+
+    def _append(self, block, encoded_payload):
+        committed = self.store.committed
+        self.store.append(block, encoded_payload)
+        self.event_index.add(block.index, block.event_type, block.timestamp)
+        self._open_hashes.append(block.hash)
+        if self.store.committed != committed:
+            # The store group-committed: persist the index with it, so a reopen
+            # only re-indexes blocks appended since
+            self.event_index.flush()
+
+    def _seal_checkpoint(self):
+        super()._seal_checkpoint()
+        self.store.append_checkpoint(self.checkpoints[-1])
+
+    def commit(self):
+        self.store.commit()
+        self.event_index.flush()
+
+    def close(self):
+        self.store.close()
+        self.event_index.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Example use
+if __name__ == "__main__":
+    import tempfile
+
+    ledger_path = os.path.join(tempfile.mkdtemp(), "realm-ledger")
+    n = 200_000
+    started = time.perf_counter()
+    with PersistentLedger(ledger_path, segment_bytes=4 << 20) as ledger:
+        for tick in range(n):
+            ledger.add_event("tick", {"context_snapshot": {"entropy": tick * 1e-6, "stability": 1.0}})
+    print(f"Wrote {n} blocks in {time.perf_counter() - started:.2f}s across {len(ledger.store.segments)} segments")
+
+    started = time.perf_counter()
+    reopened = PersistentLedger(ledger_path)
+    print(f"Reopened in {(time.perf_counter() - started) * 1000:.1f} ms:", len(reopened.chain), "blocks")
+    print("Block 123456:", reopened.chain[123456].summarize())
+    print("Ticks since block 199990:", [b.index for b in reopened.events("tick", start=199990)])
+    print("Verified:", reopened.verify_chain(), "| checkpoints:", len(reopened.checkpoints))
+    reopened.close()
@@ -30,15 +30,30 @@ class MemoryShard:
             "emotional_charge_avg": round(sum(t.emotional_charge for t in self.threads) / len(self.threads), 3) if self.threads else 0
         }
 
-    def inject_to_cluster(self, cluster: ThreadCluster):
+    def inject_to_cluster(self, cluster: ThreadCluster, dedup=False):
+        """
+        Adds the shard's threads to a cluster. With dedup=True, threads whose content
+        fingerprint is already present in the cluster are skipped (looked up through
+        the cluster's fingerprint index). Returns the number of threads injected.
+        """
+        injected = 0
         for t in self.threads:
+            if dedup and cluster.contains_fingerprint(t.fingerprint):
+                continue
             cluster.add_thread(t)
+            injected += 1
+        return injected
 
 # Utility function to create a shard from a cluster subset
 
-def extract_shard(cluster: ThreadCluster, filter_func=lambda t: True, label="FilteredShard"):
+def extract_shard(cluster: ThreadCluster, filter_func=lambda t: True, label="FilteredShard",
+                  origin_label=None, entropy_range=None, emotion_range=None):
+    """
+    origin_label, entropy_range and emotion_range are answered from the cluster's
+    indexes, so filter_func only runs on threads that already match them.
+    """
     shard = MemoryShard(source_id="cluster", label=label)
-    for t in cluster.threads:
+    for t in cluster.select(origin_label, entropy_range, emotion_range):
         if filter_func(t):
             shard.add_thread(t)
     return shard
@@ -53,3 +68,7 @@ if __name__ == "__main__":
 
     shard = extract_shard(cluster, filter_func=lambda t: t.emotional_charge > 0.3, label="PositiveMemory")
     print("Shard Summary:", shard.summarize())
+
+    calm = extract_shard(cluster, entropy_range=(0.0, 0.2), label="CalmMemory")
+    print("Calm Shard:", calm.summarize())
+    print("Injected after dedup:", calm.inject_to_cluster(cluster, dedup=True))
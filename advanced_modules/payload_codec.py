@@ -0,0 +1,340 @@
+# payload_codec.py
+
+"""
+This module defines the canonical binary encoding of ledger payloads. The same
+bytes are hashed into Block.hash and written by the on-disk ledger store, so a
+payload always hashes the same way regardless of dict insertion order, NumPy
+print options or float repr.
+
+Payloads that compare equal and hold values of the same types encode identically:
+-0.0 encodes as 0.0 (in arrays too), and numerically equal dict keys or set items of
+different types (True, 1, 1.0), which a dict or set cannot tell apart, encode as the
+int. Values keep their type, so 1 and 1.0 as values still encode differently.
+
+Encoding (one tag byte per value, little-endian, lengths as uint32):
+    N / T / F       None / True / False
+    i <int64>       integers that fit in 64 bits, I <len><bytes> otherwise
+    d <float64>     floats (and NumPy floats); every NaN encodes the same way, -0.0 as 0.0
+    s <len><utf-8>  strings, b <len><bytes> bytes
+    l / u <n> ...   lists / tuples
+    D <n> ...       dicts, entries sorted by the encoded bytes of their keys
+    S <n> ...       sets, items sorted by their encoded bytes
+Sorting by encoded bytes puts the tag first, then (for strings) the length, so
+{"b": ..., "aa": ...} encodes "b" before "aa", whatever the types of the other keys.
+    a <dtype><ndim><shape><raw bytes>   NumPy arrays, C order, little-endian
+Anything else is encoded as its str(), so it decodes (and re-hashes) as a string.
+"""
+
+import math
+import time
+import struct
+import hashlib
+import operator
+
+import numpy as np
+
+_LEN = struct.Struct("<I")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_NAN = b"d" + _FLOAT.pack(float("nan"))
+_NEGATIVE_ZERO = _FLOAT.pack(-0.0)
+_FLAGS = {True: b"T", False: b"F"}
+
+def _encode_int(value, out):
+    if -(1 << 63) <= value < (1 << 63):
+        out.append(b"i" + _INT.pack(value))
+    else:
+        data = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+        out.append(b"I" + _LEN.pack(len(data)) + data)
+
+def _encode_float(value, out):
+    # + 0.0 turns -0.0 into 0.0 and leaves every other float unchanged
+    out.append(_NAN if value != value else b"d" + _FLOAT.pack(value + 0.0))
+
+def _encode_str(value, out):
+    data = value.encode("utf-8")
+    out.append(b"s" + _LEN.pack(len(data)) + data)
+
+def _encode_bytes(value, out):
+    out.append(b"b" + _LEN.pack(len(value)) + bytes(value))
+
+def _encode_sequence(tag):
+    def encode(value, out):
+        out.append(tag + _LEN.pack(len(value)))
+        for item in value:
+            _encode(item, out)
+    return encode
+
+def _encode_key(key):
+    data = key.encode("utf-8")
+    return b"s" + _LEN.pack(len(data)) + data
+
+class _DictLayout:
+    """
+    Encoding plan for dicts with one particular set of str keys (context snapshots
+    repeat the same few key sets every tick): the keys in canonical order, their
+    encodings and, per combination of value types, a struct that packs the whole
+    dict in one call when every value is a float or bool.
+    """
+    __slots__ = ("header", "keys", "encoded", "values", "plans")
+
+    def __init__(self, keys):
+        self.header = b"D" + _LEN.pack(len(keys))
+        self.keys = sorted(keys, key=_encode_key)  # the order of the generic path
+        self.encoded = [_encode_key(key) for key in self.keys]
+        if len(keys) > 1:
+            self.values = operator.itemgetter(*self.keys)
+        elif keys:
+            self.values = lambda value, key=keys[0]: (value[key],)
+        else:
+            self.values = lambda value: ()
+        self.plans = {}  # value types -> (struct, args template, flag slots), or None
+
+    def plan(self, types):
+        plan = self.plans.get(types, False)
+        if plan is False:
+            plan = self._compile(types)
+            if len(self.plans) < 64:
+                self.plans[types] = plan
+        return plan
+
+    def _compile(self, types):
+        fields, template, flags = ["<"], [], []
+        for slot, (encoded, kind) in enumerate(zip(self.encoded, types)):
+            if kind is float or kind is np.float64:
+                fields.append(f"{len(encoded) + 1}sd")
+                template += [encoded + b"d", None]
+            elif kind is bool or kind is np.bool_:
+                fields.append(f"{len(encoded)}sc")
+                template += [encoded, None]
+                flags.append(2 * slot + 1)
+            else:
+                return None
+        return struct.Struct("".join(fields)), template, flags
+
+_LAYOUTS = {}  # key tuple (insertion order) -> _DictLayout, for dicts with str keys only
+
+def _layout(value):
+    keys = tuple(value)
+    layout = _LAYOUTS.get(keys)
+    if layout is None:
+        if not all(type(key) is str for key in keys):
+            return None
+        layout = _DictLayout(keys)
+        if len(_LAYOUTS) < 4096:
+            _LAYOUTS[keys] = layout
+    return layout
+
+def _encode_dict(value, out):
+    layout = _layout(value)
+    if layout is None:
+        out.append(b"D" + _LEN.pack(len(value)))
+        entries = sorted(((_encode_member(key), item) for key, item in value.items()), key=lambda entry: entry[0])
+        for key, item in entries:
+            out.append(key)
+            _encode(item, out)
+        return
+    # Hot path for context snapshots: all floats and bools, packed in one call unless
+    # a NaN or -0.0 needs canonicalising
+    values = layout.values(value)
+    plan = layout.plan(tuple(map(type, values)))
+    if plan is not None:
+        packer, template, flags = plan
+        try:
+            total = math.fsum(values)
+        except (OverflowError, ValueError):
+            total = math.nan  # inf - inf; handled item by item
+        if total == total:
+            args = template.copy()
+            args[1::2] = values
+            for slot in flags:
+                args[slot] = _FLAGS[args[slot]]
+            data = packer.pack(*args)
+            # Seven zero bytes then 0x80 can only be a -0.0: tags are never zero
+            if _NEGATIVE_ZERO not in data:
+                out.append(layout.header)
+                out.append(data)
+                return
+    out.append(layout.header)
+    for encoded, item in zip(layout.encoded, values):
+        kind = type(item)
+        if kind is float or kind is np.float64:
+            out.append(encoded + (_NAN if item != item else b"d" + _FLOAT.pack(item + 0.0)))
+        elif kind is bool:
+            out.append(encoded + (b"T" if item else b"F"))
+        else:
+            out.append(encoded)
+            _encode(item, out)
+
+def _canonical_member(value):
+    # Dict keys and set items that compare equal are one entry, so True, 1 and 1.0
+    # (or -0.0 and 0) must encode alike
+    if isinstance(value, (bool, np.bool_)):
+        return int(value)
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return int(value)
+    return value
+
+def _encode_member(value):
+    return encode_payload(_canonical_member(value))
+
+def _encode_set(value, out):
+    out.append(b"S" + _LEN.pack(len(value)))
+    out.extend(sorted(_encode_member(item) for item in value))
+
+def _encode_array(value, out):
+    if value.dtype.hasobject:
+        _encode_sequence(b"l")(value.tolist(), out)
+        return
+    array = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder("<"))
+    if array.dtype.kind in "fc":
+        # 0.0 for -0.0 and a single NaN, as for scalar floats; the dot product is
+        # NaN only if an element is (or, rarely, for complex infinities)
+        array = (array + np.zeros((), array.dtype)).astype(array.dtype, copy=False)
+        flat = array.reshape(-1)
+        check = flat.dot(flat)
+        if check != check:
+            array[np.isnan(array)] = np.nan
+    dtype = array.dtype.str.encode("ascii")
+    out.append(b"a" + bytes([len(dtype)]) + dtype + bytes([array.ndim])
+               + struct.pack(f"<{array.ndim}Q", *array.shape) + array.tobytes())
+
+_ENCODERS = {
+    type(None): lambda value, out: out.append(b"N"),
+    bool: lambda value, out: out.append(b"T" if value else b"F"),
+    int: _encode_int,
+    float: _encode_float,
+    str: _encode_str,
+    bytes: _encode_bytes,
+    list: _encode_sequence(b"l"),
+    tuple: _encode_sequence(b"u"),
+    dict: _encode_dict,
+    set: _encode_set,
+    frozenset: _encode_set,
+    np.ndarray: _encode_array,
+    np.bool_: lambda value, out: out.append(b"T" if value else b"F"),
+    np.float64: _encode_float,
+    np.float32: lambda value, out: _encode_float(float(value), out),
+    np.int64: lambda value, out: _encode_int(int(value), out),
+    np.int32: lambda value, out: _encode_int(int(value), out),
+}
+
+def _encode(value, out):
+    encoder = _ENCODERS.get(type(value))
+    if encoder is not None:
+        encoder(value, out)
+    elif isinstance(value, np.generic):
+        _encode(value.item(), out)
+    elif isinstance(value, (bool, int, float, str, bytes, list, tuple, dict)):
+        # Subclasses encode like their base type
+        base = next(t for t in (bool, int, float, str, bytes, list, tuple, dict) if isinstance(value, t))
+        _ENCODERS[base](value, out)
+    else:
+        _encode_str(str(value), out)
+
+def encode_payload(value):
+    """
+    Canonical bytes of `value`: equal payloads always encode identically.
+    """
+    out = []
+    _encode(value, out)
+    return b"".join(out)
+
+
+def _decode(data, offset):
+    tag = data[offset]
+    offset += 1
+    if tag == 0x4E:  # N
+        return None, offset
+    if tag == 0x54:  # T
+        return True, offset
+    if tag == 0x46:  # F
+        return False, offset
+    if tag == 0x69:  # i
+        return _INT.unpack_from(data, offset)[0], offset + 8
+    if tag == 0x64:  # d
+        return _FLOAT.unpack_from(data, offset)[0], offset + 8
+    if tag in b"sbI":
+        length = _LEN.unpack_from(data, offset)[0]
+        offset += 4
+        raw = bytes(data[offset:offset + length])
+        if tag == 0x62:  # b
+            value = raw
+        elif tag == 0x49:  # I
+            value = int.from_bytes(raw, "little", signed=True)
+        else:
+            value = raw.decode("utf-8")
+        return value, offset + length
+    if tag in b"luDS":
+        count = _LEN.unpack_from(data, offset)[0]
+        offset += 4
+        if tag == 0x44:  # D
+            value = {}
+            for _ in range(count):
+                key, offset = _decode(data, offset)
+                value[key], offset = _decode(data, offset)
+            return value, offset
+        items = []
+        for _ in range(count):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return (tuple(items) if tag == 0x75 else set(items) if tag == 0x53 else items), offset
+    if tag == 0x61:  # a
+        dtype = np.dtype(bytes(data[offset + 1:offset + 1 + data[offset]]).decode("ascii"))
+        offset += 1 + data[offset]
+        ndim = data[offset]
+        shape = struct.unpack_from(f"<{ndim}Q", data, offset + 1)
+        offset += 1 + 8 * ndim
+        size = dtype.itemsize * math.prod(shape)
+        array = np.frombuffer(bytes(data[offset:offset + size]), dtype=dtype).reshape(shape)
+        return array, offset + size
+    raise ValueError(f"Unknown payload tag {chr(tag)!r} at offset {offset - 1}.")
+
+def decode_payload(data):
+    value, end = _decode(memoryview(data), 0)
+    if end != len(data):
+        raise ValueError("Trailing bytes after payload.")
+    return value
+
+
+def benchmark(ticks=20000, seed=0):
+    """
+    Time to hash realistic ledger payloads with the original f-string scheme versus
+    the canonical encoding. Returns microseconds per block for each event type.
+    """
+    rng = np.random.default_rng(seed)
+    context = {
+        "entropy": np.float64(0.1), "stability": 0.98, "gravity": 1.0, "dream_effect": False,
+        "emotion": 0.51, "cohesion": 1.0, "time_flow": 1.0, "mutation": 1.0,
+        "joy": 0.0, "rage": 0.0, "compassion": 0.0,
+    }
+    payloads = {
+        "tick": [{"context_snapshot": dict(context, entropy=np.float64(e))} for e in rng.random(ticks)],
+        "emotion_emitted": [{"id": "5f0c", "label": "joy", "intensity": 0.6, "volatility": 0.05, "polarity": 1,
+                             "sample_vector": rng.random(5).tolist()} for _ in range(ticks)],
+        "waveform": [{"identity_waveform": rng.random(128)} for _ in range(ticks // 10)],
+    }
+    results = {}
+    for event_type, items in payloads.items():
+        started = time.perf_counter()
+        for index, payload in enumerate(items):
+            hashlib.sha256(f"{index}{1.7e9}{event_type}{payload}{'0' * 64}".encode()).hexdigest()
+        legacy = time.perf_counter() - started
+        header = struct.pack("<qd", 0, 1.7e9) + event_type.encode() + bytes(32)
+        started = time.perf_counter()
+        for payload in items:
+            hashlib.sha256(header + encode_payload(payload)).hexdigest()
+        canonical = time.perf_counter() - started
+        results[event_type] = {
+            "fstring_us": round(legacy / len(items) * 1e6, 2),
+            "canonical_us": round(canonical / len(items) * 1e6, 2),
+        }
+    return results
+
+# Example use
+if __name__ == "__main__":
+    payload = {"context_snapshot": {"stability": 0.98, "entropy": np.float64(0.1)}, "waveform": np.arange(4.0)}
+    reordered = {"waveform": np.arange(4.0), "context_snapshot": {"entropy": 0.1, "stability": 0.98}}
+    print("Order independent:", encode_payload(payload) == encode_payload(reordered))
+    print("Round trip:", decode_payload(encode_payload(payload)))
+    print("Benchmark:", benchmark())
@@ -5,47 +5,225 @@ This module loads physics rule definitions from YAML (or JSON) and converts them
 into active Law objects that can be registered in the logic engine.
 Useful for defining alternate universes, modifying logic sets, or importing
 custom physics on demand.
+
+Entries are written in the rule language from law_expressions.py; the original
+named rules (harmonic_pull, invert_time_if_stable) are still accepted.
+
+Compiled packs are cached on disk (by default in a __physcache__ directory next to
+the pack) under the SHA-256 of the file's content, so loading an unchanged pack
+skips YAML parsing and rule compilation entirely. The cache holds executable code,
+so it is only read from a directory and file owned by the current user and not
+writable by anyone else; otherwise the pack is compiled from source.
 """
 
+import os
+import sys
+import json
+import marshal
+import hashlib
+import threading
+
 import yaml
-from law_core import Law
+from law_expressions import Rule, compile_rules, build_law
+
+CACHE_VERSION = 3  # bumped whenever the generated rule code changes
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)  # libyaml when available
+
+def _owned_privately(path):
+    """
+    True when path belongs to the current user and only they can write to it.
+    Platforms without POSIX ownership (Windows) are trusted as before.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    stat = os.stat(path)
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
 
 class PhysicsLoader:
-    def __init__(self, filepath):
+    def __init__(self, filepath, cache_dir=None, use_cache=True):
         self.filepath = filepath
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(filepath)), "__physcache__")
+        self.use_cache = use_cache
         self.law_list = []
+        self.digest = None  # SHA-256 of the file content currently loaded
+        self._entries = {}  # name -> (record, law), in file order
+        self._rules = {}  # name -> (entry digest, Rule), parsed on demand
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = None
 
     def load(self):
-        with open(self.filepath, 'r') as file:
-            raw = yaml.safe_load(file)
-        self.law_list = self._parse(raw)
+        self.reload()
         return self.law_list
 
+    def reload(self):
+        """
+        Re-reads the pack, recompiling only entries whose definition changed; laws for
+        unchanged entries are kept as the same objects. Returns the entry names that
+        were added, changed and removed.
+        """
+        with self._lock:
+            with open(self.filepath, 'rb') as file:
+                data = file.read()
+            digest = hashlib.sha256(data).hexdigest()
+            if digest == self.digest:
+                return {"added": [], "changed": [], "removed": []}
+
+            records = self._read_cache(digest) if self.use_cache else None
+            if records is None:
+                records = self._parse(yaml.load(data, Loader=_YAML_LOADER))
+                if self.use_cache:
+                    self._write_cache(digest, records)
+
+            entries, added, changed = {}, [], []
+            for record in records:
+                name, entry_digest = record[0], record[1]
+                previous = self._entries.get(name)
+                if previous is not None and previous[0][1] == entry_digest:
+                    entries[name] = previous
+                    continue
+                (added if previous is None else changed).append(name)
+                _, _, _, description, reads, writes, source, code = record
+                entries[name] = (record, build_law(name, description, source, code, reads, writes))
+            removed = [name for name in self._entries if name not in entries]
+
+            self._entries = entries
+            self.law_list = [law for _, law in entries.values()]
+            self.digest = digest
+            return {"added": added, "changed": changed, "removed": removed}
+
     def _parse(self, data):
-        law_objects = []
-        for name, props in data.items():
-            desc = props.get("description", "No description provided.")
-            rule = props.get("rule")
-            params = props.get("params", {})
-
-            def make_func(rule, params):
-                def logic(context):
-                    # Dynamically insert values based on rule logic
-                    if rule == "harmonic_pull":
-                        context["gravity"] = context.get("gravity", 1.0) * params.get("strength", 1.0)
-                    if rule == "invert_time_if_stable":
-                        if context.get("entropy", 1.0) < 0.5:
-                            context["time_flow"] *= -1
-                    return context
-                return logic
-
-            logic_func = make_func(rule, params)
-            law_objects.append(Law(name, desc, logic_func))
-        return law_objects
+        """
+        Compiles pack entries into cache records:
+        (name, entry digest, props json, description, reads, writes, source, code).
+        """
+        records = []
+        for name, props in (data or {}).items():
+            props_json = json.dumps(props, sort_keys=True, default=str)
+            entry_digest = hashlib.sha256(props_json.encode("utf-8")).hexdigest()
+            previous = self._entries.get(name)
+            if previous is not None and previous[0][1] == entry_digest:
+                records.append(previous[0])
+                continue
+            rule = Rule.from_props(name, props)
+            self._rules[name] = (entry_digest, rule)
+            law = compile_rules([rule], filename=f"<physics:{self.filepath}:{name}>")
+            records.append((name, entry_digest, props_json, law.description,
+                            tuple(sorted(law.reads)), tuple(sorted(law.writes)), law.source, law.code))
+        return records
+
+    def _cache_path(self, digest):
+        # Named after the whole file name, so pack.yaml and pack.json keep separate caches
+        name = os.path.basename(self.filepath)
+        return os.path.join(self.cache_dir, f"{name}.{digest}.{sys.implementation.cache_tag}.marshal")
+
+    def _read_cache(self, digest):
+        # A missing, stale, corrupt or untrusted cache file just means compiling from source
+        try:
+            if not (_owned_privately(self.cache_dir) and _owned_privately(self._cache_path(digest))):
+                return None
+            with open(self._cache_path(digest), 'rb') as file:
+                version, cached_digest, records = marshal.loads(file.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return records if version == CACHE_VERSION and cached_digest == digest else None
+
+    def _write_cache(self, digest, records):
+        path = self._cache_path(digest)
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            if not _owned_privately(self.cache_dir):
+                return  # shared or foreign directory: run uncached
+            # Drop caches of earlier versions of this pack
+            prefix = os.path.basename(self.filepath) + "."
+            suffix = f".{sys.implementation.cache_tag}.marshal"
+            for old in os.listdir(self.cache_dir):
+                middle = old[len(prefix):-len(suffix)]
+                if old.startswith(prefix) and old.endswith(suffix) and len(middle) == 64 and middle.isalnum():
+                    os.remove(os.path.join(self.cache_dir, old))
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as file:
+                marshal.dump((CACHE_VERSION, digest, records), file)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # read-only location: run uncached
+
+    @property
+    def rules(self):
+        """
+        Parsed Rule objects for the loaded entries. Packs loaded from cache are
+        parsed lazily, the first time the rules are needed.
+        """
+        rules = []
+        for name, (record, _) in self._entries.items():
+            cached = self._rules.get(name)
+            if cached is None or cached[0] != record[1]:
+                cached = (record[1], Rule.from_props(name, json.loads(record[2])))
+                self._rules[name] = cached
+            rules.append(cached[1])
+        return rules
+
+    def fused_law(self, name=None):
+        """
+        Compiles every loaded rule into a single Law that applies the whole pack in
+        one call, on a dict context or a column context (LawEngine.evaluate_batch).
+        Register it instead of the individual laws to avoid per-law call overhead.
+        """
+        if self.digest is None:
+            self.load()
+        return compile_rules(self.rules, name=name or f"PhysicsPack[{self.filepath}]",
+                             filename=f"<physics:{self.filepath}>")
+
+    def watch(self, interval=1.0, callback=None):
+        """
+        Polls the pack in a background thread and reloads it when its content changes.
+        callback(loader, changes) is called after each reload that changed something,
+        e.g. to swap the updated laws into a running LawEngine. If a reload fails
+        (unreadable file, bad YAML, invalid rule), the previous laws stay loaded and
+        callback(loader, exc) receives the exception instead of a changes dict; without
+        a callback the error is printed. Editors that save by replacing the file avoid
+        a reload ever seeing a partially written pack.
+        """
+        if self._watcher is not None:
+            return
+        if self.digest is None:
+            self.load()
+        self._stop = threading.Event()
+
+        def poll(stop):
+            loaded = seen = None
+            while not stop.wait(interval):
+                try:
+                    stat = os.stat(self.filepath)
+                    current = (stat.st_mtime_ns, stat.st_size)
+                    # Reload once the file has stopped changing, so a half-written
+                    # pack is never picked up
+                    if current == loaded or current != seen:
+                        seen = current
+                        continue
+                    loaded = current
+                    changes = self.reload()
+                except Exception as exc:  # a bad pack must not kill the watcher
+                    if callback is not None:
+                        callback(self, exc)
+                    else:
+                        print(f"[PhysicsLoader] Reload of {self.filepath} failed: {exc}")
+                    continue
+                if callback is not None and any(changes.values()):
+                    callback(self, changes)
+
+        self._watcher = threading.Thread(target=poll, args=(self._stop,), daemon=True)
+        self._watcher.start()
+
+    def stop_watch(self):
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
 
 
 # Example YAML File (for reference):
-"""
+EXAMPLE_PACK = """
 gravity:
   description: Applies harmonic gravity scaling
   rule: harmonic_pull
@@ -55,11 +233,46 @@ gravity:
 entropy_gate:
   description: Inverts time flow if entropy is low
   rule: invert_time_if_stable
+
+stability_damping:
+  description: Damps stability under heavy gravity
+  set:
+    stability: clip(stability * (0.9 if gravity > 2 else 1.0), 0, 1)
+  defaults:
+    stability: 1.0
 """
 
 # Test block
 if __name__ == "__main__":
-    loader = PhysicsLoader("example_physics.yaml")
+    import tempfile
+    import time
+
+    example_path = os.path.join(tempfile.mkdtemp(), "example_physics.yaml")
+    with open(example_path, "w") as file:
+        file.write(EXAMPLE_PACK)
+    loader = PhysicsLoader(example_path)
     laws = loader.load()
     for law in laws:
         print("Loaded Law:", law.describe())
+    print("Fused Law:", loader.fused_law().describe())
+
+    pack_path = os.path.join(tempfile.mkdtemp(), "large_pack.yaml")
+    pack = {f"damping_{i}": {"set": {f"field_{i}": f"field_{i} * 0.99 + {i % 7} * 0.001"}, "defaults": {f"field_{i}": 1.0}}
+            for i in range(5000)}
+    with open(pack_path, "w") as file:
+        yaml.safe_dump(pack, file)
+    for label in ("Cold load", "Cached load"):
+        started = time.perf_counter()
+        count = len(PhysicsLoader(pack_path).load())
+        print(f"{label}: {count} laws in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    watched = PhysicsLoader(pack_path)
+    watched.load()
+    watched.watch(interval=0.05, callback=lambda loader, changes: print("Watch reload:", changes, "|", len(loader.law_list), "laws"))
+    for edit in ("field_0 * 0.5", "field_0 *"):  # the second edit does not parse
+        pack["damping_0"]["set"]["field_0"] = edit
+        with open(pack_path + ".tmp", "w") as file:
+            yaml.safe_dump(pack, file)
+        os.replace(pack_path + ".tmp", pack_path)
+        time.sleep(0.5)
+    watched.stop_watch()
@@ -18,8 +18,9 @@ class QuantumField:
     def collapse_state(self, identity_waveform, threshold=0.5):
         """
         Randomly collapse identity waveform fields based on entropy-weighted probability.
+        Also accepts an (N, size) array of waveforms, each collapsed by its own entropy.
         """
-        entropy = np.std(identity_waveform)
+        entropy = np.std(identity_waveform, axis=-1, keepdims=True)
         mask = np.random.rand(*identity_waveform.shape) < (threshold * entropy)
         collapsed = np.where(mask, 1 - identity_waveform, identity_waveform)
         return np.clip(collapsed, 0.0, 1.0)
@@ -11,7 +11,7 @@ import uuid
 import random
 from memory_threads import MemoryThread
 from identity_binding import IdentityCore
-from law_core import Law
+from law_core import Law, get_column
 
 class ThoughtForge:
     def __init__(self, identity_core: IdentityCore):
@@ -65,7 +65,13 @@ class ThoughtForge:
                 context[label.lower()] = modifier
             return context
 
-        return Law(f"Forged_{label}_{uuid.uuid4().hex[:6]}", description, logic_func)
+        def batch_func(columns):
+            # A missing key starts at the modifier itself, i.e. 1.0 * modifier
+            modifier = 1 + (strength - 0.5) * 0.2
+            columns[label.lower()] = get_column(columns, label.lower(), 1.0) * modifier
+            return columns
+
+        return Law(f"Forged_{label}_{uuid.uuid4().hex[:6]}", description, logic_func, batch_func)
 
     def describe_log(self):
         return [{"id": e["id"], "theme": e["theme"], "strength": e["strength"], "entropy": e["entropy"]} for e in self.creation_log]
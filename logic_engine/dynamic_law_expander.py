@@ -6,13 +6,45 @@ within the Infinite Consciousness Framework. It serves as a programmable brain f
 updating and applying rules in simulated environments or evolving identity states.
 """
 
-from law_core import Law
+from law_core import Law, trace_law, values_equal, freeze_value, MISSING
+from law_profiler import LawProfiler, count_modified, clock
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+import heapq
+import pickle
 import random
+import warnings
+
+def _run_group(laws, indexes, context):
+    """
+    Runs one group of laws in order on a private copy of `context`. Module-level so
+    it can be shipped to a process pool. Returns one record per law:
+    (index, changed, removed, reads, writes, wildcard, seconds).
+    """
+    context = dict(context)
+    records = []
+    for law, index in zip(laws, indexes):
+        started = clock()
+        trace = trace_law(law, context)
+        elapsed = clock() - started
+        for key in trace.removed:
+            del context[key]
+        context.update(trace.changed)
+        records.append((index, trace.changed, trace.removed, trace.reads, trace.writes, trace.wildcard, elapsed))
+    return records
+
+def _run_pickled_group(payload):
+    # _run_group for a job pickled up front, so pickling failures surface in the caller
+    return _run_group(*pickle.loads(payload))
 
 class LawEngine:
     def __init__(self):
         self.laws = []
         self.version = 1.0
+        self._pools = {}
+        self._process_disabled = False  # set once laws or contexts fail to pickle
+        self.profiler = None  # LawProfiler while profiling is enabled
+        self._reset_dependencies()
 
     def register_law(self, law):
         """
@@ -20,6 +52,7 @@ class LawEngine:
         """
         if isinstance(law, Law):
             self.laws.append(law)
+            self._reset_dependencies()
         else:
             raise TypeError("Only Law instances can be registered.")
 
@@ -27,10 +60,330 @@ class LawEngine:
         """
         Apply all registered laws to the simulation context.
         """
+        if self.profiler is not None:
+            return self._evaluate_profiled(context, Law.apply)
         for law in self.laws:
             context = law.apply(context)
         return context
 
+    def enable_profiling(self, sample_size=1024):
+        """
+        Start recording per-law call counts, latencies and modified keys for
+        evaluate, evaluate_batch, evaluate_incremental and evaluate_parallel.
+        Returns the LawProfiler.
+        """
+        if self.profiler is None:
+            self.profiler = LawProfiler(sample_size)
+        return self.profiler
+
+    def disable_profiling(self):
+        profiler, self.profiler = self.profiler, None
+        return profiler
+
+    def profile_report(self, sort_by="total_ms", limit=None):
+        return self.profiler.report(sort_by, limit) if self.profiler is not None else []
+
+    def _evaluate_profiled(self, context, apply):
+        # Kept apart from evaluate so the unprofiled loop pays a single check per tick
+        record = self.profiler.record
+        for law in self.laws:
+            before = dict(context)
+            started = clock()
+            context = apply(law, context)
+            elapsed = clock() - started
+            record(law, elapsed, count_modified(before, context))
+        return context
+
+    def _reset_dependencies(self):
+        # Per-law read/write sets (declared or traced), reverse indexes key -> laws
+        # reading / writing it, and the state evaluate_incremental carries between calls
+        self._law_reads = [None] * len(self.laws)
+        self._law_writes = [set() for _ in self.laws]
+        self._readers = {}
+        self._writers = {}
+        self._wildcard_readers = set()
+        self._dirty = set(range(len(self.laws)))
+        self._snapshot = {}  # context at the start of the last incremental evaluation
+        self._outputs = [{} for _ in self.laws]  # key -> value (or MISSING) each law wrote on its last run
+        self._producers = {}  # key -> laws whose last output includes it
+
+    def _record_dependencies(self, index, reads, writes, wildcard):
+        for key in self._law_reads[index] or ():
+            self._readers[key].discard(index)
+        for key in self._law_writes[index]:
+            self._writers[key].discard(index)
+        self._wildcard_readers.discard(index)
+        if wildcard:
+            self._wildcard_readers.add(index)
+        for key in reads:
+            self._readers.setdefault(key, set()).add(index)
+        for key in writes:
+            self._writers.setdefault(key, set()).add(index)
+        self._law_reads[index] = reads
+        self._law_writes[index] = writes
+
+    def _changed_keys(self, context):
+        snapshot = self._snapshot
+        return [key for key in set(context) | set(snapshot)
+                if not values_equal(context.get(key, MISSING), snapshot.get(key, MISSING))]
+
+    def evaluate_incremental(self, context):
+        """
+        Apply the registered laws, re-running only those whose inputs changed since
+        they last ran. A law's reads/writes come from its declaration or, failing that,
+        from tracing its most recent run. Each law's output from its last run is kept,
+        so a re-run law sees every key as it stood at its position in the law order,
+        even if a later law has since overwritten it. A law whose output changed
+        schedules the later laws reading those keys in the same pass; laws reading a
+        key before any law writes it re-run when the key's value at the start of the
+        tick changed.
+        Gives the same result as evaluate() for laws that are deterministic functions
+        of the keys they read. The context is updated in place and returned; if a law
+        raises, it is left untouched and the next call re-runs every law.
+        """
+        if len(self._law_reads) != len(self.laws):
+            self._reset_dependencies()
+
+        pending = set(self._dirty)
+        changed = self._changed_keys(context)
+        for key in changed:
+            # Readers ahead of the key's first writer see the value the tick started with
+            first_writer = min(self._producers.get(key) or (len(self.laws),))
+            pending.update(reader for reader in self._readers.get(key, ()) if reader <= first_writer)
+        if changed:
+            pending |= self._wildcard_readers
+
+        queue = sorted(pending)
+        view = dict(context)  # the context as the next law in order sees it
+        applied = 0  # laws whose output has been applied to view
+        try:
+            while queue:
+                index = heapq.heappop(queue)
+                for earlier in range(applied, index):
+                    self._apply_output(view, earlier)
+                applied = index + 1
+                law = self.laws[index]
+                if self.profiler is None:
+                    trace = trace_law(law, view)
+                else:
+                    started = clock()
+                    trace = trace_law(law, view)
+                    self.profiler.record(law, clock() - started, len(trace.changed) + len(trace.removed))
+                reads = set(law.reads) if law.reads is not None else trace.reads
+                writes = set(law.writes) if law.writes is not None else trace.writes
+                self._record_dependencies(index, reads, writes, law.reads is None and trace.wildcard)
+
+                removed = set(trace.removed)
+                output = {key: MISSING if key in removed else trace.changed[key] if key in trace.changed
+                          else view.get(key, MISSING) for key in trace.writes}
+                previous = self._outputs[index]
+                moved = [key for key in set(output) | set(previous)
+                         if key not in output or key not in previous or not values_equal(output[key], previous[key])]
+                for key in set(previous) - set(output):
+                    self._producers[key].discard(index)
+                for key in output:
+                    self._producers.setdefault(key, set()).add(index)
+                self._outputs[index] = output
+                self._apply_output(view, index)
+
+                for key in moved:
+                    for reader in self._readers.get(key, set()) | self._wildcard_readers:
+                        if reader > index and reader not in pending:
+                            pending.add(reader)
+                            heapq.heappush(queue, reader)
+        except BaseException:
+            self._dirty = set(range(len(self.laws)))
+            raise
+        for earlier in range(applied, len(self.laws)):
+            self._apply_output(view, earlier)
+
+        self._dirty = set()
+        self._snapshot = {key: freeze_value(value) for key, value in context.items()}
+        for key in [key for key in context if key not in view]:
+            del context[key]
+        context.update(view)
+        return context
+
+    def _apply_output(self, context, index):
+        for key, value in self._outputs[index].items():
+            if value is MISSING:
+                context.pop(key, None)
+            else:
+                context[key] = value
+
+    def dependency_graph(self):
+        """
+        Law name -> names of later laws that read a key it writes, based on declared
+        or most recently traced read/write sets.
+        """
+        graph = {}
+        for i, law in enumerate(self.laws):
+            graph[law.name] = [
+                other.name for j, other in enumerate(self.laws[i + 1:], start=i + 1)
+                if j in self._wildcard_readers or self._law_writes[i] & (self._law_reads[j] or set())
+            ]
+        return graph
+
+    def _known_keys(self, index):
+        # Keys a law is expected to touch, or None if unknown / the whole context
+        law = self.laws[index]
+        reads = law.reads if law.reads is not None else self._law_reads[index]
+        if reads is None or (law.reads is None and index in self._wildcard_readers):
+            return None
+        writes = law.writes if law.writes is not None else self._law_writes[index]
+        return set(reads) | set(writes)
+
+    def law_groups(self):
+        """
+        Partitions the laws into groups that share no context keys, using declared or
+        previously traced read/write sets. Laws whose keys are unknown join every
+        group. Each group is a sorted list of law indexes; groups are ordered by
+        their first law.
+        """
+        if len(self._law_reads) != len(self.laws):
+            self._reset_dependencies()
+        parent = list(range(len(self.laws)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(i, j):
+            i, j = find(i), find(j)
+            if i != j:
+                parent[max(i, j)] = min(i, j)
+
+        owner = {}
+        for index in range(len(self.laws)):
+            keys = self._known_keys(index)
+            if keys is None:
+                for other in range(len(self.laws)):
+                    union(index, other)
+                continue
+            for key in keys:
+                if key in owner:
+                    union(index, owner[key])
+                else:
+                    owner[key] = index
+
+        groups = {}
+        for index in range(len(self.laws)):
+            groups.setdefault(find(index), []).append(index)
+        return [groups[root] for root in sorted(groups)]
+
+    def _pool(self, executor, max_workers):
+        if isinstance(executor, Executor):
+            return executor
+        if executor not in ("thread", "process"):
+            raise ValueError("executor must be 'thread', 'process' or an Executor instance.")
+        if executor not in self._pools:
+            pool_class = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+            self._pools[executor] = pool_class(max_workers=max_workers)
+        return self._pools[executor]
+
+    def evaluate_parallel(self, context, executor="thread", max_workers=None):
+        """
+        Apply the registered laws with independent law groups (see law_groups) running
+        concurrently on a thread or process pool. Each group sees the keys it is expected
+        to touch; afterwards every law's traced reads/writes are checked against its
+        group. If a law strayed outside it, the parallel results are discarded and the
+        tick re-runs sequentially, which also refreshes the dependency sets.
+        Writes are merged in law order, so the result is identical to evaluate().
+        `executor` is "thread", "process" (laws must then be picklable, i.e. defined at
+        module level) or an Executor instance. If a process pool cannot pickle the laws
+        or context, a RuntimeWarning is issued once and this engine evaluates
+        sequentially from then on. A law that raises after touching keys outside its
+        group also triggers the sequential re-run, so exceptions raised by laws
+        propagate as in evaluate().
+        The context is updated in place and returned.
+        """
+        groups = self.law_groups()
+        records = None
+        if len(groups) > 1:
+            pool = self._pool(executor, max_workers)
+            group_keys = [set().union(*(self._known_keys(i) for i in group)) for group in groups]
+            jobs = [([self.laws[i] for i in group], group, {key: context[key] for key in keys if key in context})
+                    for group, keys in zip(groups, group_keys)]
+            futures = None
+            if not isinstance(pool, ProcessPoolExecutor):
+                futures = [pool.submit(_run_group, *job) for job in jobs]
+            elif not self._process_disabled:
+                try:
+                    payloads = [pickle.dumps(job) for job in jobs]
+                except (pickle.PicklingError, TypeError, AttributeError) as error:
+                    self._process_disabled = True
+                    warnings.warn(f"evaluate_parallel: cannot pickle laws or context for the process pool "
+                                  f"({error}); evaluating sequentially from now on.", RuntimeWarning, stacklevel=2)
+                else:
+                    futures = [pool.submit(_run_pickled_group, payload) for payload in payloads]
+
+            results = [] if futures is not None else None
+            for future, keys in zip(futures or (), group_keys):
+                try:
+                    results.append(future.result())
+                except Exception as error:
+                    # A law that failed after reaching outside its group's keys may only have
+                    # failed because they were withheld: the sequential run below settles it
+                    trace = getattr(error, "law_trace", None)
+                    if trace is None or (not trace.wildcard and (trace.reads | trace.writes) <= keys):
+                        raise
+                    results = None
+                    break
+            conflict = results is None or any(
+                wildcard or not (reads | writes) <= keys
+                for group_records, keys in zip(results, group_keys)
+                for _, _, _, reads, writes, wildcard, _ in group_records
+            )
+            if not conflict:
+                records = sorted((record for group_records in results for record in group_records),
+                                 key=lambda record: record[0])
+
+        if records is None:
+            records = _run_group(self.laws, range(len(self.laws)), context)
+        for index, changed, removed, reads, writes, wildcard, elapsed in records:
+            law = self.laws[index]
+            if self.profiler is not None:
+                self.profiler.record(law, elapsed, len(changed) + len(removed))
+            self._record_dependencies(
+                index,
+                set(law.reads) if law.reads is not None else reads,
+                set(law.writes) if law.writes is not None else writes,
+                law.reads is None and wildcard,
+            )
+            for key in removed:
+                del context[key]
+            context.update(changed)
+        return context
+
+    def shutdown(self):
+        """
+        Stops the worker pools created by evaluate_parallel.
+        """
+        for pool in self._pools.values():
+            pool.shutdown()
+        self._pools = {}
+
+    def evaluate_batch(self, columns):
+        """
+        Apply all registered laws to many universes at once. `columns` is a
+        struct-of-arrays context: one array per key, one row per universe.
+        Scalars are broadcast to every row. Laws without a vectorized form are
+        applied row by row automatically.
+        """
+        sizes = {len(value) for value in columns.values() if np.ndim(value) > 0}
+        if len(sizes) > 1:
+            raise ValueError("All context columns must have the same length.")
+        n = sizes.pop() if sizes else 1
+        columns = {key: np.full(n, value) if np.ndim(value) == 0 else np.asarray(value)
+                   for key, value in columns.items()}
+        if self.profiler is not None:
+            return self._evaluate_profiled(columns, Law.apply_batch)
+        for law in self.laws:
+            columns = law.apply_batch(columns)
+        return columns
+
     def evolve(self, tech_context=None):
         """
         Simulate evolution of the law set. This placeholder can be extended
@@ -47,6 +400,7 @@ class LawEngine:
         Introduce mutations in law parameters or registration order.
         """
         random.shuffle(self.laws)
+        self._reset_dependencies()
         print("[Mutate] Law order shuffled. Possible behavior drift initiated.")
 
     def describe_laws(self):
@@ -55,15 +409,25 @@ class LawEngine:
 
 # Test block
 if __name__ == "__main__":
-    from law_core import identity_preservation_law
+    from law_core import identity_preservation_law, identity_preservation_law_batch
 
     engine = LawEngine()
-    law = Law("Identity Preservation", "Maintains identity coherence.", identity_preservation_law)
+    law = Law("Identity Preservation", "Maintains identity coherence.", identity_preservation_law, identity_preservation_law_batch)
     engine.register_law(law)
 
     context = {"identity_waveform": [0.6, 0.7, 0.9], "stability": 1.0, "entropy": 0.6}
     updated_context = engine.evaluate(context)
 
     print("Updated Context:", updated_context)
+    engine.enable_profiling()
+    for _ in range(1000):
+        engine.evaluate(dict(context))
+    print(engine.profiler.format_report())
+    engine.disable_profiling()
+    print("Parallel Context:", engine.evaluate_parallel(dict(context)), "| Groups:", engine.law_groups())
+    engine.shutdown()
+
+    universes = {"identity_waveform": True, "stability": np.linspace(0.5, 1.0, 4), "entropy": np.random.rand(4)}
+    print("Batch Stability:", engine.evaluate_batch(universes)["stability"])
     engine.evolve(tech_context=context)
     print("Registered Laws:", engine.describe_laws())
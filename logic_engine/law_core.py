@@ -6,17 +6,28 @@ Each law is treated as an object with a unique identity and an activation functi
 transforms simulation context or identity state.
 """
 
+import struct
+
+import numpy as np
+
 class Law:
-    def __init__(self, name, description, activation_func):
+    def __init__(self, name, description, activation_func, batch_func=None, reads=None, writes=None):
         """
         Args:
             name (str): Unique name of the law
             description (str): Short summary of the rule or transformation
             activation_func (function): A function that takes in context and returns transformed context
+            batch_func (function, optional): Vectorized form of activation_func that takes and
+                returns a column context (dict of key -> NumPy array, one row per universe)
+            reads (iterable, optional): Context keys the law reads; inferred by tracing when omitted
+            writes (iterable, optional): Context keys the law may write; inferred by tracing when omitted
         """
         self.name = name
         self.description = description
         self.activation_func = activation_func
+        self.batch_func = batch_func
+        self.reads = frozenset(reads) if reads is not None else None
+        self.writes = frozenset(writes) if writes is not None else None
 
     def apply(self, context):
         """
@@ -28,6 +39,19 @@ class Law:
         """
         return self.activation_func(context)
 
+    def apply_batch(self, columns):
+        """
+        Apply the law to a column context holding many universes at once.
+        Laws without a batch_func fall back to activation_func, one row at a time.
+        Args:
+            columns (dict): Key -> 1-D NumPy array, all of equal length
+        Returns:
+            dict: Modified column context
+        """
+        if self.batch_func is not None:
+            return self.batch_func(columns)
+        return apply_rowwise(self.activation_func, columns)
+
     def describe(self):
         """
         Returns a readable dictionary description of the law.
@@ -38,14 +62,212 @@ class Law:
             "activation_signature": str(self.activation_func.__name__)
         }
 
+# Dependency tracing
+MISSING = object()
+
+def values_equal(a, b):
+    """
+    Strict equality used for change detection: same type and same value
+    (element-wise for arrays). Floats are compared bit for bit, so -0.0 differs
+    from 0.0 and a NaN equals itself. Anything that cannot be compared counts as changed.
+    """
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, float):
+        return struct.pack("<d", a) == struct.pack("<d", b)
+    if isinstance(a, complex):
+        return struct.pack("<dd", a.real, a.imag) == struct.pack("<dd", b.real, b.imag)
+    if isinstance(a, (np.floating, np.complexfloating)):
+        return a.tobytes() == b.tobytes()
+    if isinstance(a, np.ndarray):
+        if a.shape != b.shape or a.dtype != b.dtype:
+            return False
+        if a.dtype.kind in "fc":
+            return a.tobytes() == b.tobytes()
+        return bool(np.array_equal(a, b))
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+def freeze_value(value):
+    # Snapshot helper: copies the mutable containers a law could edit in place
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, (list, dict, set)):
+        return type(value)(value)
+    return value
+
+class TracingContext(dict):
+    """
+    Copy of a context that records which keys a law reads and writes. Iterating
+    over the whole context (keys, items, copy, ...) marks the law as a wildcard
+    reader, i.e. dependent on every key.
+    """
+
+    def __init__(self, context):
+        super().__init__(context)
+        self.reads = set()
+        self.writes = set()
+        self.wildcard = False
+
+    def __getitem__(self, key):
+        self.reads.add(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.reads.add(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self.reads.add(key)
+        return super().__contains__(key)
+
+    def __setitem__(self, key, value):
+        self.writes.add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.writes.add(key)
+        super().__delitem__(key)
+
+    def setdefault(self, key, default=None):
+        self.reads.add(key)
+        self.writes.add(key)
+        return super().setdefault(key, default)
+
+    def pop(self, key, *default):
+        self.reads.add(key)
+        self.writes.add(key)
+        return super().pop(key, *default)
+
+    def update(self, *args, **kwargs):
+        updates = dict(*args, **kwargs)
+        self.writes.update(updates)
+        super().update(updates)
+
+    def _read_all(self):
+        self.wildcard = True
+
+    def keys(self):
+        self._read_all()
+        return super().keys()
+
+    def values(self):
+        self._read_all()
+        return super().values()
+
+    def items(self):
+        self._read_all()
+        return super().items()
+
+    def __iter__(self):
+        self._read_all()
+        return super().__iter__()
+
+    def __len__(self):
+        self._read_all()
+        return super().__len__()
+
+    def copy(self):
+        self._read_all()
+        return dict(super().items())
+
+class LawTrace:
+    def __init__(self, reads, writes, wildcard, changed, removed):
+        self.reads = reads  # keys the law read
+        self.writes = writes  # keys the law assigned, changed or removed
+        self.wildcard = wildcard  # True if the law read the context as a whole
+        self.changed = changed  # key -> new value, for keys now bound to a different object
+        self.removed = removed  # keys the law deleted
+
+def trace_law(law, context):
+    """
+    Runs a law on a TracingContext copy of `context`, leaving `context` untouched.
+    A written key counts as changed unless it still holds the very same object, so
+    merging trace.changed reproduces the law's output exactly. Mutable values are
+    assumed to be replaced, not edited in place. If the law raises, the exception
+    carries the keys touched so far as `law_trace`.
+    """
+    traced = TracingContext(context)
+    try:
+        result = law.apply(traced)
+    except Exception as error:
+        error.law_trace = LawTrace(set(traced.reads), set(traced.writes), traced.wildcard, {}, [])
+        raise
+    if result is None:
+        result = traced
+    if result is traced:
+        candidates = traced.writes
+        present = lambda key: dict.__contains__(traced, key)
+        value_of = lambda key: dict.__getitem__(traced, key)
+    else:
+        # The law built a new context: diff it against the input as a whole
+        candidates = set(result) | set(context)
+        present = lambda key: key in result
+        value_of = lambda key: result[key]
+
+    changed, removed = {}, []
+    for key in candidates:
+        if not present(key):
+            if key in context:
+                removed.append(key)
+        elif context.get(key, MISSING) is not value_of(key):
+            changed[key] = value_of(key)
+    writes = set(traced.writes) | set(changed) | set(removed)
+    return LawTrace(set(traced.reads), writes, traced.wildcard, changed, removed)
+
+# Column context helpers
+def batch_size(columns):
+    return len(next(iter(columns.values()))) if columns else 0
+
+def get_column(columns, key, default):
+    """
+    Column context equivalent of context.get(key, default). Rows holding None
+    (rows that lack the key) get the default too.
+    """
+    if key not in columns:
+        return np.full(batch_size(columns), default)
+    column = columns[key]
+    if column.dtype == object and any(value is None for value in column):
+        column = np.array([default if value is None else value for value in column])
+    return column
+
+def contexts_to_columns(contexts):
+    contexts = list(contexts)
+    keys = list(dict.fromkeys(key for context in contexts for key in context))
+    return {key: np.array([context.get(key) for context in contexts]) for key in keys}
+
+# In a column context, None marks a row that lacks the key: contexts_to_columns
+# writes None for missing keys and columns_to_contexts leaves them out again
+def columns_to_contexts(columns):
+    rows = {key: np.asarray(values).tolist() for key, values in columns.items()}
+    return [{key: values[i] for key, values in rows.items() if values[i] is not None}
+            for i in range(batch_size(columns))]
+
+def apply_rowwise(activation_func, columns):
+    """
+    Fallback batch path: runs a dict-context activation function on every row and
+    reassembles the results into columns. Keys a row does not produce are None.
+    """
+    results = [activation_func(context) for context in columns_to_contexts(columns)]
+    return contexts_to_columns(results) if results else columns
+
 # Example default law (for testing)
 def identity_preservation_law(context):
     if "identity_waveform" in context:
         context["stability"] = context.get("stability", 1.0) * 0.99  # mild decay
     return context
 
+def identity_preservation_law_batch(columns):
+    if "identity_waveform" in columns:
+        columns["stability"] = get_column(columns, "stability", 1.0) * 0.99
+    return columns
+
 if __name__ == "__main__":
-    test_law = Law("Identity Preservation", "Maintains identity coherence over time.", identity_preservation_law)
+    test_law = Law("Identity Preservation", "Maintains identity coherence over time.", identity_preservation_law, identity_preservation_law_batch)
     ctx = {"identity_waveform": [0.8, 0.9, 0.95], "stability": 1.0}
     new_ctx = test_law.apply(ctx)
     print("Original:", ctx)
@@ -0,0 +1,108 @@
+# law_profiler.py
+
+"""
+Per-law timing for LawEngine. When profiling is enabled the engine reports every
+law call here: the number of calls, cumulative time, latency percentiles over a
+bounded window of recent calls, and how many context keys each call modified.
+Use report() or export_json() to find the laws that dominate tick time.
+"""
+
+import json
+import time
+
+import numpy as np
+from law_core import MISSING, values_equal
+
+clock = time.perf_counter
+
+class LawStats:
+    __slots__ = ("name", "calls", "total", "modified", "samples", "cursor")
+
+    def __init__(self, name, sample_size):
+        self.name = name
+        self.calls = 0
+        self.total = 0.0
+        self.modified = 0
+        self.samples = np.empty(sample_size)  # ring buffer of recent latencies (s)
+        self.cursor = 0
+
+    def record(self, seconds, modified):
+        self.calls += 1
+        self.total += seconds
+        self.modified += modified
+        self.samples[self.cursor % len(self.samples)] = seconds
+        self.cursor += 1
+
+    def summary(self, profiled_total):
+        recent = self.samples[:min(self.cursor, len(self.samples))]
+        p50, p99 = np.percentile(recent, [50, 99]) if len(recent) else (0.0, 0.0)
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "total_ms": round(self.total * 1e3, 3),
+            "share": round(self.total / profiled_total, 4) if profiled_total else 0.0,
+            "mean_us": round(self.total / self.calls * 1e6, 2) if self.calls else 0.0,
+            "p50_us": round(float(p50) * 1e6, 2),
+            "p99_us": round(float(p99) * 1e6, 2),
+            "keys_modified": self.modified,
+            "keys_per_call": round(self.modified / self.calls, 2) if self.calls else 0.0,
+        }
+
+
+def count_modified(before, after):
+    """
+    Keys added, removed or rebound to a different value between two context
+    snapshots. Values edited in place are not detected.
+    """
+    keys = set(before) | set(after)
+    return sum(1 for key in keys
+               if not values_equal(before.get(key, MISSING), after.get(key, MISSING)))
+
+
+class LawProfiler:
+    def __init__(self, sample_size=1024):
+        """
+        Args:
+            sample_size (int): Recent calls per law kept for the p50/p99 estimates
+        """
+        self.sample_size = sample_size
+        self.stats = {}  # law -> LawStats
+        self.started = time.time()
+
+    def record(self, law, seconds, modified):
+        stats = self.stats.get(law)
+        if stats is None:
+            stats = self.stats[law] = LawStats(law.name, self.sample_size)
+        stats.record(seconds, modified)
+
+    def reset(self):
+        self.stats = {}
+        self.started = time.time()
+
+    def report(self, sort_by="total_ms", limit=None):
+        """
+        One summary dict per law, slowest first by default.
+        """
+        profiled_total = sum(stats.total for stats in self.stats.values())
+        rows = [stats.summary(profiled_total) for stats in self.stats.values()]
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return rows[:limit] if limit is not None else rows
+
+    def to_dict(self):
+        return {
+            "started": self.started,
+            "sample_size": self.sample_size,
+            "profiled_ms": round(sum(stats.total for stats in self.stats.values()) * 1e3, 3),
+            "laws": self.report(),
+        }
+
+    def export_json(self, path):
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def format_report(self, limit=10):
+        lines = [f"{'law':<32} {'calls':>8} {'total ms':>10} {'share':>7} {'p50 us':>9} {'p99 us':>9} {'keys/call':>9}"]
+        for row in self.report(limit=limit):
+            lines.append(f"{row['name'][:32]:<32} {row['calls']:>8} {row['total_ms']:>10.2f} {row['share']:>7.1%} "
+                         f"{row['p50_us']:>9.1f} {row['p99_us']:>9.1f} {row['keys_per_call']:>9.2f}")
+        return "\n".join(lines)
@@ -7,16 +7,32 @@ coordinates logic resolution and memory integration.
 """
 
 import numpy as np
+from collections import deque
 from memory_threads import MemoryThread
 
 class CortexEngine:
-    def __init__(self, input_size=64, memory_limit=100):
+    def __init__(self, input_size=64, memory_limit=100, seed=None):
         self.input_size = input_size
         self.signal_register = np.zeros(input_size)
-        self.memory_buffer = []
-        self.memory_limit = memory_limit
+        # Fixed-capacity ring buffer: once full, each append evicts the oldest memory in O(1)
+        self.memory_buffer = deque(maxlen=memory_limit)
         self.logic_overdrive = False  # toggled during abstract processing
 
+        # Batched pipeline state; buffers are reused across calls and only grow
+        self.rng = np.random.default_rng(seed)
+        self.signal_batch = np.zeros((0, input_size))
+        self._noise_buffer = np.zeros((0, input_size))
+        self._pattern_buffer = np.zeros((0, input_size))
+
+    @property
+    def memory_limit(self):
+        return self.memory_buffer.maxlen
+
+    @memory_limit.setter
+    def memory_limit(self, limit):
+        # A deque's maxlen is fixed, so resizing rebuilds it; shrinking keeps the newest memories
+        self.memory_buffer = deque(self.memory_buffer, maxlen=limit)
+
     def receive_input(self, signal):
         """
         Receives new data input (real or simulated sensory feed).
@@ -29,9 +45,7 @@ class CortexEngine:
         """
         Stores meaningful experience patterns in cortex memory.
         """
-        self.memory_buffer.append(thread)
-        if len(self.memory_buffer) > self.memory_limit:
-            self.memory_buffer.pop(0)  # discard oldest memory
+        self.memory_buffer.append(thread)  # deque discards the oldest memory when full
 
     def logic_pulse(self):
         """
@@ -43,6 +57,46 @@ class CortexEngine:
         self.logic_overdrive = False
         return resolved
 
+    def receive_batch(self, signals):
+        """
+        Receives a (batch, input_size) block of input vectors, e.g. one sensor frame per row.
+        The last row also becomes the current signal_register.
+        """
+        signals = np.asarray(signals, dtype=float)
+        if signals.ndim != 2 or signals.shape[1] != self.input_size:
+            raise ValueError("Signal batch does not match cortex dimensions.")
+        self.signal_batch = signals
+        if len(signals):
+            self.signal_register = signals[-1].copy()
+
+    def _buffers(self, batch):
+        if len(self._pattern_buffer) < batch:
+            self._noise_buffer = np.empty((batch, self.input_size))
+            self._pattern_buffer = np.empty((batch, self.input_size))
+        return self._noise_buffer[:batch], self._pattern_buffer[:batch]
+
+    def logic_pulse_batch(self, out=None):
+        """
+        Runs logic_pulse over every row of the received batch in one vectorized pass.
+        Results are written into `out` when given; otherwise into an internal buffer
+        that is reused (and overwritten) by the next call.
+        """
+        batch = len(self.signal_batch)
+        noise, pattern = self._buffers(batch)
+        if out is None:
+            out = pattern
+        elif out.shape != (batch, self.input_size):
+            raise ValueError("Output buffer does not match batch dimensions.")
+
+        self.logic_overdrive = True
+        np.multiply(self.signal_batch, np.pi, out=out)
+        np.sin(out, out=out)
+        self.rng.random(out=noise)
+        np.multiply(out, noise, out=out)
+        np.clip(out, 0, 1, out=out)
+        self.logic_overdrive = False
+        return out
+
     def memory_index(self):
         """
         Returns a compact list of memory summaries.
@@ -56,3 +110,7 @@ if __name__ == "__main__":
     cortex.receive_input(sample_signal)
     output = cortex.logic_pulse()
     print("Logic Pulse Result:", output[:5])
+
+    cortex.receive_batch(np.random.rand(1000, 64))
+    batch_output = cortex.logic_pulse_batch()
+    print("Batch Pulse Shape:", batch_output.shape)
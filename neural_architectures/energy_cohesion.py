@@ -11,38 +11,62 @@ from memory_threads import MemoryThread, ThreadCluster
 
 class CohesionAnalyzer:
     def __init__(self, cluster: ThreadCluster):
+        """
+        Attaches to a cluster for its lifetime. Cohesion and report queries read the
+        running entropy/emotion totals that the cluster updates as threads are added,
+        decayed or reinforced, so they cost O(1) regardless of memory count.
+        """
         self.cluster = cluster
 
     def calculate_entropy_distribution(self):
-        return [t.entropy for t in self.cluster.threads]
+        return self.cluster.entropy_values()
 
     def calculate_emotional_spectrum(self):
-        return [t.emotional_charge for t in self.cluster.threads]
+        return self.cluster.emotion_values()
+
+    def _means(self):
+        count = len(self.cluster.threads)
+        if not count:
+            return count, float("nan"), float("nan")
+        return count, self.cluster.entropy_total / count, self.cluster.emotion_total / count
+
+    def _cohesion(self, mean_entropy, mean_emotion):
+        entropy_factor = 1.0 - mean_entropy
+        emotion_balance = 1.0 - abs(mean_emotion)  # closer to 0 = more volatile
+
+        cohesion = (entropy_factor + emotion_balance) / 2
+        return round(np.clip(cohesion, 0.0, 1.0), 3)
 
     def compute_cohesion_index(self):
         """
         Measures how stable the memory cluster is. Range: 0 (unstable) to 1 (highly stable).
         """
-        if not self.cluster.threads:
+        count, mean_entropy, mean_emotion = self._means()
+        if not count:
             return 1.0  # empty cluster is trivially stable
-
-        entropies = self.calculate_entropy_distribution()
-        emotions = self.calculate_emotional_spectrum()
-
-        entropy_factor = 1.0 - np.mean(entropies)
-        emotion_balance = 1.0 - abs(np.mean(emotions))  # closer to 0 = more volatile
-
-        cohesion = (entropy_factor + emotion_balance) / 2
-        return round(np.clip(cohesion, 0.0, 1.0), 3)
+        return self._cohesion(mean_entropy, mean_emotion)
 
     def report(self):
+        count, mean_entropy, mean_emotion = self._means()
         return {
-            "entropy": round(np.mean(self.calculate_entropy_distribution()), 3),
-            "emotion_avg": round(np.mean(self.calculate_emotional_spectrum()), 3),
-            "cohesion_index": self.compute_cohesion_index(),
-            "thread_count": len(self.cluster.threads)
+            "entropy": round(mean_entropy, 3),
+            "emotion_avg": round(mean_emotion, 3),
+            "cohesion_index": self._cohesion(mean_entropy, mean_emotion) if count else 1.0,
+            "thread_count": count
         }
 
+def cohesion_indices(counts, entropy_totals, emotion_totals):
+    """
+    Vectorized compute_cohesion_index for many clusters, given each cluster's
+    thread count and entropy/emotion totals. Empty clusters score 1.0.
+    """
+    counts = np.asarray(counts)
+    safe = np.maximum(counts, 1)
+    entropy_factor = 1.0 - np.asarray(entropy_totals) / safe
+    emotion_balance = 1.0 - np.abs(np.asarray(emotion_totals) / safe)
+    cohesion = np.round(np.clip((entropy_factor + emotion_balance) / 2, 0.0, 1.0), 3)
+    return np.where(counts > 0, cohesion, 1.0)
+
 # Example usage
 if __name__ == "__main__":
     cluster = ThreadCluster()
@@ -52,3 +76,4 @@ if __name__ == "__main__":
 
     analyzer = CohesionAnalyzer(cluster)
     print("Cohesion Report:", analyzer.report())
+    print("Vectorized:", cohesion_indices([len(cluster.threads), 0], [cluster.entropy_total, 0.0], [cluster.emotion_total, 0.0]))
@@ -19,13 +19,29 @@ from dream_weaver import DreamWeaver
 from bci_interface import BCIInterface
 from ai_law_generator import AILawGenerator
 from consciousness_blockchain import ConsciousnessLedger
+from tick_snapshots import SnapshotPolicy
 
 import numpy as np
 
+DEFAULT_CONTEXT = {
+    "entropy": 0.1,
+    "stability": 1.0,
+    "gravity": 1.0,
+    "dream_effect": False,
+    "emotion": 0.0,
+    "cohesion": 1.0,
+    "time_flow": 1.0,
+    "mutation": 1.0,
+    "joy": 0.0,
+    "rage": 0.0,
+    "compassion": 0.0
+}
+
 class ConsciousnessEnvironment:
-    def __init__(self, label="SimRealm-1"):
+    def __init__(self, label="SimRealm-1", snapshot_policy=None):
         self.label = label
         self.identity = IdentityCore(label)
+        self.cohesion = CohesionAnalyzer(self.identity.memory_cluster)
         self.law_engine = LawEngine()
         self.quantum = QuantumField()
         self.ethics = EthicsFirewall()
@@ -34,22 +50,12 @@ class ConsciousnessEnvironment:
         self.bci = BCIInterface()
         self.ledger = ConsciousnessLedger()
         self.generator = AILawGenerator()
+        self.snapshots = snapshot_policy or SnapshotPolicy()
+        self.tick = 0
         self.context = self.initialize_context()
 
     def initialize_context(self):
-        return {
-            "entropy": 0.1,
-            "stability": 1.0,
-            "gravity": 1.0,
-            "dream_effect": False,
-            "emotion": 0.0,
-            "cohesion": 1.0,
-            "time_flow": 1.0,
-            "mutation": 1.0,
-            "joy": 0.0,
-            "rage": 0.0,
-            "compassion": 0.0
-        }
+        return dict(DEFAULT_CONTEXT)
 
     def inject_bci_input(self, eeg_data):
         signal = self.bci.ingest_raw_signal(eeg_data)
@@ -58,6 +64,8 @@ class ConsciousnessEnvironment:
         self.ledger.add_event("bci_injection", {"channels": len(eeg_data)})
 
     def simulate_tick(self):
+        self.tick += 1
+
         # Step 1: Quantum fluctuation
         self.identity.identity_waveform = self.quantum.collapse_state(self.identity.identity_waveform)
 
@@ -74,7 +82,7 @@ class ConsciousnessEnvironment:
         self.context["emotion"] = float(np.mean(self.identity.identity_waveform))
 
         # Step 5: Cohesion recalibration
-        cohesion = CohesionAnalyzer(self.identity.memory_cluster).compute_cohesion_index()
+        cohesion = self.cohesion.compute_cohesion_index()
         self.context["cohesion"] = cohesion
         self.context["stability"] *= cohesion
 
@@ -88,11 +96,18 @@ class ConsciousnessEnvironment:
         self.context["entropy"] += np.random.normal(0, 0.01)
         self.context["entropy"] = np.clip(self.context["entropy"], 0.0, 1.0)
 
-        # Step 8: Log tick
-        self.ledger.add_event("tick", {"context_snapshot": self.context.copy()})
+        # Step 8: Log tick (full snapshot, keyframe + delta or sampled, per snapshot policy)
+        self.snapshots.record(self.ledger, self.tick, self.context)
 
         return self.context
 
+    def replay_tick(self, tick):
+        """
+        Context as of an earlier tick, rebuilt from the ledger.
+        """
+        self.snapshots.flush(self.ledger)
+        return self.snapshots.replay(self.ledger, tick)
+
     def evolve_logic(self):
         new_law = self.generator.generate_law(prompt="Generate entropy-stabilizing law")
         self.law_engine.register_law(new_law)
@@ -117,3 +132,7 @@ if __name__ == "__main__":
     for _ in range(5):
         result = env.simulate_tick()
         print("Tick Result:", result)
+
+    compact = ConsciousnessEnvironment("Xatus-Compact", snapshot_policy=SnapshotPolicy.keyframes(interval=16))
+    history = [dict(compact.simulate_tick()) for _ in range(100)]
+    print("Replayed tick 42 exactly:", compact.replay_tick(42) == history[41], "| blocks:", len(compact.ledger.chain))
@@ -0,0 +1,204 @@
+# multi_entity_environment.py
+
+"""
+This module hosts many conscious entities in one environment. Where
+ConsciousnessEnvironment runs a single identity and context, MultiEntityEnvironment
+keeps the identity waveforms of all N entities in an (N, 128) array and their
+contexts as columns (one array per key, one row per entity), so a tick runs quantum
+collapse, law evaluation, ethics checks, emotional overlay and cohesion for the
+whole population in a handful of array operations. The quantum field, law engine,
+ethics firewall, emotion field and ledger are shared by the realm.
+"""
+
+from identity_binding import IdentityCore
+from memory_threads import MemoryThread
+from energy_cohesion import cohesion_indices
+from dynamic_law_expander import LawEngine
+from quantum_field_layer import QuantumField
+from ethics_firewall import EthicsFirewall
+from synthetic_emotion import EmotionField, SyntheticEmotion
+from dream_weaver import DreamWeaver
+from ai_law_generator import AILawGenerator
+from consciousness_blockchain import ConsciousnessLedger
+from consciousness_environment import DEFAULT_CONTEXT
+from tick_snapshots import SnapshotPolicy
+
+import numpy as np
+
+class MultiEntityEnvironment:
+    def __init__(self, count, label="SimRealm", waveform_size=128, snapshot_policy=None):
+        """
+        Args:
+            count (int): Number of entities hosted by the realm
+            label (str): Realm label; entity i is labelled f"{label}-{i}"
+            waveform_size (int): Samples per identity waveform
+            snapshot_policy (SnapshotPolicy, optional): How tick contexts are logged
+        """
+        self.label = label
+        self.count = int(count)
+        self.labels = [f"{label}-{i}" for i in range(self.count)]
+        self.waveforms = np.random.rand(self.count, waveform_size)
+        self.columns = self.initialize_columns()
+        self.law_engine = LawEngine()
+        self.quantum = QuantumField()
+        self.ethics = EthicsFirewall()
+        self.emotion_field = EmotionField()
+        self.ledger = ConsciousnessLedger()
+        self.generator = AILawGenerator()
+        self.snapshots = snapshot_policy or SnapshotPolicy()
+        self.tick = 0
+
+        # Per-entity memory totals, so cohesion is one vectorized expression
+        self.memory_counts = np.zeros(self.count, dtype=np.int64)
+        self.entropy_totals = np.zeros(self.count)
+        self.emotion_totals = np.zeros(self.count)
+        # Entities with memories get an IdentityCore holding them, for dreams; their
+        # waveform lives in self.waveforms
+        self._identities = {}
+        self._weavers = {}
+
+    def initialize_columns(self):
+        return {key: np.full(self.count, value) for key, value in DEFAULT_CONTEXT.items()}
+
+    def __len__(self):
+        return self.count
+
+    def simulate_tick(self):
+        self.tick += 1
+
+        # Step 1: Quantum fluctuation, each waveform weighted by its own entropy
+        self.waveforms = self.quantum.collapse_state(self.waveforms)
+
+        # Step 2: Law application over all entity contexts at once
+        self.columns = self.law_engine.evaluate_batch(self.columns)
+
+        # Step 3: Ethics filtering
+        violations = self.ethics.evaluate_batch(self.columns)
+        if violations:
+            self.ledger.add_event("ethics_violation", {
+                "violations": {self.labels[row]: messages for row, messages in violations.items()}
+            })
+
+        # Step 4: Emotional overlay; the field's combined vector broadcasts over every waveform
+        self.waveforms = self.emotion_field.resolve_field(self.waveforms)
+        self.columns["emotion"] = self.waveforms.mean(axis=1)
+
+        # Step 5: Cohesion recalibration
+        cohesion = cohesion_indices(self.memory_counts, self.entropy_totals, self.emotion_totals)
+        self.columns["cohesion"] = cohesion
+        self.columns["stability"] = self.columns["stability"] * cohesion
+
+        # Step 6: Auto-dream for entities whose entropy rises too high
+        for row in np.flatnonzero(self.columns["entropy"] > 0.7):
+            self._dream(int(row))
+
+        # Step 7: Context drift update
+        entropy = self.columns["entropy"] + np.random.normal(0, 0.01, self.count)
+        self.columns["entropy"] = np.clip(entropy, 0.0, 1.0)
+
+        # Step 8: Log tick
+        self.snapshots.record(self.ledger, self.tick, {key: column.copy() for key, column in self.columns.items()})
+
+        return self.columns
+
+    def _dream(self, row):
+        identity = self._identities.get(row)
+        if identity is None:
+            return  # nothing to remix without memories
+        weaver = self._weavers.get(row)
+        if weaver is None:
+            weaver = self._weavers[row] = DreamWeaver(identity)
+        dream = weaver.generate_dream(mode="healing", intensity=0.4, loops=3)
+        if dream is None:
+            return
+        law = weaver.render_dream_law(dream)
+        # A theme no entity has dreamt of yet scales from 1.0, as in the dict context
+        self.columns.setdefault(dream["theme"], np.ones(self.count))
+        dreamt = law.apply_batch({key: column[row:row + 1].copy() for key, column in self.columns.items()})
+        for key, value in dreamt.items():
+            self.columns[key][row] = value[0]
+        self.ledger.add_event("dream_state", dict(dream, entity=self.labels[row]))
+
+    def replay_tick(self, tick):
+        """
+        Entity columns as of an earlier tick, rebuilt from the ledger.
+        """
+        self.snapshots.flush(self.ledger)
+        return self.snapshots.replay(self.ledger, tick)
+
+    def entity_context(self, row):
+        """
+        The dict context of one entity.
+        """
+        return {key: column[row].item() for key, column in self.columns.items()}
+
+    def evolve_logic(self):
+        new_law = self.generator.generate_law(prompt="Generate entropy-stabilizing law")
+        self.law_engine.register_law(new_law)
+        self.ledger.add_event("law_generated", new_law.describe())
+
+    def inject_emotion(self, label="joy", intensity=0.6, volatility=0.05, polarity=1):
+        emotion = SyntheticEmotion(label, intensity, volatility, polarity)
+        self.emotion_field.emit(emotion)
+        self.ledger.add_event("emotion_emitted", emotion.to_dict())
+
+    def imprint_memory(self, experience, emotional_charge=0.5, entropy=0.2, origin="experience", rows=None):
+        """
+        Imprints the same experience on the given entity rows (all entities by default).
+        Waveforms are nudged as in IdentityCore.update_waveform, with one draw for all rows.
+        """
+        rows = np.arange(self.count) if rows is None else np.unique(np.asarray(rows, dtype=np.int64))
+        for row in rows.tolist():
+            identity = self._identities.get(row)
+            if identity is None:
+                identity = self._identities[row] = IdentityCore(self.labels[row])
+            identity.memory_cluster.add_thread(MemoryThread(experience, emotional_charge, entropy, origin))
+        self.memory_counts[rows] += 1
+        self.entropy_totals[rows] += entropy
+        self.emotion_totals[rows] += emotional_charge
+        delta = np.random.normal(loc=emotional_charge, scale=entropy, size=(len(rows), self.waveforms.shape[1]))
+        self.waveforms[rows] = np.clip(self.waveforms[rows] + delta * 0.01, 0, 1)
+        self.ledger.add_event("memory_imprinted", {"experience": experience, "entities": len(rows)})
+
+    def summarize(self):
+        return {
+            "label": self.label,
+            "entities": self.count,
+            "tick": self.tick,
+            "mean_entropy": round(float(np.mean(self.columns["entropy"])), 4),
+            "mean_stability": round(float(np.mean(self.columns["stability"])), 4),
+            "mean_cohesion": round(float(np.mean(self.columns["cohesion"])), 4),
+            "ledger_blocks": len(self.ledger.chain),
+        }
+
+# Example use
+if __name__ == "__main__":
+    import time
+    from consciousness_environment import ConsciousnessEnvironment
+
+    realm = MultiEntityEnvironment(2000, "Xatus-Realm", snapshot_policy=SnapshotPolicy.keyframes(interval=16))
+    realm.imprint_memory("Awoke in a simulated world", 0.7, 0.1, "origin")
+    realm.imprint_memory("First contact", -0.2, 0.4, "contact", rows=range(0, 2000, 3))
+    realm.inject_emotion("curiosity", intensity=0.8, volatility=0.02)
+    realm.evolve_logic()
+    history = []
+    started = time.perf_counter()
+    for _ in range(50):
+        history.append({key: column.copy() for key, column in realm.simulate_tick().items()})
+    elapsed = time.perf_counter() - started
+    print(f"Realm of {len(realm)}: {elapsed / 50 * 1000:.2f} ms/tick")
+    print("Summary:", realm.summarize())
+    print("Entity 3:", realm.entity_context(3))
+    replayed = realm.replay_tick(20)
+    print("Replayed tick 20 exactly:", all(np.array_equal(replayed[key], history[19][key]) for key in history[19]))
+
+    envs = [ConsciousnessEnvironment(f"Xatus-{i}") for i in range(200)]
+    for env in envs:
+        env.imprint_memory("Awoke in a simulated world", 0.7, 0.1, "origin")
+        env.inject_emotion("curiosity", intensity=0.8, volatility=0.02)
+    started = time.perf_counter()
+    for _ in range(10):
+        for env in envs:
+            env.simulate_tick()
+    per_entity = (time.perf_counter() - started) / (10 * len(envs))
+    print(f"Separate environments: {per_entity * len(realm) * 1000:.2f} ms/tick for {len(realm)} entities")
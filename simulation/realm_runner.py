@@ -0,0 +1,236 @@
+# realm_runner.py
+
+"""
+This module runs many independent ConsciousnessEnvironment realms in parallel.
+Realms are split into contiguous shards, one per worker process; each worker keeps
+its realms alive between run() calls and ticks them without talking to the
+coordinator until the requested ticks are done. Identity waveforms, context values
+and per-tick metrics are written by the workers straight into
+multiprocessing.shared_memory blocks, so the coordinator reads realm state as NumPy
+arrays without pickling anything.
+
+Shared state (R realms):
+    waveforms   (R, 128) float64     latest identity waveform of every realm
+    contexts    (R, K) float64       latest value of every CONTEXT_KEYS entry (NaN if unset)
+    metrics     (history, R, M)      ring buffer of METRICS per tick
+"""
+
+import random
+import time
+import traceback
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+from consciousness_environment import ConsciousnessEnvironment, DEFAULT_CONTEXT
+
+CONTEXT_KEYS = tuple(DEFAULT_CONTEXT)
+METRICS = ("entropy", "stability", "cohesion", "emotion", "tick_us")
+
+def default_realm(index):
+    return ConsciousnessEnvironment(f"Realm-{index}")
+
+def _attach(name, shape, dtype=np.float64):
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def _realm_worker(first, stop, layout, factory, seed, conn):
+    """
+    Worker loop: builds realms [first, stop), then serves ("run", start_tick, ticks)
+    commands until ("stop",). Replies ("done", busy seconds) or ("error", traceback).
+    Each realm runs all ticks of a command in a row on its own random streams, which
+    are swapped into the global generators once per realm and command.
+    """
+    blocks, arrays = [], {}
+    try:
+        for key, (name, shape) in layout.items():
+            block, arrays[key] = _attach(name, shape)
+            blocks.append(block)
+        waveforms, contexts, metrics = arrays["waveforms"], arrays["contexts"], arrays["metrics"]
+        # Every realm is built and ticked on its own random streams, so it evolves the
+        # same way whichever shard it lands in. QuantumField reseeds the global
+        # generators on construction, so the tick streams are seeded afterwards, or
+        # realms would evolve in lockstep
+        realms, streams = [], []
+        for index in range(first, stop):
+            np.random.seed([seed, index, 0])
+            random.seed((seed * 1_000_003 + index) * 2)
+            realms.append(factory(index))
+            np.random.seed([seed, index, 1])
+            random.seed((seed * 1_000_003 + index) * 2 + 1)
+            streams.append((random.getstate(), np.random.get_state()))
+        conn.send(("ready", stop - first))
+
+        while True:
+            command = conn.recv()
+            if command[0] == "stop":
+                break
+            _, start_tick, ticks = command
+            started = time.perf_counter()
+            for row, realm in enumerate(realms, first):
+                random.setstate(streams[row - first][0])
+                np.random.set_state(streams[row - first][1])
+                for tick in range(start_tick, start_tick + ticks):
+                    tick_started = time.perf_counter()
+                    context = realm.simulate_tick()
+                    tick_us = (time.perf_counter() - tick_started) * 1e6
+                    metrics[tick % len(metrics), row] = (context["entropy"], context["stability"],
+                                                         context["cohesion"], context["emotion"], tick_us)
+                waveforms[row] = realm.identity.identity_waveform
+                contexts[row] = [realm.context.get(key, np.nan) for key in CONTEXT_KEYS]
+                streams[row - first] = (random.getstate(), np.random.get_state())
+            conn.send(("done", time.perf_counter() - started))
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        # Views must be released before their blocks can be closed
+        arrays.clear()
+        waveforms = contexts = metrics = None
+        for block in blocks:
+            block.close()
+        conn.close()
+
+
+class RealmRunner:
+    def __init__(self, realm_count, processes=None, factory=default_realm, history=1024,
+                 waveform_size=128, seed=0):
+        """
+        Args:
+            realm_count (int): Number of realms to run
+            processes (int, optional): Worker processes; defaults to the CPU count
+            factory (callable): factory(index) -> ConsciousnessEnvironment for realm `index`;
+                must be picklable where processes are spawned rather than forked
+            history (int): Ticks of metrics kept in the shared ring buffer
+            waveform_size (int): Samples per identity waveform
+            seed (int): Base seed; every realm has its own random streams, so runs are
+                reproducible for a given seed whatever the process count
+        """
+        self.realm_count = int(realm_count)
+        self.processes = max(1, min(processes or multiprocessing.cpu_count(), self.realm_count))
+        self.history = int(history)
+        self.tick = 0
+        self._blocks = []
+        shapes = {
+            "waveforms": (self.realm_count, waveform_size),
+            "contexts": (self.realm_count, len(CONTEXT_KEYS)),
+            "metrics": (self.history, self.realm_count, len(METRICS)),
+        }
+        layout = {}
+        for key, shape in shapes.items():
+            block = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+            self._blocks.append(block)
+            array = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+            array.fill(np.nan)
+            setattr(self, key, array)
+            layout[key] = (block.name, shape)
+
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:
+            context = multiprocessing.get_context()
+        bounds = np.linspace(0, self.realm_count, self.processes + 1).astype(int)
+        self.shards = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+        self._workers = []
+        for first, stop in self.shards:
+            parent, child = context.Pipe()
+            process = context.Process(target=_realm_worker, args=(first, stop, layout, factory, seed, child),
+                                      daemon=True)
+            process.start()
+            child.close()
+            self._workers.append((process, parent))
+        self._collect()
+
+    def _collect(self):
+        results = []
+        for shard, (_, conn) in enumerate(self._workers):
+            try:
+                status, value = conn.recv()
+            except Exception as error:
+                # The worker died (killed, out of memory) without replying; the shared
+                # blocks must still be unlinked
+                self.close()
+                raise RuntimeError(f"Realm shard {shard} stopped responding: {error!r}") from error
+            if status == "error":
+                self.close()
+                raise RuntimeError(f"Realm shard {shard} failed:\n{value}")
+            results.append(value)
+        return results
+
+    def run(self, ticks=1):
+        """
+        Advances every realm by `ticks` ticks. Workers only synchronise with the
+        coordinator at the end of the call, so run many ticks per call where possible.
+        """
+        started = time.perf_counter()
+        for shard, (_, conn) in enumerate(self._workers):
+            try:
+                conn.send(("run", self.tick, ticks))
+            except OSError as error:
+                self.close()
+                raise RuntimeError(f"Realm shard {shard} stopped responding: {error!r}") from error
+        busy = self._collect()
+        self.tick += ticks
+        elapsed = time.perf_counter() - started
+        return {
+            "ticks": ticks,
+            "seconds": round(elapsed, 4),
+            "realm_ticks_per_s": round(ticks * self.realm_count / elapsed, 1) if elapsed else 0.0,
+            "shard_busy_s": [round(seconds, 4) for seconds in busy],
+        }
+
+    def context(self, key):
+        """
+        Latest value of `key` in every realm, as a (realm_count,) view.
+        """
+        return self.contexts[:, CONTEXT_KEYS.index(key)]
+
+    def metric(self, name, last=None):
+        """
+        (ticks, realm_count) copy of one metric over the retained ticks, oldest first.
+        """
+        kept = min(self.tick, self.history)
+        if last is not None:
+            kept = min(kept, last)
+        slots = np.arange(self.tick - kept, self.tick) % self.history
+        return self.metrics[slots, :, METRICS.index(name)]
+
+    def close(self):
+        for process, conn in self._workers:
+            if process.is_alive():
+                try:
+                    conn.send(("stop",))
+                except (BrokenPipeError, OSError):
+                    pass
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+        self._workers = []
+        self.waveforms = self.contexts = self.metrics = None
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Example use
+if __name__ == "__main__":
+    def seeded_realm(index):
+        realm = ConsciousnessEnvironment(f"Realm-{index}")
+        realm.imprint_memory("Awoke in a simulated world", 0.7, 0.1, "origin")
+        realm.inject_emotion("curiosity", intensity=0.8, volatility=0.02)
+        return realm
+
+    for processes in sorted({1, multiprocessing.cpu_count()}):
+        with RealmRunner(200, processes=processes, factory=seeded_realm, history=256) as runner:
+            runner.run(5)  # warm up
+            stats = runner.run(100)
+            print(f"{processes} process(es): {stats['realm_ticks_per_s']:.0f} realm-ticks/s, shard busy {stats['shard_busy_s']}")
+            print("  mean entropy by tick (last 3):", runner.metric("entropy", last=3).mean(axis=1).round(4))
+            print("  p99 tick latency (us):", round(float(np.percentile(runner.metric("tick_us"), 99)), 1))
+            print("  realm 7 stability:", runner.context("stability")[7], "| waveform[:3]:", runner.waveforms[7, :3])
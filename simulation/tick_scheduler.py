@@ -0,0 +1,228 @@
+# tick_scheduler.py
+
+"""
+This module drives a ConsciousnessEnvironment in real time without the GUI. An
+asyncio TickScheduler calls simulate_tick at a fixed target rate and feeds it BCI
+frames from a bounded BCIFrameQueue, so a producer that outpaces the simulation
+cannot build an unbounded backlog. Several schedulers (one per realm) can share an
+event loop.
+
+Queue policies when a frame arrives and the queue is full:
+    drop_oldest     discard the oldest queued frame (freshest input wins)
+    drop_newest     discard the arriving frame
+    coalesce        average the arriving frame into the newest queued one
+    block           make put() wait for space (put_nowait raises asyncio.QueueFull)
+
+Timing: tick k is due at start + k / rate. Lateness of the actual start against that
+slot is the jitter; a tick that finishes after the next slot has missed its
+deadline. A scheduler that falls more than a whole period behind skips the slots it
+missed instead of bursting to catch up.
+"""
+
+import asyncio
+from collections import deque
+
+import numpy as np
+
+class BCIFrameQueue:
+    POLICIES = ("drop_oldest", "drop_newest", "coalesce", "block")
+
+    def __init__(self, maxsize=8, policy="drop_oldest"):
+        """
+        Args:
+            maxsize (int): Frames held before the overflow policy applies
+            policy (str): One of POLICIES
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown queue policy {policy!r}; expected one of {self.POLICIES}.")
+        self.maxsize = max(int(maxsize), 1)
+        self.policy = policy
+        self._frames = deque()  # [sum of frames, count] per queued entry
+        self._space = asyncio.Event()
+        self.accepted = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._frames)
+
+    def full(self):
+        return len(self._frames) >= self.maxsize
+
+    def put_nowait(self, frame):
+        """
+        Queues a frame, applying the overflow policy. Returns False if the frame
+        itself was dropped.
+        """
+        frame = np.asarray(frame, dtype=float)
+        if self.full():
+            if self.policy == "drop_newest":
+                self.dropped += 1
+                return False
+            if self.policy == "drop_oldest":
+                self._frames.popleft()
+                self.dropped += 1
+            elif self.policy == "coalesce":
+                newest = self._frames[-1]
+                newest[0] = newest[0] + frame
+                newest[1] += 1
+                self.coalesced += 1
+                return True
+            else:
+                raise asyncio.QueueFull
+        self._frames.append([frame, 1])
+        self.accepted += 1
+        return True
+
+    async def put(self, frame):
+        if self.policy == "block":
+            while self.full():
+                self._space.clear()
+                await self._space.wait()
+        return self.put_nowait(frame)
+
+    def get_nowait(self):
+        """
+        The oldest queued frame (the mean of its coalesced frames), or None.
+        """
+        if not self._frames:
+            return None
+        total, count = self._frames.popleft()
+        self._space.set()
+        return total / count if count > 1 else total
+
+    def stats(self):
+        return {"policy": self.policy, "queued": len(self._frames), "accepted": self.accepted,
+                "dropped": self.dropped, "coalesced": self.coalesced}
+
+
+class TickScheduler:
+    def __init__(self, environment, rate_hz=100.0, frames=None, max_frames_per_tick=1, sample_size=1024,
+                 on_tick=None):
+        """
+        Args:
+            environment (ConsciousnessEnvironment): Realm to drive
+            rate_hz (float): Target tick rate
+            frames (BCIFrameQueue, optional): Source of BCI frames for inject_bci_input
+            max_frames_per_tick (int): Frames injected before each tick at most
+            sample_size (int): Recent ticks kept for the jitter/duration percentiles
+            on_tick (callable, optional): on_tick(tick, context) after every tick
+        """
+        self.env = environment
+        self.period = 1.0 / rate_hz
+        self.frames = frames if frames is not None else BCIFrameQueue()
+        self.max_frames_per_tick = max_frames_per_tick
+        self.on_tick = on_tick
+        self._running = False
+        self._jitter = np.empty(sample_size)  # ring buffers (s)
+        self._durations = np.empty(sample_size)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.ticks = 0
+        self.missed = 0  # ticks that finished after the next slot
+        self.skipped = 0  # slots dropped while catching up
+        self.frames_injected = 0
+        self.elapsed = 0.0
+
+    async def run(self, ticks=None, duration=None):
+        """
+        Ticks at the target rate until stop(), `ticks` ticks or `duration` seconds.
+        """
+        loop = asyncio.get_running_loop()
+        self._running = True
+        start = loop.time()
+        slot = 0
+        done = 0
+        try:
+            while self._running and (ticks is None or done < ticks):
+                due = start + slot * self.period
+                if duration is not None and due - start >= duration:
+                    break
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    await asyncio.sleep(0)  # let producers run even when behind
+
+                started = loop.time()
+                for _ in range(self.max_frames_per_tick):
+                    frame = self.frames.get_nowait()
+                    if frame is None:
+                        break
+                    self.env.inject_bci_input(frame)
+                    self.frames_injected += 1
+                context = self.env.simulate_tick()
+                if self.on_tick is not None:
+                    self.on_tick(self.env.tick, context)
+                finished = loop.time()
+
+                self._record(started - due, finished - started)
+                if finished > due + self.period:
+                    self.missed += 1
+                done += 1
+                slot += 1
+                behind = int((finished - start) / self.period) - slot
+                if behind > 0:
+                    self.skipped += behind
+                    slot += behind
+        finally:
+            self.elapsed += loop.time() - start
+            self._running = False
+
+    def stop(self):
+        self._running = False
+
+    def _record(self, jitter, duration):
+        index = self.ticks % len(self._jitter)
+        self._jitter[index] = jitter
+        self._durations[index] = duration
+        self.ticks += 1
+
+    def stats(self):
+        kept = min(self.ticks, len(self._jitter))
+        jitter, durations = self._jitter[:kept], self._durations[:kept]
+        p50, p99 = np.percentile(jitter, [50, 99]) if kept else (0.0, 0.0)
+        return {
+            "ticks": self.ticks,
+            "target_hz": round(1.0 / self.period, 2),
+            "achieved_hz": round(self.ticks / self.elapsed, 2) if self.elapsed else 0.0,
+            "missed_deadlines": self.missed,
+            "skipped_slots": self.skipped,
+            "jitter_p50_us": round(float(p50) * 1e6, 1),
+            "jitter_p99_us": round(float(p99) * 1e6, 1),
+            "jitter_max_us": round(float(jitter.max()) * 1e6, 1) if kept else 0.0,
+            "tick_mean_us": round(float(durations.mean()) * 1e6, 1) if kept else 0.0,
+            "frames_injected": self.frames_injected,
+            "queue": self.frames.stats(),
+        }
+
+# Example use
+if __name__ == "__main__":
+    from consciousness_environment import ConsciousnessEnvironment
+    from tick_snapshots import SnapshotPolicy
+
+    async def headset(queue, rate_hz, duration, channels=8):
+        # Simulated EEG headset producing frames faster than the realms tick
+        rng = np.random.default_rng(0)
+        loop = asyncio.get_running_loop()
+        end = loop.time() + duration
+        while loop.time() < end:
+            try:
+                await asyncio.wait_for(queue.put(rng.random(channels)), end - loop.time())
+            except asyncio.TimeoutError:
+                break
+            await asyncio.sleep(1.0 / rate_hz)
+
+    async def main():
+        schedulers = []
+        for policy in ("drop_oldest", "drop_newest", "coalesce", "block"):
+            env = ConsciousnessEnvironment(f"Realtime-{policy}", snapshot_policy=SnapshotPolicy.keyframes())
+            env.imprint_memory("Awoke in real time", 0.6, 0.2)
+            schedulers.append(TickScheduler(env, rate_hz=200, frames=BCIFrameQueue(maxsize=4, policy=policy)))
+        await asyncio.gather(*(s.run(duration=2.0) for s in schedulers),
+                             *(headset(s.frames, rate_hz=500, duration=2.0) for s in schedulers))
+        for scheduler in schedulers:
+            print(scheduler.env.label, scheduler.stats())
+
+    asyncio.run(main())
@@ -11,10 +11,11 @@ import numpy as np
 from memory_threads import MemoryThread, ThreadCluster
 
 class IdentityCore:
-    def __init__(self, label="UnnamedEntity"):
+    def __init__(self, label="UnnamedEntity", memory_cluster=None):
         self.id = str(uuid.uuid4())
         self.label = label
-        self.memory_cluster = ThreadCluster()
+        # Pass a ColumnarThreadCluster for identities holding very many memories
+        self.memory_cluster = memory_cluster if memory_cluster is not None else ThreadCluster()
         self.identity_waveform = self.initialize_waveform()
         self.stability_score = 1.0  # 0.0 = fragmented, 1.0 = stable
 
@@ -27,14 +28,32 @@ class IdentityCore:
         self.update_stability()
         self.update_waveform(memory)
 
+    def bind_memories(self, memories):
+        """
+        Binds a batch of memories at once. Stability is updated a single time and the
+        waveform receives the combined influence of the batch from one draw: the sum of
+        the per-memory normals N(charge, entropy^2) is itself normal, so one 128-sample
+        draw replaces one per memory. Clipping is applied once per batch.
+        """
+        memories = list(memories)
+        if not memories:
+            return
+        for memory in memories:
+            self.memory_cluster.add_thread(memory)
+        self.update_stability()
+
+        charges = np.fromiter((m.emotional_charge for m in memories), dtype=float, count=len(memories))
+        entropies = np.fromiter((m.entropy for m in memories), dtype=float, count=len(memories))
+        delta = np.random.normal(loc=charges.sum(), scale=np.sqrt(np.square(entropies).sum()), size=self.identity_waveform.shape)
+        self.identity_waveform = np.clip(self.identity_waveform + delta * 0.01, 0, 1)
+
     def update_waveform(self, memory):
         # Influence waveform by emotional charge and entropy
         delta = np.random.normal(loc=memory.emotional_charge, scale=memory.entropy, size=self.identity_waveform.shape)
         self.identity_waveform = np.clip(self.identity_waveform + delta * 0.01, 0, 1)
 
     def update_stability(self):
-        entropies = [t.entropy for t in self.memory_cluster.threads]
-        avg_entropy = np.mean(entropies) if entropies else 0.0
+        avg_entropy = self.memory_cluster.mean_entropy()
         self.stability_score = max(0.0, 1.0 - avg_entropy)
 
     def resonate_with(self, other):
@@ -0,0 +1,165 @@
+# identity_population.py
+
+"""
+This module hosts many identity waveforms side by side as a single 2-D array, so
+resonance between whole populations of identities can be measured with matrix
+products instead of one IdentityCore.resonate_with call per pair.
+Large populations are processed in row blocks, so an N x N buffer is never needed.
+"""
+
+import numpy as np
+
+class IdentityPopulation:
+    def __init__(self, waveform_size=128, capacity=64, dtype=np.float64):
+        self.waveform_size = waveform_size
+        self.count = 0
+        self.ids = []
+        self.labels = []
+        self._rows = {}  # identity id -> row
+        self._waveforms = np.zeros((max(int(capacity), 1), waveform_size), dtype=dtype)
+        self._norms = np.zeros(len(self._waveforms), dtype=dtype)
+        self._unit = None  # cached row-normalised copy, rebuilt after changes
+
+    @classmethod
+    def from_identities(cls, identities, dtype=np.float64):
+        identities = list(identities)
+        size = len(identities[0].identity_waveform) if identities else 128
+        population = cls(waveform_size=size, capacity=len(identities), dtype=dtype)
+        for identity in identities:
+            population.add(identity)
+        return population
+
+    @property
+    def waveforms(self):
+        return self._waveforms[:self.count]
+
+    @property
+    def norms(self):
+        return self._norms[:self.count]
+
+    def __len__(self):
+        return self.count
+
+    def add(self, identity):
+        """
+        Stores a copy of the identity's waveform and returns its row.
+        """
+        if identity.id in self._rows:
+            raise ValueError(f"Identity {identity.id} is already in the population.")
+        row = self.count
+        if row == len(self._waveforms):
+            waveforms = np.zeros((row * 2, self.waveform_size), dtype=self._waveforms.dtype)
+            waveforms[:row] = self._waveforms
+            norms = np.zeros(row * 2, dtype=self._norms.dtype)
+            norms[:row] = self._norms
+            self._waveforms, self._norms = waveforms, norms
+        self.count += 1
+        self.ids.append(identity.id)
+        self.labels.append(identity.label)
+        self._rows[identity.id] = row
+        self._set_row(row, identity.identity_waveform)
+        return row
+
+    def update(self, identity):
+        """
+        Refreshes the stored waveform after the identity has evolved.
+        """
+        self._set_row(self._rows[identity.id], identity.identity_waveform)
+
+    def row_of(self, identity_id):
+        return self._rows[identity_id]
+
+    def _set_row(self, row, waveform):
+        waveform = np.asarray(waveform)
+        if waveform.shape != (self.waveform_size,):
+            raise ValueError("Waveform does not match population dimensions.")
+        self._waveforms[row] = waveform
+        self._norms[row] = np.linalg.norm(self._waveforms[row])
+        self._unit = None
+
+    def _unit_waveforms(self):
+        # Zero-norm waveforms stay zero, matching resonate_with returning 0.0 for them
+        if self._unit is None:
+            norms = self.norms
+            scale = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms != 0)
+            self._unit = self.waveforms * scale[:, None]
+        return self._unit
+
+    def resonance_with(self, waveform):
+        """
+        Cosine resonance of one waveform (or identity) against every stored identity.
+        """
+        waveform = np.asarray(getattr(waveform, "identity_waveform", waveform), dtype=self._waveforms.dtype)
+        norm = np.linalg.norm(waveform)
+        if norm == 0:
+            return np.zeros(self.count, dtype=self._waveforms.dtype)
+        return self._unit_waveforms() @ (waveform / norm)
+
+    def iter_resonance_blocks(self, block_size=4096):
+        """
+        Yields (start, block) pairs where block[i, j] is the resonance between
+        identity start + i and identity j. Peak memory is block_size x N.
+        """
+        unit = self._unit_waveforms()
+        for start in range(0, self.count, block_size):
+            yield start, unit[start:start + block_size] @ unit.T
+
+    def resonance_matrix(self, block_size=4096):
+        """
+        Full N x N resonance matrix. Only use for populations that fit in memory;
+        prefer top_k or resonant_pairs for large N.
+        """
+        matrix = np.empty((self.count, self.count), dtype=self._waveforms.dtype)
+        for start, block in self.iter_resonance_blocks(block_size):
+            matrix[start:start + len(block)] = block
+        return matrix
+
+    def top_k(self, k=5, block_size=4096, include_self=False):
+        """
+        For every identity, the k most resonant identities.
+        Returns (indices, scores), both shaped (N, k) and sorted by descending resonance.
+        """
+        available = self.count if include_self else self.count - 1
+        k = max(0, min(k, available))
+        indices = np.empty((self.count, k), dtype=np.int64)
+        scores = np.empty((self.count, k), dtype=self._waveforms.dtype)
+        if k == 0:
+            return indices, scores
+
+        for start, block in self.iter_resonance_blocks(block_size):
+            rows = np.arange(len(block))
+            if not include_self:
+                block[rows, start + rows] = -np.inf
+            candidates = np.argpartition(block, -k, axis=1)[:, -k:]
+            candidate_scores = np.take_along_axis(block, candidates, axis=1)
+            order = np.argsort(-candidate_scores, axis=1)
+            indices[start:start + len(block)] = np.take_along_axis(candidates, order, axis=1)
+            scores[start:start + len(block)] = np.take_along_axis(candidate_scores, order, axis=1)
+        return indices, scores
+
+    def resonant_pairs(self, threshold=0.95, block_size=4096):
+        """
+        Yields (i, j, resonance) for every pair i < j resonating at or above threshold.
+        """
+        for start, block in self.iter_resonance_blocks(block_size):
+            rows, cols = np.nonzero(block >= threshold)
+            rows = rows + start
+            upper = cols > rows
+            for i, j in zip(rows[upper], cols[upper]):
+                yield int(i), int(j), float(block[i - start, j])
+
+    def describe(self, row):
+        return {
+            "id": self.ids[row],
+            "label": self.labels[row],
+            "norm": round(float(self._norms[row]), 3),
+        }
+
+# Example use
+if __name__ == "__main__":
+    from identity_binding import IdentityCore
+
+    population = IdentityPopulation.from_identities(IdentityCore(f"Entity-{i}") for i in range(1000))
+    indices, scores = population.top_k(k=3, block_size=256)
+    print("Closest to Entity-0:", [population.labels[j] for j in indices[0]], scores[0].round(3))
+    print("Pairs above 0.85:", sum(1 for _ in population.resonant_pairs(threshold=0.85)))
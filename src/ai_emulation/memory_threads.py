@@ -8,29 +8,168 @@ Each thread represents a coherent cluster of experiences, emotions, and logical
 import uuid
 import time
 import hashlib
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Sequence
+
+import numpy as np
 
 class MemoryThread:
+    # Slotted to keep bulk-loaded memories small; the id and fingerprint are only
+    # computed the first time something reads them (summaries, shard dedup, ledger).
+    # _clusters lists the ThreadClusters holding the thread, so changes to entropy
+    # or charge reach their running totals, and edits to the indexed attributes
+    # (id, content/fingerprint, origin label) reach their indexes.
+    __slots__ = ("_id", "timestamp", "_content", "_entropy", "_emotional_charge", "_origin_label", "_fingerprint",
+                 "_clusters")
+
     def __init__(self, content, emotional_charge=0.0, entropy=0.0, origin_label="neutral"):
-        self.id = str(uuid.uuid4())
+        self._id = None
+        self._clusters = ()
         self.timestamp = time.time()
-        self.content = content  # A string or symbolic data structure
-        self.entropy = entropy  # Represents internal chaos or decay risk
-        self.emotional_charge = emotional_charge  # -1.0 (negative) to +1.0 (positive)
-        self.origin_label = origin_label
-        self.fingerprint = self.generate_fingerprint()
+        self._content = content  # A string or symbolic data structure
+        self._entropy = entropy  # Represents internal chaos or decay risk
+        self._emotional_charge = emotional_charge  # -1.0 (negative) to +1.0 (positive)
+        self._origin_label = origin_label
+        self._fingerprint = None
+
+    @property
+    def entropy(self):
+        return self._entropy
+
+    @entropy.setter
+    def entropy(self, value):
+        delta = value - self._entropy
+        self._entropy = value
+        if self._clusters:
+            self._notify(delta, 0.0)
+
+    @property
+    def emotional_charge(self):
+        return self._emotional_charge
+
+    @emotional_charge.setter
+    def emotional_charge(self, value):
+        delta = value - self._emotional_charge
+        self._emotional_charge = value
+        if self._clusters:
+            self._notify(0.0, delta)
+
+    def _notify(self, entropy_delta, emotion_delta, source=None):
+        for cluster in self._clusters:
+            if cluster is not source:
+                cluster._thread_changed(entropy_delta, emotion_delta)
+
+    def _reindex(self, column):
+        for cluster in self._clusters:
+            cluster.index.invalidate(column)
+
+    @property
+    def origin_label(self):
+        return self._origin_label
+
+    @origin_label.setter
+    def origin_label(self, value):
+        self._origin_label = value
+        if self._clusters:
+            self._reindex("origin_label")
+
+    @property
+    def id(self):
+        if self._id is None:
+            self._id = str(uuid.uuid4())
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        self._id = value
+        if self._clusters:
+            self._reindex("id")
+
+    @property
+    def content(self):
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        # The fingerprint follows the content, as if it had not been read yet
+        self._content = value
+        self._fingerprint = None
+        if self._clusters:
+            self._reindex("fingerprint")
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = self.generate_fingerprint()
+        return self._fingerprint
+
+    @fingerprint.setter
+    def fingerprint(self, value):
+        self._fingerprint = value
+        if self._clusters:
+            self._reindex("fingerprint")
+
+    @classmethod
+    def from_arrays(cls, contents, emotional_charges=0.0, entropies=0.0, origin_labels="neutral"):
+        """
+        Builds one thread per entry of `contents` in a single call. Charges, entropies
+        and origin labels may be scalars or sequences/arrays matching `contents`.
+        All threads share one creation timestamp.
+        """
+        contents = list(contents)
+        n = len(contents)
+        charges = np.broadcast_to(np.asarray(emotional_charges, dtype=float), (n,)).tolist()
+        entropies = np.broadcast_to(np.asarray(entropies, dtype=float), (n,)).tolist()
+        labels = [origin_labels] * n if isinstance(origin_labels, str) else list(origin_labels)
+        if len(labels) != n:
+            raise ValueError("origin_labels does not match the number of contents.")
+
+        now = time.time()
+        new = cls.__new__
+        threads = []
+        for content, charge, entropy, label in zip(contents, charges, entropies, labels):
+            t = new(cls)
+            t._id = None
+            t._clusters = ()
+            t.timestamp = now
+            t._content = content
+            t._entropy = entropy
+            t._emotional_charge = charge
+            t._origin_label = label
+            t._fingerprint = None
+            threads.append(t)
+        return threads
+
+    @classmethod
+    def copy_of(cls, thread):
+        """
+        New MemoryThread holding the same id, content, fingerprint and state as
+        `thread`, e.g. to detach a ThreadView from its columnar cluster.
+        """
+        copy = cls(thread.content, thread.emotional_charge, thread.entropy, thread.origin_label)
+        copy.timestamp = thread.timestamp
+        copy._id = thread.id
+        copy._fingerprint = thread.fingerprint
+        return copy
 
     def generate_fingerprint(self):
         return hashlib.sha256(self.content.encode('utf-8')).hexdigest()
 
-    def decay(self, rate=0.001):
-        self.entropy += rate
-        self.emotional_charge *= (1 - rate)
+    def decay(self, rate=0.001, source=None):
+        # `source` is a cluster that accounts for the change itself (cluster-wide ops)
+        charge = self._emotional_charge
+        self._entropy += rate
+        self._emotional_charge = charge * (1 - rate)
+        if self._clusters:
+            self._notify(rate, self._emotional_charge - charge, source)
 
-    def reinforce(self, emotion_boost=0.01):
-        self.entropy *= 0.95
-        self.emotional_charge += emotion_boost
-        if self.emotional_charge > 1.0:
-            self.emotional_charge = 1.0
+    def reinforce(self, emotion_boost=0.01, source=None):
+        entropy, charge = self._entropy, self._emotional_charge
+        self._entropy = entropy * 0.95
+        boosted = charge + emotion_boost
+        self._emotional_charge = 1.0 if boosted > 1.0 else boosted
+        if self._clusters:
+            self._notify(self._entropy - entropy, self._emotional_charge - charge, source)
 
     def summarize(self):
         return {
@@ -41,21 +180,498 @@ class MemoryThread:
             "hash": self.fingerprint[:10],
         }
 
+class ThreadIndex:
+    """
+    Lookup structures over a cluster's rows (positions in cluster.threads): hash maps
+    by id, fingerprint and origin label, and rows sorted by entropy and by emotional
+    charge for range queries. Each structure is built on first use and then kept up
+    to date as threads are added, so lookups cost O(result) rather than O(cluster).
+    Cluster-wide decay and reinforcement are monotone and never reorder the sorted
+    rows; edits to individual threads invalidate the affected map or sorted column.
+    """
+
+    # Batches larger than this drop a sorted column instead of inserting row by row
+    REBUILD_THRESHOLD = 64
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+        self.invalidate()
+
+    def invalidate(self, column=None):
+        if column is None:
+            self._by_id = None
+            self._by_fingerprint = None
+            self._by_origin = None
+            self._sorted = {}  # column name -> rows ordered by that column
+        elif column == "id":
+            self._by_id = None
+        elif column == "fingerprint":
+            self._by_fingerprint = None
+        elif column == "origin_label":
+            self._by_origin = None
+        else:
+            self._sorted.pop(column, None)
+
+    def added(self, start, end):
+        threads = self.cluster.threads
+        for row in range(start, end):
+            if self._by_id is not None:
+                self._by_id[threads[row].id] = row
+            if self._by_fingerprint is not None:
+                self._by_fingerprint.setdefault(threads[row].fingerprint, []).append(row)
+            if self._by_origin is not None:
+                self._by_origin.setdefault(threads[row].origin_label, []).append(row)
+        for column in list(self._sorted):
+            if end - start > self.REBUILD_THRESHOLD:
+                del self._sorted[column]
+                continue
+            rows, key = self._sorted[column], self.cluster._column_key(column)
+            for row in range(start, end):
+                insort(rows, row, key=key)
+
+    def _group(self, attribute):
+        groups = {}
+        for row, thread in enumerate(self.cluster.threads):
+            groups.setdefault(getattr(thread, attribute), []).append(row)
+        return groups
+
+    def row_of_id(self, thread_id):
+        if self._by_id is None:
+            self._by_id = {t.id: row for row, t in enumerate(self.cluster.threads)}
+        return self._by_id.get(thread_id)
+
+    def rows_by_fingerprint(self, fingerprint):
+        if self._by_fingerprint is None:
+            self._by_fingerprint = self._group("fingerprint")
+        return self._by_fingerprint.get(fingerprint, [])
+
+    def rows_by_origin(self, label):
+        if self._by_origin is None:
+            self._by_origin = self._group("origin_label")
+        return self._by_origin.get(label, [])
+
+    def _sorted_rows(self, column):
+        rows = self._sorted.get(column)
+        if rows is None:
+            rows = self._sorted[column] = self.cluster._sorted_rows(column)
+        return rows
+
+    def _range_bounds(self, column, low, high):
+        rows, key = self._sorted_rows(column), self.cluster._column_key(column)
+        return rows, bisect_left(rows, low, key=key), bisect_right(rows, high, key=key)
+
+    def rows_in_range(self, column, low, high):
+        rows, start, end = self._range_bounds(column, low, high)
+        return rows[start:end]
+
+    def count_in_range(self, column, low, high):
+        _, start, end = self._range_bounds(column, low, high)
+        return end - start
+
+
 # Thread cluster example for multi-thread simulation
 class ThreadCluster:
     def __init__(self):
         self.threads = []
+        # Running entropy/emotion totals so means are O(1). Threads report their own
+        # changes (MemoryThread setters, decay, reinforce); the cluster-wide
+        # operations below update the totals in bulk.
+        self.entropy_total = 0.0
+        self.emotion_total = 0.0
+        self.index = ThreadIndex(self)
 
     def add_thread(self, thread):
+        """
+        Adds a MemoryThread, which then reports its changes to this cluster. Other
+        thread-like objects (ThreadView) only report to their own cluster, so they
+        are stored as a MemoryThread copy. Returns the stored thread.
+        """
+        if not isinstance(thread, MemoryThread):
+            thread = MemoryThread.copy_of(thread)
         self.threads.append(thread)
+        self.entropy_total += thread.entropy
+        self.emotion_total += thread.emotional_charge
+        thread._clusters += (self,)
+        self.index.added(len(self.threads) - 1, len(self.threads))
+        return thread
 
-    def decay_all(self):
+    def _thread_changed(self, entropy_delta, emotion_delta):
+        self.entropy_total += entropy_delta
+        self.emotion_total += emotion_delta
+        if entropy_delta:
+            self.index.invalidate("entropy")
+        if emotion_delta:
+            self.index.invalidate("emotional_charge")
+
+    def decay_all(self, rate=0.001):
         for t in self.threads:
-            t.decay()
+            t.decay(rate, self)
+        self.entropy_total += rate * len(self.threads)
+        self.emotion_total *= (1 - rate)
+        if rate > 1:
+            self.index.invalidate("emotional_charge")  # charge flips sign, order reverses
 
     def reinforce_all(self, positive=True):
+        # The +1.0 cap on emotional charge is not linear, so the emotion total is
+        # re-accumulated during the pass that already touches every thread
+        emotion_total = 0.0
         for t in self.threads:
-            t.reinforce(0.01 if positive else -0.01)
+            t.reinforce(0.01 if positive else -0.01, self)
+            emotion_total += t.emotional_charge
+        self.entropy_total *= 0.95
+        self.emotion_total = emotion_total
+
+    def mean_entropy(self):
+        count = len(self.threads)
+        return self.entropy_total / count if count else 0.0
+
+    def mean_emotion(self):
+        count = len(self.threads)
+        return self.emotion_total / count if count else 0.0
+
+    def recompute_totals(self):
+        self.entropy_total = float(np.sum(self.entropy_values()))
+        self.emotion_total = float(np.sum(self.emotion_values()))
+        self.index.invalidate()
+
+    def entropy_values(self):
+        return np.array([t.entropy for t in self.threads], dtype=float)
+
+    def emotion_values(self):
+        return np.array([t.emotional_charge for t in self.threads], dtype=float)
+
+    def _column_key(self, column):
+        threads = self.threads
+        return lambda row: getattr(threads[row], column)
+
+    def _sorted_rows(self, column):
+        return sorted(range(len(self.threads)), key=self._column_key(column))
+
+    def find(self, thread_id):
+        row = self.index.row_of_id(thread_id)
+        return None if row is None else self.threads[row]
+
+    def find_by_fingerprint(self, fingerprint):
+        return [self.threads[row] for row in self.index.rows_by_fingerprint(fingerprint)]
+
+    def contains_fingerprint(self, fingerprint):
+        return bool(self.index.rows_by_fingerprint(fingerprint))
+
+    def threads_by_origin(self, label):
+        return [self.threads[row] for row in self.index.rows_by_origin(label)]
+
+    def select(self, origin_label=None, entropy_range=None, emotion_range=None):
+        """
+        Threads matching every given criterion (ranges are inclusive (low, high) pairs).
+        Candidates come from whichever index yields the fewest rows; the remaining
+        criteria are checked on those rows only.
+        """
+        criteria = []
+        if origin_label is not None:
+            rows = self.index.rows_by_origin(origin_label)
+            criteria.append((len(rows), lambda: rows, lambda t: t.origin_label == origin_label))
+        for column, bounds in (("entropy", entropy_range), ("emotional_charge", emotion_range)):
+            if bounds is not None:
+                low, high = bounds
+                criteria.append((
+                    self.index.count_in_range(column, low, high),
+                    lambda column=column, low=low, high=high: self.index.rows_in_range(column, low, high),
+                    lambda t, column=column, low=low, high=high: low <= getattr(t, column) <= high,
+                ))
+        if not criteria:
+            return list(self.threads)
+
+        criteria.sort(key=lambda c: c[0])
+        checks = [check for _, _, check in criteria[1:]]
+        selected = []
+        for row in criteria[0][1]():
+            thread = self.threads[row]
+            if all(check(thread) for check in checks):
+                selected.append(thread)
+        return selected
 
     def get_summary(self):
         return [t.summarize() for t in self.threads]
+
+
+class ThreadView:
+    """
+    MemoryThread-compatible handle onto a single row of a ColumnarThreadCluster.
+    Holds no data of its own: every attribute read or write goes through to the
+    cluster's column arrays, so views stay valid as the cluster grows.
+    """
+    __slots__ = ("cluster", "row")
+
+    def __init__(self, cluster, row):
+        self.cluster = cluster
+        self.row = row
+
+    @property
+    def id(self):
+        ids = self.cluster._ids
+        if ids[self.row] is None:
+            ids[self.row] = str(uuid.uuid4())
+        return ids[self.row]
+
+    @id.setter
+    def id(self, value):
+        self.cluster._ids[self.row] = value
+        self.cluster.index.invalidate("id")
+
+    @property
+    def content(self):
+        return self.cluster._contents[self.row]
+
+    @content.setter
+    def content(self, value):
+        # The fingerprint follows the content, as for MemoryThread
+        self.cluster._contents[self.row] = value
+        self.cluster._fingerprints[self.row] = None
+        self.cluster.index.invalidate("fingerprint")
+
+    @property
+    def fingerprint(self):
+        fingerprints = self.cluster._fingerprints
+        if fingerprints[self.row] is None:
+            fingerprints[self.row] = self.generate_fingerprint()
+        return fingerprints[self.row]
+
+    @fingerprint.setter
+    def fingerprint(self, value):
+        self.cluster._fingerprints[self.row] = value
+        self.cluster.index.invalidate("fingerprint")
+
+    @property
+    def timestamp(self):
+        return float(self.cluster._timestamp[self.row])
+
+    @property
+    def entropy(self):
+        return float(self.cluster._entropy[self.row])
+
+    @entropy.setter
+    def entropy(self, value):
+        cluster = self.cluster
+        cluster.entropy_total += value - float(cluster._entropy[self.row])
+        cluster._entropy[self.row] = value
+        cluster.index.invalidate("entropy")
+
+    @property
+    def emotional_charge(self):
+        return float(self.cluster._emotion[self.row])
+
+    @emotional_charge.setter
+    def emotional_charge(self, value):
+        cluster = self.cluster
+        cluster.emotion_total += value - float(cluster._emotion[self.row])
+        cluster._emotion[self.row] = value
+        cluster.index.invalidate("emotional_charge")
+
+    @property
+    def origin_label(self):
+        return self.cluster.labels[self.cluster._origin[self.row]]
+
+    @origin_label.setter
+    def origin_label(self, value):
+        self.cluster._origin[self.row] = self.cluster.label_code(value)
+        self.cluster.index.invalidate("origin_label")
+
+    def decay(self, rate=0.001, source=None):
+        # Goes through the setters, which keep the owning cluster's totals current
+        self.entropy += rate
+        self.emotional_charge *= (1 - rate)
+
+    def reinforce(self, emotion_boost=0.01, source=None):
+        self.entropy *= 0.95
+        self.emotional_charge = min(self.emotional_charge + emotion_boost, 1.0)
+
+    generate_fingerprint = MemoryThread.generate_fingerprint
+    summarize = MemoryThread.summarize
+
+    def __repr__(self):
+        return f"ThreadView(row={self.row}, origin={self.origin_label!r})"
+
+
+def _assigned(thread, attribute):
+    # A thread's id or fingerprint without generating it; None if not assigned yet
+    if isinstance(thread, MemoryThread):
+        return getattr(thread, "_" + attribute)
+    if isinstance(thread, ThreadView):
+        return getattr(thread.cluster, f"_{attribute}s")[thread.row]
+    return getattr(thread, attribute)
+
+
+class ThreadViews(Sequence):
+    """
+    Read-only sequence of ThreadView objects standing in for ThreadCluster.threads.
+    Views are created on access, so holding this object costs nothing per thread.
+    """
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+
+    def __len__(self):
+        return self.cluster.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ThreadView(self.cluster, row) for row in range(*index.indices(self.cluster.count))]
+        if index < 0:
+            index += self.cluster.count
+        if not 0 <= index < self.cluster.count:
+            raise IndexError("thread index out of range")
+        return ThreadView(self.cluster, index)
+
+    def __iter__(self):
+        for row in range(self.cluster.count):
+            yield ThreadView(self.cluster, row)
+
+
+class ColumnarThreadCluster(ThreadCluster):
+    """
+    ThreadCluster that stores entropy, emotional charge, timestamp and origin label
+    as contiguous NumPy columns. Cluster-wide decay and reinforcement run as single
+    vector operations; `threads` exposes ThreadView objects for code that expects
+    individual MemoryThread instances (shards, dreams, cortex memory).
+    """
+
+    _COLUMNS = {"entropy": "_entropy", "emotional_charge": "_emotion"}
+
+    def __init__(self, capacity=1024):
+        capacity = max(int(capacity), 1)
+        self.count = 0
+        self._entropy = np.zeros(capacity)
+        self._emotion = np.zeros(capacity)
+        self._timestamp = np.zeros(capacity)
+        self._origin = np.zeros(capacity, dtype=np.int32)
+        self._contents = []
+        self._ids = []
+        self._fingerprints = []
+        self.labels = []  # origin label table, indexed by the codes in _origin
+        self._label_codes = {}
+        self.threads = ThreadViews(self)
+        self.entropy_total = 0.0
+        self.emotion_total = 0.0
+        self.index = ThreadIndex(self)
+
+    @property
+    def capacity(self):
+        return len(self._entropy)
+
+    @property
+    def entropy(self):
+        return self._entropy[:self.count]
+
+    @property
+    def emotional_charge(self):
+        return self._emotion[:self.count]
+
+    @property
+    def timestamp(self):
+        return self._timestamp[:self.count]
+
+    @property
+    def origin_codes(self):
+        return self._origin[:self.count]
+
+    def label_code(self, label):
+        code = self._label_codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self.labels.append(label)
+            self._label_codes[label] = code
+        return code
+
+    def _grow(self, capacity):
+        for name in ("_entropy", "_emotion", "_timestamp", "_origin"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add_thread(self, thread):
+        """
+        Copies a thread into the columns. An id or fingerprint the thread has not
+        generated yet stays unassigned, and is generated lazily by the view.
+        """
+        row = self.count
+        if row == self.capacity:
+            self._grow(self.capacity * 2)
+        # The id goes first: a store that rejects it must not be left with the content
+        self._ids.append(_assigned(thread, "id"))
+        self._contents.append(thread.content)
+        self._fingerprints.append(_assigned(thread, "fingerprint"))
+        self._entropy[row] = thread.entropy
+        self._emotion[row] = thread.emotional_charge
+        self._timestamp[row] = thread.timestamp
+        self._origin[row] = self.label_code(thread.origin_label)
+        self.count += 1
+        self.entropy_total += float(self._entropy[row])
+        self.emotion_total += float(self._emotion[row])
+        self.index.added(row, row + 1)
+        return ThreadView(self, row)
+
+    def add_arrays(self, contents, emotional_charges=0.0, entropies=0.0, origin_labels="neutral", timestamps=None):
+        """
+        Appends many threads straight into the columns without creating MemoryThread
+        objects. Ids and fingerprints are generated lazily when a view first reads them.
+        """
+        contents = list(contents)
+        n = len(contents)
+        start, end = self.count, self.count + n
+        if end > self.capacity:
+            self._grow(max(end, self.capacity * 2))
+
+        self._emotion[start:end] = emotional_charges
+        self._entropy[start:end] = entropies
+        self._timestamp[start:end] = time.time() if timestamps is None else timestamps
+        if isinstance(origin_labels, str):
+            self._origin[start:end] = self.label_code(origin_labels)
+        else:
+            codes = [self.label_code(label) for label in origin_labels]
+            if len(codes) != n:
+                raise ValueError("origin_labels does not match the number of contents.")
+            self._origin[start:end] = codes
+        self._contents.extend(contents)
+        self._ids.extend([None] * n)
+        self._fingerprints.extend([None] * n)
+        self.count = end
+        self.entropy_total += float(self._entropy[start:end].sum())
+        self.emotion_total += float(self._emotion[start:end].sum())
+        self.index.added(start, end)
+
+    @classmethod
+    def from_arrays(cls, contents, emotional_charges=0.0, entropies=0.0, origin_labels="neutral", timestamps=None):
+        contents = list(contents)
+        cluster = cls(capacity=len(contents))
+        cluster.add_arrays(contents, emotional_charges, entropies, origin_labels, timestamps)
+        return cluster
+
+    def decay_all(self, rate=0.001):
+        self.entropy[:] += rate
+        self.emotional_charge[:] *= (1 - rate)
+        self.entropy_total += rate * self.count
+        self.emotion_total *= (1 - rate)
+        if rate > 1:
+            self.index.invalidate("emotional_charge")
+
+    def reinforce_all(self, positive=True):
+        emotion = self.emotional_charge
+        self.entropy[:] *= 0.95
+        emotion += 0.01 if positive else -0.01
+        np.minimum(emotion, 1.0, out=emotion)
+        self.entropy_total *= 0.95
+        self.emotion_total = float(emotion.sum())
+
+    def entropy_values(self):
+        return self.entropy
+
+    def emotion_values(self):
+        return self.emotional_charge
+
+    def _column_key(self, column):
+        name = self._COLUMNS[column]
+        return lambda row: getattr(self, name)[row]
+
+    def _sorted_rows(self, column):
+        return np.argsort(getattr(self, self._COLUMNS[column])[:self.count], kind="stable").tolist()
@@ -0,0 +1,257 @@
+# thread_store.py
+
+"""
+This module provides a disk-backed ThreadCluster for identities whose memories no
+longer fit comfortably in RAM. Numeric columns live in memory-mapped files, thread
+contents live in an append-only blob file, and reopening a store only maps the
+files: nothing is parsed or loaded per thread until it is read.
+
+Store layout (one directory per cluster):
+    meta.json       count, label table and running totals, rewritten on flush
+    *.col           one raw memory-mapped file per column
+    content.blob    UTF-8 thread contents, append-only
+"""
+
+import os
+import json
+import uuid
+
+import numpy as np
+from memory_threads import ColumnarThreadCluster, ThreadIndex, ThreadViews
+
+FORMAT_VERSION = 1
+
+# column attribute -> (file name, dtype, per-row shape)
+COLUMNS = {
+    "_entropy": ("entropy.col", np.float64, ()),
+    "_emotion": ("emotion.col", np.float64, ()),
+    "_timestamp": ("timestamp.col", np.float64, ()),
+    "_origin": ("origin.col", np.int32, ()),
+    "_content_offset": ("content_offset.col", np.uint64, ()),
+    "_content_length": ("content_length.col", np.uint32, ()),
+    "_id_words": ("id.col", np.uint64, (2,)),  # uuid as two 64-bit words, zeros = not yet assigned
+}
+
+
+class _BlobColumn:
+    """
+    List-like access to thread contents stored in the append-only blob file.
+    """
+
+    def __init__(self, cluster, path):
+        self.cluster = cluster
+        self.path = path
+        self._file = open(path, "ab")
+        self._fd = os.open(path, os.O_RDONLY)
+        self._size = self._file.tell()
+        self._flushed = self._size
+
+    def __getitem__(self, row):
+        offset = int(self.cluster._content_offset[row])
+        length = int(self.cluster._content_length[row])
+        if offset + length > self._flushed:
+            self.flush()
+        return os.pread(self._fd, length, offset).decode("utf-8")
+
+    def __setitem__(self, row, content):
+        # Replaced content is appended too; the old bytes stay in the blob unreferenced
+        if not isinstance(content, str):
+            raise TypeError("MappedThreadCluster only stores string content.")
+        data = content.encode("utf-8")
+        self.cluster._content_offset[row] = self._size
+        self.cluster._content_length[row] = len(data)
+        self._file.write(data)
+        self._size += len(data)
+
+    def append(self, content):
+        self[self.cluster.count] = content
+
+    def extend(self, contents):
+        # Rows for the batch have already been reserved by add_arrays
+        row = self.cluster.count
+        encoded = [c.encode("utf-8") if isinstance(c, str) else None for c in contents]
+        if any(data is None for data in encoded):
+            raise TypeError("MappedThreadCluster only stores string content.")
+        lengths = np.fromiter((len(data) for data in encoded), dtype=np.uint64, count=len(encoded))
+        offsets = self._size + np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.uint64)
+        self.cluster._content_offset[row:row + len(encoded)] = offsets
+        self.cluster._content_length[row:row + len(encoded)] = lengths
+        self._file.write(b"".join(encoded))
+        self._size += int(lengths.sum())
+
+    def flush(self):
+        self._file.flush()
+        self._flushed = self._size
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        os.close(self._fd)
+
+
+class _IdColumn:
+    """
+    List-like access to thread ids stored as uuid words in a mapped column.
+    """
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+
+    def __getitem__(self, row):
+        high, low = self.cluster._id_words[row].tolist()
+        if high == 0 and low == 0:
+            return None
+        return str(uuid.UUID(int=(high << 64) | low))
+
+    def __setitem__(self, row, value):
+        if value is None:  # back to a lazily assigned id
+            self.cluster._id_words[row] = (0, 0)
+            return
+        try:
+            number = uuid.UUID(value).int
+        except (TypeError, ValueError):
+            raise ValueError(f"MappedThreadCluster requires UUID thread ids, got {value!r}.")
+        self.cluster._id_words[row] = (number >> 64, number & 0xFFFFFFFFFFFFFFFF)
+
+    def append(self, value):
+        self[self.cluster.count] = value
+
+    def extend(self, values):
+        start = self.cluster.count
+        self.cluster._id_words[start:start + len(values)] = 0
+        for offset, value in enumerate(values):
+            if value is not None:
+                self[start + offset] = value
+
+
+class _DerivedColumn:
+    """
+    Sparse in-memory cache for values derived from other columns (fingerprints):
+    those given with an added thread or computed on first read.
+    """
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+        self._values = {}
+
+    def __getitem__(self, row):
+        return self._values.get(row)
+
+    def __setitem__(self, row, value):
+        if value is None:
+            self._values.pop(row, None)
+        else:
+            self._values[row] = value
+
+    def append(self, value):
+        self[self.cluster.count] = value
+
+    def extend(self, values):
+        for offset, value in enumerate(values):
+            if value is not None:
+                self._values[self.cluster.count + offset] = value
+
+
+class MappedThreadCluster(ColumnarThreadCluster):
+    """
+    ColumnarThreadCluster whose columns are memory-mapped files in `path`.
+    Opens an existing store or creates a new one. Changes reach disk on flush()
+    or close(); rows appended after the last flush are not visible on reopen.
+    """
+
+    def __init__(self, path, capacity=1024):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta = self._read_meta()
+
+        self.count = meta["count"]
+        self.labels = meta["labels"]
+        self._label_codes = {label: code for code, label in enumerate(self.labels)}
+        self._map_columns(max(int(capacity), self.count, 1))
+        self.entropy_total = meta["entropy_total"]
+        self.emotion_total = meta["emotion_total"]
+
+        self._contents = _BlobColumn(self, os.path.join(path, "content.blob"))
+        self._ids = _IdColumn(self)
+        self._fingerprints = _DerivedColumn(self)
+        self.threads = ThreadViews(self)
+        self.index = ThreadIndex(self)
+
+    @classmethod
+    def open(cls, path):
+        return cls(path, capacity=1)
+
+    def _read_meta(self):
+        meta_path = os.path.join(self.path, "meta.json")
+        if not os.path.exists(meta_path):
+            return {"version": FORMAT_VERSION, "count": 0, "labels": [], "entropy_total": 0.0, "emotion_total": 0.0}
+        with open(meta_path, "r") as file:
+            meta = json.load(file)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported thread store version: {meta.get('version')}")
+        return meta
+
+    def _map_columns(self, capacity):
+        for name, (filename, dtype, shape) in COLUMNS.items():
+            file_path = os.path.join(self.path, filename)
+            row_bytes = np.dtype(dtype).itemsize * int(np.prod(shape, dtype=np.int64))
+            existing = os.path.getsize(file_path) // row_bytes if os.path.exists(file_path) else 0
+            rows = max(capacity, existing)
+            if existing < rows:
+                with open(file_path, "ab") as file:
+                    file.truncate(rows * row_bytes)
+            setattr(self, name, np.memmap(file_path, dtype=dtype, mode="r+", shape=(rows,) + shape))
+
+    def _grow(self, capacity):
+        for name in COLUMNS:
+            getattr(self, name).flush()
+            setattr(self, name, None)
+        self._map_columns(capacity)
+
+    def flush(self):
+        """
+        Syncs mapped columns and the content blob, then atomically rewrites meta.json.
+        """
+        for name in COLUMNS:
+            getattr(self, name).flush()
+        self._contents.flush()
+        meta = {
+            "version": FORMAT_VERSION,
+            "count": self.count,
+            "labels": self.labels,
+            "entropy_total": float(self.entropy_total),
+            "emotion_total": float(self.emotion_total),
+        }
+        tmp_path = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp_path, "w") as file:
+            json.dump(meta, file)
+        os.replace(tmp_path, os.path.join(self.path, "meta.json"))
+
+    def close(self):
+        self.flush()
+        self._contents.close()
+        for name in COLUMNS:
+            setattr(self, name, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Example use
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    store_path = os.path.join(tempfile.mkdtemp(), "identity-threads")
+    n = 1_000_000
+    with MappedThreadCluster(store_path) as cluster:
+        cluster.add_arrays([f"Experience {i}" for i in range(n)], np.random.uniform(-1, 1, n), np.random.rand(n), "archive")
+        cluster.decay_all()
+        print("Stored threads:", len(cluster.threads), "| mean entropy:", round(cluster.mean_entropy(), 4))
+
+    started = time.perf_counter()
+    reopened = MappedThreadCluster.open(store_path)
+    print(f"Reopened in {(time.perf_counter() - started) * 1000:.2f} ms:", reopened.threads[n - 1].summarize())
+    reopened.close()
@@ -0,0 +1,15 @@
+# conftest.py
+
+"""
+Modules import each other by bare name (see the PYTHONPATH used to run the demos),
+so every module directory is put on sys.path for the tests.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("src/ai_emulation", "logic_engine", "neural_architectures", "advanced_modules", "simulation"):
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,203 @@
+import os
+import time
+
+import pytest
+
+from consciousness_blockchain import ConsciousnessLedger, merkle_root
+from ledger_store import PersistedLedgerIndex, PersistentLedger
+
+
+def filled(ledger, blocks):
+    for tick in range(blocks):
+        ledger.add_event("tick", {"tick": tick, "context_snapshot": {"entropy": tick / 100}})
+    return ledger
+
+
+def test_untouched_chain_verifies():
+    ledger = filled(ConsciousnessLedger(checkpoint_interval=8), 30)
+    assert len(ledger.checkpoints) == 3
+    assert ledger.verify_chain() and ledger.verify_incremental()
+    assert ledger.find_corruption() is None
+
+
+def test_edited_payload_is_found():
+    ledger = filled(ConsciousnessLedger(checkpoint_interval=8), 30)
+    ledger.chain[13].payload["tick"] = -1
+    assert ledger.find_corruption() == 13
+    assert ledger.find_corruption(start=14) is None
+    assert not ledger.verify_chain()
+
+
+def test_rehashed_block_breaks_the_next_link():
+    ledger = filled(ConsciousnessLedger(checkpoint_interval=8), 30)
+    block = ledger.chain[20]
+    block.payload["tick"] = -1
+    block.hash = block.compute_hash()
+    assert ledger.find_corruption() == 21
+
+
+def test_forged_checkpoint_root_is_found():
+    ledger = filled(ConsciousnessLedger(checkpoint_interval=8), 30)
+    ledger.checkpoints[1] = merkle_root(["0" * 64])
+    assert ledger.find_corruption() == 8
+    assert ledger.find_corruption(start=9) is None  # checkpoint 1 is not fully inside
+
+
+def test_verify_incremental_skips_verified_checkpoints():
+    ledger = filled(ConsciousnessLedger(checkpoint_interval=8), 20)
+    assert ledger.verify_chain()
+    ledger.chain[3].payload["tick"] = -1  # inside an already verified checkpoint
+    filled(ledger, 10)
+    assert ledger.verify_incremental()
+    assert not ledger.verify_chain()
+
+
+def test_inclusion_proofs():
+    ledger = filled(ConsciousnessLedger(checkpoint_interval=8), 30)
+    for index in (0, 7, 12, 29):
+        assert ConsciousnessLedger.verify_inclusion(ledger.inclusion_proof(index))
+    proof = ledger.inclusion_proof(12)
+    proof["hash"] = ledger.chain[13].hash
+    assert not ConsciousnessLedger.verify_inclusion(proof)
+
+
+def test_persistent_ledger_verifies_from_disk(tmp_path):
+    with filled(PersistentLedger(str(tmp_path), checkpoint_interval=8, fsync=False), 40):
+        pass
+    reopened = PersistentLedger(str(tmp_path), fsync=False)
+    try:
+        assert reopened.verify_chain()
+        assert reopened.find_corruption(start=17) is None
+    finally:
+        reopened.close()
+
+
+def test_reopen_rebuilds_checkpoint_roots_lost_with_the_tail(tmp_path):
+    with filled(PersistentLedger(str(tmp_path), checkpoint_interval=8, fsync=False), 40) as ledger:
+        expected = list(ledger.checkpoints)
+    checkpoint_log = os.path.join(str(tmp_path), "checkpoints.log")
+    with open(checkpoint_log) as file:
+        roots = file.readlines()
+    with open(checkpoint_log, "w") as file:
+        file.writelines(roots[:2])  # the last roots never reached the disk
+
+    reopened = PersistentLedger(str(tmp_path), fsync=False)
+    try:
+        assert reopened.checkpoints == expected
+        filled(reopened, 10)
+        assert len(reopened.checkpoints) == 6
+        assert reopened.verify_chain()
+    finally:
+        reopened.close()
+    with open(checkpoint_log) as file:
+        assert len(file.readlines()) == 6
+
+
+def test_persistent_seals_and_tail_proofs_do_not_read_blocks_back(tmp_path):
+    with filled(PersistentLedger(str(tmp_path), checkpoint_interval=8, fsync=False), 44):
+        pass
+    reopened = PersistentLedger(str(tmp_path), fsync=False)
+    try:
+        hashes = [block.hash for block in reopened.store.iter_range(0, len(reopened.chain))]
+
+        def no_reads(start, stop):
+            raise AssertionError("blocks read back from disk")
+
+        reopened.store.iter_range = no_reads
+        filled(reopened, 20)
+        hashes += [reopened.chain[i].hash for i in range(45, 65)]
+        assert reopened.checkpoints == [merkle_root(hashes[i:i + 8]) for i in range(0, 64, 8)]
+        assert ConsciousnessLedger.verify_inclusion(reopened.inclusion_proof(64))
+        del reopened.store.iter_range
+        assert ConsciousnessLedger.verify_inclusion(reopened.inclusion_proof(12))
+        assert reopened.verify_chain()
+    finally:
+        reopened.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Block timestamps come from time.time(); hand out 100.0, 101.0, ... instead
+    now = [99.0]
+
+    def fake_time():
+        now[0] += 1.0
+        return now[0]
+
+    monkeypatch.setattr(time, "time", fake_time)
+    return now
+
+
+def mixed(ledger):
+    # Blocks 1..12 at timestamps 101..112: "fork" every third block, "tick" otherwise
+    for i in range(1, 13):
+        ledger.add_event("fork" if i % 3 == 0 else "tick", {"i": i})
+    return ledger
+
+
+@pytest.mark.parametrize("bounds, expected", [
+    ({}, [3, 6, 9, 12]),
+    ({"since": 105.0}, [6, 9, 12]),
+    ({"until": 106.0}, [3, 6]),
+    ({"since": 104.5, "until": 109.0}, [6, 9]),
+    ({"start": 4}, [6, 9, 12]),
+    ({"stop": 9}, [3, 6]),
+    ({"start": 6, "stop": 12, "since": 107.0}, [9]),
+    ({"since": 200.0}, []),
+])
+def test_event_queries_respect_bounds(clock, bounds, expected):
+    ledger = mixed(ConsciousnessLedger())
+    assert [block.index for block in ledger.events("fork", **bounds)] == expected
+    assert ledger.count_events("fork", **bounds) == len(expected)
+    everything = [block.index for block in ledger.events(**bounds)]
+    assert ledger.count_events(**bounds) == len(everything)
+    assert set(expected) <= set(everything)
+
+
+def test_event_types_and_unknown_types(clock):
+    ledger = mixed(ConsciousnessLedger())
+    assert ledger.event_types() == {"genesis": 1, "tick": 8, "fork": 4}
+    assert list(ledger.events("missing")) == [] and ledger.count_events("missing") == 0
+    assert [block.index for block in ledger.events(since=110.0)] == [10, 11, 12]
+
+
+def test_backwards_clock_step_is_filtered_exactly(clock):
+    ledger = ConsciousnessLedger()
+    ledger.add_event("tick", {})  # 101
+    clock[0] = 90.0
+    ledger.add_event("tick", {})  # 91: bisects as 101, re-checked on read
+    ledger.add_event("tick", {})  # 92
+    assert [block.index for block in ledger.events("tick", since=95.0)] == [1]
+    assert ledger.count_events("tick", since=95.0) == 3  # the documented overcount
+
+
+def test_persisted_index_answers_queries_after_reopen(clock, tmp_path):
+    with mixed(PersistentLedger(str(tmp_path), fsync=False)) as ledger:
+        ledger.commit()
+        expected = [block.index for block in ledger.events("fork", since=104.0, stop=12)]
+    reopened = PersistentLedger(str(tmp_path), fsync=False)
+    try:
+        assert [block.index for block in reopened.events("fork", since=104.0, stop=12)] == expected == [6, 9]
+        assert reopened.count_events("tick", until=105.0) == 4
+        assert reopened.event_types() == {"genesis": 1, "tick": 8, "fork": 4}
+    finally:
+        reopened.close()
+
+
+def test_group_commits_persist_the_index(clock, tmp_path):
+    ledger = mixed(PersistentLedger(str(tmp_path), fsync=False, group_size=4, group_interval=60.0))
+    try:
+        # Genesis plus 12 events: three automatic group commits, no explicit commit()
+        assert ledger.store.committed == 12 and len(ledger.store) == 13
+        persisted = PersistedLedgerIndex.load(os.path.join(str(tmp_path), "index"), len(ledger.store))
+        assert len(persisted) == 12
+        assert {event_type: len(entry[0]) for event_type, entry in persisted.types.items()} == {
+            "genesis": 1, "tick": 8, "fork": 3}
+        reopened = PersistentLedger(str(tmp_path), fsync=False)
+        try:
+            assert [block.index for block in reopened.events("fork")] == [3, 6, 9]
+        finally:
+            reopened.close()
+    finally:
+        ledger.store._pending = []  # the uncommitted block is lost, as in a crash
+        ledger.close()
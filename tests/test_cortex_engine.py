@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from cortex_engine import CortexEngine
+from memory_threads import MemoryThread
+
+
+def test_batch_pulse_matches_per_row_formula():
+    cortex = CortexEngine(input_size=8, seed=5)
+    signals = np.random.default_rng(0).random((6, 8))
+    cortex.receive_batch(signals)
+    noise = np.random.default_rng(5).random((6, 8))
+    expected = np.clip(np.sin(signals * np.pi) * noise, 0, 1)
+    assert np.allclose(cortex.logic_pulse_batch(), expected)
+    assert np.array_equal(cortex.signal_register, signals[-1])
+    assert not cortex.logic_overdrive
+
+
+def test_batch_pulse_reuses_buffers_and_fills_out():
+    cortex = CortexEngine(input_size=4, seed=1)
+    cortex.receive_batch(np.ones((5, 4)) * 0.5)
+    first = cortex.logic_pulse_batch()
+    cortex.receive_batch(np.ones((3, 4)) * 0.5)
+    second = cortex.logic_pulse_batch()
+    assert second.shape == (3, 4) and np.shares_memory(first, second)
+    out = np.empty((3, 4))
+    assert cortex.logic_pulse_batch(out=out) is out
+    with pytest.raises(ValueError, match="batch dimensions"):
+        cortex.logic_pulse_batch(out=np.empty((2, 4)))
+    with pytest.raises(ValueError, match="cortex dimensions"):
+        cortex.receive_batch(np.ones((3, 5)))
+
+
+def test_memory_buffer_keeps_the_newest_threads():
+    cortex = CortexEngine(memory_limit=3)
+    threads = [MemoryThread(f"memory {i}") for i in range(5)]
+    for thread in threads:
+        cortex.integrate_memory(thread)
+    assert list(cortex.memory_buffer) == threads[2:]
+    assert [entry["id"] for entry in cortex.memory_index()] == [t.id for t in threads[2:]]
+
+
+def test_changing_memory_limit_resizes_the_buffer():
+    cortex = CortexEngine(memory_limit=3)
+    threads = [MemoryThread(f"memory {i}") for i in range(6)]
+    for thread in threads[:3]:
+        cortex.integrate_memory(thread)
+    cortex.memory_limit = 2
+    assert cortex.memory_limit == 2 and list(cortex.memory_buffer) == threads[1:3]
+    cortex.memory_limit = 4
+    for thread in threads[3:]:
+        cortex.integrate_memory(thread)
+    assert list(cortex.memory_buffer) == threads[2:]
@@ -0,0 +1,258 @@
+import math
+import warnings
+
+import pytest
+
+import numpy as np
+
+from ai_law_generator import AILawGenerator
+from dynamic_law_expander import LawEngine
+from law_core import Law, columns_to_contexts, get_column
+from law_expressions import Rule, compile_rules
+
+
+def heat(ctx):
+    ctx["heat"] = ctx["heat"] * 1.1
+    return ctx
+
+
+def cool(ctx):
+    ctx["heat"] = ctx["heat"] - 0.05
+    return ctx
+
+
+def drift(ctx):
+    ctx["drift"] = ctx.get("drift", 0.0) + ctx["wind"]
+    return ctx
+
+
+def settle(ctx):
+    ctx["stability"] = ctx["stability"] * 0.99
+    return ctx
+
+
+def couple(ctx):
+    # Reaches for a key of another group only once stability drops
+    if ctx["stability"] < 0.985:
+        ctx["heat"] = ctx["heat"] + ctx["wind"]
+    return ctx
+
+
+def seed(ctx):
+    ctx["a"] = 3
+    return ctx
+
+
+def boost(ctx):
+    # Reads another group's key with .get() once b has grown, which yields None in parallel
+    if ctx["b"] >= 10:
+        ctx["b"] = ctx["b"] + ctx.get("a") * 2
+    else:
+        ctx["b"] = ctx["b"] + 5
+    return ctx
+
+
+def fail(ctx):
+    raise ValueError("law failed")
+
+
+def engine_with(*functions):
+    engine = LawEngine()
+    for function in functions:
+        engine.register_law(Law(function.__name__, "", function))
+    return engine
+
+
+def base_context():
+    return {"heat": 1.0, "wind": 0.2, "stability": 1.0}
+
+
+def sequential(functions, ticks):
+    engine, context, history = engine_with(*functions), base_context(), []
+    for _ in range(ticks):
+        context = engine.evaluate(dict(context))
+        history.append(dict(context))
+    return history
+
+
+@pytest.mark.parametrize("functions", [(heat, cool, drift, settle), (heat, drift, settle, couple)])
+def test_incremental_matches_evaluate(functions):
+    engine, reference, context = engine_with(*functions), engine_with(*functions), base_context()
+    expected = base_context()
+    for tick in range(6):
+        if tick == 3:
+            context["wind"] = expected["wind"] = 0.5  # external edit schedules its readers
+        expected = reference.evaluate(dict(expected))
+        assert engine.evaluate_incremental(context) == expected
+
+
+def test_incremental_skips_laws_whose_inputs_did_not_change():
+    calls = []
+
+    def counted(ctx):
+        calls.append(1)
+        ctx["drift"] = ctx["wind"] * 2
+        return ctx
+
+    engine = engine_with(heat)
+    engine.register_law(Law("counted", "", counted))
+    context = base_context()
+    for _ in range(3):
+        engine.evaluate_incremental(context)
+    assert len(calls) == 1
+    context["wind"] = 1.0
+    engine.evaluate_incremental(context)
+    assert len(calls) == 2 and context["drift"] == 2.0
+
+
+def test_incremental_reader_sees_earlier_writer_of_overwritten_key():
+    def double(ctx):
+        ctx["x"] = ctx["z"] * 2
+        return ctx
+
+    def add(ctx):
+        ctx["y"] = ctx["x"] + ctx["w"]
+        return ctx
+
+    def reset(ctx):
+        ctx["x"] = 100
+        return ctx
+
+    engine, reference = engine_with(double, add, reset), engine_with(double, add, reset)
+    context, expected = {"z": 1, "w": 1}, {"z": 1, "w": 1}
+    for tick in range(4):
+        if tick == 2:
+            context["w"] = expected["w"] = 1.5  # re-runs add alone, which must still see x == 2
+        expected = reference.evaluate(dict(expected))
+        assert engine.evaluate_incremental(context) == expected
+
+
+def test_incremental_leaves_context_untouched_when_a_law_raises():
+    engine = engine_with(heat, fail)
+    context = base_context()
+    with pytest.raises(ValueError):
+        engine.evaluate_incremental(context)
+    assert context == base_context()
+    engine.laws.pop()
+    assert engine.evaluate_incremental(context) == engine_with(heat).evaluate(base_context())
+
+
+def test_batch_matches_evaluate_per_universe():
+    def flare(ctx):
+        # Row-wise only; sets a key in some universes
+        if ctx["heat"] > 1.5:
+            ctx["flare"] = ctx["heat"] * 2
+        return ctx
+
+    def glow(ctx):
+        ctx["glow"] = ctx.get("flare", 0.0) + ctx.get("spark", -1.0)
+        return ctx
+
+    def cool_batch(columns):
+        columns["heat"] = get_column(columns, "heat", 0.0) - get_column(columns, "flare", 0.5)
+        return columns
+
+    def cool_flare(ctx):
+        ctx["heat"] = ctx.get("heat", 0.0) - ctx.get("flare", 0.5)
+        return ctx
+
+    engine = LawEngine()
+    engine.register_law(Law("heat", "", heat, lambda columns: dict(columns, heat=columns["heat"] * 1.1)))
+    engine.register_law(Law("flare", "", flare))
+    engine.register_law(compile_rules([Rule("spark", "", {"spark": "flare / 2"}, guard="wind > 0.3",
+                                            defaults={"flare": 1.0})]))
+    engine.register_law(Law("glow", "", glow))
+    engine.register_law(Law("cool", "", cool_flare, cool_batch))
+    universes = [{"heat": heat_value, "wind": wind} for heat_value in (1.0, 1.5, 2.0) for wind in (0.2, 0.5)]
+    columns = {key: np.array([universe[key] for universe in universes]) for key in ("heat", "wind")}
+    for _ in range(3):
+        columns = engine.evaluate_batch(columns)
+        universes = [engine.evaluate(universe) for universe in universes]
+        assert columns_to_contexts(columns) == universes
+
+
+def test_generated_law_batch_leaves_unset_keys_absent():
+    law = AILawGenerator().generate_law(seed_entropy=0.5)
+    columns = law.apply_batch({"entropy": np.array([0.2, 0.8])})
+    rows = [law.apply({"entropy": entropy}) for entropy in (0.2, 0.8)]
+    assert [set(row) for row in columns_to_contexts(columns)] == [set(row) for row in rows] == [
+        {"entropy"}, {"entropy", "mutation"}]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("functions", [(heat, cool, drift, settle), (heat, drift, settle, couple)])
+def test_parallel_matches_evaluate(executor, functions):
+    engine, context = engine_with(*functions), base_context()
+    try:
+        for expected in sequential(functions, 4):
+            assert engine.evaluate_parallel(context, executor=executor) == expected
+    finally:
+        engine.shutdown()
+
+
+def test_parallel_keeps_rewrites_that_compare_equal():
+    def flip(ctx):
+        ctx["zero"] = -ctx["zero"]
+        return ctx
+
+    def relist(ctx):
+        ctx["items"] = list(ctx["items"])
+        return ctx
+
+    engine = engine_with(flip, relist)
+    context = {"zero": 0.0, "items": [1, 2]}
+    original = context["items"]
+    try:
+        for sign in (-1.0, 1.0, -1.0):  # the first tick runs sequentially to trace the groups
+            engine.evaluate_parallel(context)
+            assert math.copysign(1.0, context["zero"]) == sign
+    finally:
+        engine.shutdown()
+    assert context["items"] == original and context["items"] is not original
+
+
+def test_unpicklable_laws_warn_once_and_fall_back():
+    def halve(ctx):
+        ctx["stability"] = ctx["stability"] / 2
+        return ctx
+
+    engine = engine_with(heat, drift)
+    engine.register_law(Law("halve", "", halve))
+    context = base_context()
+    try:
+        engine.evaluate_parallel(context, executor="process")  # traces the law groups
+        with pytest.warns(RuntimeWarning, match="cannot pickle"):
+            engine.evaluate_parallel(context, executor="process")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            engine.evaluate_parallel(context, executor="process")
+    finally:
+        engine.shutdown()
+    assert context["stability"] == 0.125 and round(context["heat"], 6) == 1.331
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_propagates_law_errors(executor):
+    engine = LawEngine()
+    engine.register_law(Law("heat", "", heat, reads=["heat"], writes=["heat"]))
+    engine.register_law(Law("drift", "", drift, reads=["drift", "wind"], writes=["drift"]))
+    engine.register_law(Law("fail", "", fail, reads=["stability"], writes=["stability"]))
+    assert len(engine.law_groups()) == 3
+    try:
+        with pytest.raises(ValueError, match="law failed"):
+            engine.evaluate_parallel(base_context(), executor=executor)
+    finally:
+        engine.shutdown()
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_reruns_laws_that_fail_outside_their_group(executor):
+    engine, reference = engine_with(seed, boost), engine_with(seed, boost)
+    context, expected = {"b": 5}, {"b": 5}
+    try:
+        for _ in range(3):
+            expected = reference.evaluate(dict(expected))
+            assert engine.evaluate_parallel(context, executor=executor) == expected
+    finally:
+        engine.shutdown()
+    assert context == {"a": 3, "b": 22}
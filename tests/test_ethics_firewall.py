@@ -0,0 +1,39 @@
+import numpy as np
+
+from ethics_firewall import EthicsFirewall
+from law_core import columns_to_contexts
+
+COLUMNS = {
+    "incoming_entropy": np.array([0.2, 0.95, 0.5, 0.7]),
+    "emotion_override": np.array([False, False, True, False]),
+    "cloning": np.array([False, True, True, True]),
+    "consent": np.array([False, False, True, None], dtype=object),
+}
+
+
+def rowwise(firewall, columns):
+    flagged = {}
+    for row, context in enumerate(columns_to_contexts(columns)):
+        violations = firewall.evaluate(context)
+        if violations:
+            flagged[row] = violations
+    return flagged
+
+
+def test_batch_matches_row_by_row():
+    firewall = EthicsFirewall()
+    assert firewall.evaluate_batch(COLUMNS) == rowwise(firewall, COLUMNS)
+
+
+def test_overridden_rule_is_checked_row_by_row():
+    class StrictFirewall(EthicsFirewall):
+        def block_high_entropy_injection(self, context):
+            if context.get("incoming_entropy", 0) > 0.6:
+                return "Injection entropy exceeds the strict threshold."
+            return None
+
+    firewall = StrictFirewall()
+    flagged = firewall.evaluate_batch(COLUMNS)
+    assert flagged == rowwise(firewall, COLUMNS)
+    assert flagged[3] == ["Injection entropy exceeds the strict threshold.",
+                          "Unconsented identity cloning operation detected."]
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from identity_binding import IdentityCore
+from identity_population import IdentityPopulation
+
+
+@pytest.fixture
+def identities():
+    np.random.seed(4)
+    identities = [IdentityCore(f"Entity-{i}") for i in range(23)]
+    identities[5].identity_waveform = np.zeros(128)  # zero norm resonates with nothing
+    return identities
+
+
+def test_matrix_matches_pairwise_resonance(identities):
+    population = IdentityPopulation.from_identities(identities)
+    expected = np.array([[a.resonate_with(b) for b in identities] for a in identities])
+    assert np.allclose(population.resonance_matrix(block_size=4), expected)
+    assert np.allclose(population.resonance_with(identities[3]), expected[3])
+
+
+def test_population_grows_past_its_capacity(identities):
+    population = IdentityPopulation(capacity=2)
+    rows = [population.add(identity) for identity in identities]
+    assert rows == list(range(23)) and len(population) == 23
+    assert population.row_of(identities[9].id) == 9
+    with pytest.raises(ValueError, match="already"):
+        population.add(identities[0])
+
+
+def test_update_refreshes_cached_resonance(identities):
+    population = IdentityPopulation.from_identities(identities)
+    population.resonance_matrix()
+    identities[2].identity_waveform = identities[7].identity_waveform.copy()
+    population.update(identities[2])
+    assert np.isclose(population.resonance_matrix()[2, 7], 1.0)
+    assert population.norms[2] == pytest.approx(np.linalg.norm(identities[7].identity_waveform))
+
+
+def test_top_k_and_pairs_agree_with_the_matrix(identities):
+    population = IdentityPopulation.from_identities(identities)
+    matrix = population.resonance_matrix()
+    indices, scores = population.top_k(k=3, block_size=5)
+    for row in range(len(identities)):
+        others = np.delete(np.arange(len(identities)), row)
+        best = others[np.argsort(-matrix[row, others], kind="stable")[:3]]
+        assert np.allclose(scores[row], matrix[row, best])
+        assert row not in indices[row]
+    threshold = float(np.sort(matrix[np.triu_indices(23, 1)])[-10])
+    pairs = list(population.resonant_pairs(threshold, block_size=6))
+    assert len(pairs) == 10 and all(i < j and r >= threshold for i, j, r in pairs)
@@ -0,0 +1,80 @@
+import random
+
+import numpy as np
+
+from law_battlefield import LawArena, LawTournament
+from law_core import Law
+
+
+def noisy(ctx):
+    ctx["entropy"] = ctx.get("entropy", 0.0) + random.random() * 0.1
+    ctx["stability"] = ctx.get("stability", 1.0) * (1.0 + np.random.normal(0, 0.01))
+    return ctx
+
+
+def steady(ctx):
+    ctx["stability"] = ctx.get("stability", 1.0) * 1.01
+    return ctx
+
+
+def law_sets():
+    return [[Law("Noisy", "", noisy)], [Law("Steady", "", steady)], [Law("Noisy", "", noisy), Law("Steady", "", steady)]]
+
+
+def test_tournament_restores_global_rng_state():
+    random.seed(123)
+    np.random.seed(123)
+    expected = (random.random(), np.random.random())
+    random.seed(123)
+    np.random.seed(123)
+    LawTournament(law_sets(), iterations=4, processes=1).run()
+    assert (random.random(), np.random.random()) == expected
+
+
+def test_tournament_is_reproducible_for_a_seed():
+    first = LawTournament(law_sets(), iterations=4, processes=1, seed=7).simulate()
+    second = LawTournament(law_sets(), iterations=4, processes=1, seed=7).simulate()
+    assert np.array_equal(first, second)
+
+
+def test_round_robin_plays_every_pair_once():
+    tournament = LawTournament(law_sets() * 2, iterations=4, processes=1)
+    board = tournament.run()
+    pairs = {(min(i, j), max(i, j)) for i, j, _, _ in tournament.matches}
+    assert len(tournament.matches) == len(pairs) == 15
+    assert [row["rank"] for row in board] == list(range(1, 7))
+    assert sum(row["wins"] + row["draws"] + row["losses"] for row in board) == 30
+
+
+def test_arena_log_rows():
+    arena = LawArena()
+    arena.load_sets([Law("Steady", "", steady)], [Law("Noisy", "", noisy)])
+    log = arena.simulate(iterations=3)
+    assert len(log) == 3
+    assert [row["round"] for row in log] == [1, 2, 3]
+    assert log[0]["winner"] in ("Set A", "Set B", "Draw")
+
+
+def test_battle_log_supports_negative_indexes_and_slices():
+    arena = LawArena()
+    arena.load_sets([Law("Steady", "", steady)], [Law("Noisy", "", noisy)])
+    log = arena.simulate(iterations=5)
+    assert log[-1] == log[4]
+    assert [row["round"] for row in log[-2:]] == [4, 5]
+    assert [row["round"] for row in log[::2]] == [1, 3, 5]
+    assert log[10:] == []
+
+
+def test_sink_chunks_are_never_overwritten(tmp_path):
+    first = LawArena(log_capacity=2, log_sink=str(tmp_path), chunk_size=2)
+    second = LawArena(log_capacity=2, log_sink=str(tmp_path), chunk_size=2)
+    for arena in (first, second):
+        arena.load_sets([Law("Steady", "", steady)], [Law("Noisy", "", noisy)])
+        arena.simulate(iterations=4)
+    first.battle_log.clear()
+    first.simulate(iterations=4)
+    assert len(list(tmp_path.iterdir())) == 6
+    assert [row["round"] for row in first.battle_log] == [1, 2, 3, 4]
+    assert [row["round"] for row in second.battle_log[1:3]] == [2, 3]
+    assert second.battle_log.winner_counts() == {
+        name: sum(row["winner"] == name for row in second.battle_log) for name in ("Draw", "Set A", "Set B")}
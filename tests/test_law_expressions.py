@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from law_core import columns_to_contexts, contexts_to_columns
+from law_expressions import ExpressionError, Rule, compile_rules
+
+
+def test_failed_guard_leaves_context_untouched():
+    law = compile_rules([Rule("g", "", {"y": "x * 2"}, guard="x > 1")])
+    assert law.apply({"x": 0.5}) == {"x": 0.5}
+    assert law.apply({"x": 2}) == {"x": 2, "y": 4}
+
+
+def test_failed_guard_does_not_write_defaults():
+    law = compile_rules([Rule("g", "", {"y": "y + 1"}, guard="x > 1", defaults={"y": 10})])
+    assert law.apply({"x": 0}) == {"x": 0}
+    assert law.apply({"x": 2}) == {"x": 2, "y": 11}
+
+
+def test_later_rule_sees_guarded_write_or_its_default():
+    rules = [
+        Rule("a", "", {"y": "x + 1"}),
+        Rule("g", "", {"y": "y * 3", "z": "y"}, guard="x > 1"),
+        Rule("c", "", {"w": "y + z"}, defaults={"z": -1}),
+    ]
+    law = compile_rules(rules)
+    assert law.apply({"x": 0.5}) == {"x": 0.5, "y": 1.5, "w": 0.5}
+    assert law.apply({"x": 2.0}) == {"x": 2.0, "y": 9.0, "z": 9.0, "w": 18.0}
+    columns = law.apply_batch({"x": np.array([0.5, 2.0])})
+    assert columns["y"].tolist() == [1.5, 9.0]
+    assert columns["w"].tolist() == [0.5, 18.0]
+    assert columns["z"].tolist() == [None, 9.0]
+
+
+def test_batch_matches_scalar():
+    rules = [
+        Rule.from_props("gravity", {"rule": "harmonic_pull", "params": {"strength": 2.5}}),
+        Rule.from_props("entropy_gate", {"rule": "invert_time_if_stable"}),
+        Rule.from_props("damping", {"set": {"stability": "clip(stability * (0.9 if gravity > 2 else 1.0), 0, 1)"}}),
+    ]
+    law = compile_rules(rules)
+    contexts = [{"entropy": e, "time_flow": 1.0, "stability": 1.0, "gravity": 1.0} for e in (0.2, 0.5, 0.9)]
+    expected = [law.apply(dict(context)) for context in contexts]
+    assert columns_to_contexts(law.apply_batch(contexts_to_columns(contexts))) == expected
+
+
+def test_legacy_rules():
+    law = compile_rules([Rule.from_props("entropy_gate", {"rule": "invert_time_if_stable"})])
+    assert law.apply({"entropy": 0.3, "time_flow": 1.0})["time_flow"] == -1.0
+    assert law.apply({"entropy": 0.7, "time_flow": 1.0})["time_flow"] == 1.0
+    assert law.apply({}) == {}  # default entropy 1.0 fails the guard
+
+
+def test_unsafe_expressions_are_rejected():
+    with pytest.raises(ExpressionError):
+        Rule("bad", "", {"y": "__import__('os')"})
+    with pytest.raises(ExpressionError):
+        Rule("bad", "", {"y": "x.real"})
+
+
+def test_rule_name_cannot_inject_code():
+    name = "gate\n    context['injected'] = True\n    # "
+    law = compile_rules([Rule.from_props(name, {"set": {"y": "x + 1"}})])
+    assert law.apply({"x": 1}) == {"x": 1, "y": 2}
+    assert law.apply_batch({"x": np.array([1.0])}).keys() == {"x", "y"}
+    assert all(line.lstrip().startswith(("#", "def ")) or "injected" not in line for line in law.source.splitlines())
+
+
+def test_generated_code_runs_without_builtins():
+    law = compile_rules([Rule("m", "", {"y": "max(abs(x), 1)"})])
+    assert law.apply({"x": -3}) == {"x": -3, "y": 3}
+    assert law.activation_func.__globals__["__builtins__"].keys() == {"min", "max", "abs"}
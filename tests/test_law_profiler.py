@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+import pytest
+
+from dynamic_law_expander import LawEngine
+from law_core import Law
+from law_profiler import LawProfiler
+
+
+def warm(ctx):
+    ctx["heat"] = ctx["heat"] + 1
+    ctx["steps"] = ctx.get("steps", 0) + 1
+    return ctx
+
+
+def idle(ctx):
+    return ctx
+
+
+def test_recorded_totals_and_percentiles():
+    law_a, law_b = Law("a", "", idle), Law("b", "", idle)
+    profiler = LawProfiler(sample_size=4)
+    for seconds in (0.001, 0.002, 0.003, 0.004, 0.010):
+        profiler.record(law_a, seconds, 2)
+    profiler.record(law_b, 0.005, 0)
+    a, b = profiler.report()
+    assert (a["name"], a["calls"], a["total_ms"], a["keys_modified"], a["keys_per_call"]) == ("a", 5, 20.0, 10, 2.0)
+    assert a["share"] == 0.8 and b["share"] == 0.2
+    assert a["mean_us"] == 4000.0
+    assert a["p50_us"] == 3500.0  # only the last four calls are sampled
+    assert [row["name"] for row in profiler.report(sort_by="calls", limit=1)] == ["a"]
+
+
+def test_engine_reports_every_evaluation_path(tmp_path):
+    engine = LawEngine()
+    engine.register_law(Law("warm", "", warm))
+    engine.register_law(Law("idle", "", idle))
+    profiler = engine.enable_profiling()
+    context = {"heat": 0}
+    for _ in range(3):
+        context = engine.evaluate(context)
+    engine.evaluate_batch({"heat": np.zeros(4)})
+    engine.evaluate_incremental(context)
+    try:
+        engine.evaluate_parallel(context)
+    finally:
+        engine.shutdown()
+    stats = {row["name"]: row for row in engine.profile_report()}
+    assert stats["warm"]["calls"] == stats["idle"]["calls"] == 6
+    assert stats["warm"]["keys_modified"] == 3 * 2 + 2 + 2 + 2 and stats["idle"]["keys_modified"] == 0
+    assert sum(row["share"] for row in stats.values()) == pytest.approx(1.0, abs=1e-3)
+
+    path = tmp_path / "profile.json"
+    profiler.export_json(str(path))
+    exported = json.loads(path.read_text())
+    assert exported["profiled_ms"] == pytest.approx(sum(row["total_ms"] for row in stats.values()), abs=1e-2)
+    assert engine.disable_profiling() is profiler and engine.profile_report() == []
@@ -0,0 +1,158 @@
+import numpy as np
+import pytest
+
+from memory_threads import ColumnarThreadCluster, MemoryThread, ThreadCluster
+from memory_shards import MemoryShard
+from energy_cohesion import CohesionAnalyzer
+
+
+def _threads(n=3):
+    return [MemoryThread(f"memory {i}", emotional_charge=0.1 * i, entropy=0.2) for i in range(n)]
+
+
+def _assert_totals(cluster):
+    assert cluster.entropy_total == pytest.approx(float(np.sum(cluster.entropy_values())))
+    assert cluster.emotion_total == pytest.approx(float(np.sum(cluster.emotion_values())))
+
+
+@pytest.fixture(params=[ThreadCluster, ColumnarThreadCluster])
+def cluster(request):
+    cluster = request.param()
+    for thread in _threads():
+        cluster.add_thread(thread)
+    return cluster
+
+
+def test_setters_keep_totals_in_sync(cluster):
+    cluster.threads[0].entropy = 5.0
+    cluster.threads[1].emotional_charge = -0.7
+    _assert_totals(cluster)
+    assert cluster.mean_entropy() == pytest.approx((5.0 + 0.2 + 0.2) / 3)
+
+
+def test_single_thread_decay_and_reinforce(cluster):
+    cluster.threads[2].decay(0.5)
+    cluster.threads[1].reinforce(0.95)
+    _assert_totals(cluster)
+    assert cluster.threads[1].emotional_charge == 1.0
+
+
+def test_cluster_wide_operations(cluster):
+    cluster.decay_all(0.01)
+    cluster.reinforce_all(positive=False)
+    _assert_totals(cluster)
+
+
+def test_edits_refresh_range_index(cluster):
+    assert len(cluster.select(entropy_range=(0.0, 1.0))) == 3
+    cluster.threads[0].entropy = 5.0
+    assert len(cluster.select(entropy_range=(0.0, 1.0))) == 2
+
+
+def test_label_edits_refresh_origin_index(cluster):
+    assert len(cluster.threads_by_origin("neutral")) == 3
+    cluster.threads[1].origin_label = "hope"
+    assert [t.content for t in cluster.threads_by_origin("hope")] == ["memory 1"]
+    assert len(cluster.select(origin_label="neutral")) == 2
+
+
+def test_id_and_content_edits_refresh_lookup_maps():
+    cluster = ThreadCluster()
+    threads = _threads()
+    for thread in threads:
+        cluster.add_thread(thread)
+    old_id, old_fingerprint = threads[0].id, threads[0].fingerprint
+    assert cluster.find(old_id) is threads[0] and cluster.contains_fingerprint(old_fingerprint)
+    threads[0].id = "renamed"
+    threads[0].content = "rewritten"
+    assert cluster.find(old_id) is None and cluster.find("renamed") is threads[0]
+    assert not cluster.contains_fingerprint(old_fingerprint)
+    assert cluster.find_by_fingerprint(threads[0].generate_fingerprint()) == [threads[0]]
+
+
+def test_view_edits_refresh_lookup_maps():
+    cluster = ColumnarThreadCluster()
+    for thread in _threads():
+        cluster.add_thread(thread)
+    view = cluster.threads[0]
+    old_id, old_fingerprint = view.id, view.fingerprint
+    view.id = "renamed"
+    view.content = "rewritten"
+    assert cluster.find(old_id) is None and cluster.find("renamed").content == "rewritten"
+    assert not cluster.contains_fingerprint(old_fingerprint)
+    assert [t.row for t in cluster.find_by_fingerprint(view.generate_fingerprint())] == [0]
+    view.fingerprint = "custom"
+    assert [t.content for t in cluster.find_by_fingerprint("custom")] == ["rewritten"]
+
+
+def test_columnar_add_keeps_lazy_ids_and_given_fingerprints():
+    cluster = ColumnarThreadCluster()
+    lazy, marked = MemoryThread("lazy"), MemoryThread("marked")
+    marked.fingerprint = "custom"
+    cluster.add_thread(lazy)
+    view = cluster.add_thread(marked)
+    assert lazy._id is None and cluster._ids == [None, None]
+    assert view.fingerprint == "custom" and cluster.find_by_fingerprint("custom")[0].content == "marked"
+    assert cluster.find(cluster.threads[0].id).content == "lazy"
+
+
+def test_view_added_to_plain_cluster_is_tracked():
+    columnar = ColumnarThreadCluster.from_arrays(["a", "b"], [0.1, 0.2], [0.3, 0.4])
+    plain = ThreadCluster()
+    stored = [plain.add_thread(view) for view in columnar.threads]
+    assert all(type(thread) is MemoryThread for thread in plain.threads)
+    assert [t.id for t in plain.threads] == [t.id for t in columnar.threads]
+    stored[0].entropy = 2.0
+    stored[1].decay(0.5)
+    _assert_totals(plain)
+    assert plain.select(entropy_range=(1.0, 3.0)) == [stored[0]]
+    assert columnar.threads[0].entropy == 0.3  # the copy is detached from its source
+
+
+def test_thread_shared_between_clusters():
+    first, second = ThreadCluster(), ThreadCluster()
+    shard = MemoryShard("test")
+    for thread in _threads():
+        first.add_thread(thread)
+        shard.add_thread(thread)
+    shard.inject_to_cluster(second)
+    first.threads[0].entropy = 2.0
+    first.decay_all(0.1)
+    for cluster in (first, second):
+        _assert_totals(cluster)
+    assert CohesionAnalyzer(second).compute_cohesion_index() == CohesionAnalyzer(first).compute_cohesion_index()
+
+
+def test_columnar_matches_object_cluster():
+    contents = [f"m{i}" for i in range(50)]
+    rng = np.random.default_rng(0)
+    charges, entropies = rng.uniform(-1, 1, 50), rng.random(50)
+    plain = ThreadCluster()
+    for thread in MemoryThread.from_arrays(contents, charges, entropies):
+        plain.add_thread(thread)
+    columnar = ColumnarThreadCluster.from_arrays(contents, charges, entropies)
+    for c in (plain, columnar):
+        c.decay_all(0.01)
+        c.reinforce_all()
+    assert plain.mean_entropy() == pytest.approx(columnar.mean_entropy())
+    assert plain.mean_emotion() == pytest.approx(columnar.mean_emotion())
+    assert np.allclose(plain.entropy_values(), columnar.entropy_values())
+
+
+def test_from_arrays_matches_constructor():
+    threads = MemoryThread.from_arrays(["a", "b", "c"], emotional_charges=np.array([0.1, 0.2, 0.3]),
+                                       entropies=0.5, origin_labels=["x", "y", "x"])
+    assert [t.content for t in threads] == ["a", "b", "c"]
+    assert [t.emotional_charge for t in threads] == [0.1, 0.2, 0.3]
+    assert all(type(t.entropy) is float and t.entropy == 0.5 for t in threads)
+    assert [t.origin_label for t in threads] == ["x", "y", "x"]
+    assert len({t.timestamp for t in threads}) == 1 and len({t.id for t in threads}) == 3
+    assert threads[1].summarize() == dict(MemoryThread("b", 0.2, 0.5, "y").summarize(), id=threads[1].id)
+    assert all(t.origin_label == "neutral" for t in MemoryThread.from_arrays(["a", "b"]))
+
+
+def test_from_arrays_rejects_mismatched_lengths():
+    with pytest.raises(ValueError, match="origin_labels"):
+        MemoryThread.from_arrays(["a", "b"], origin_labels=["x"])
+    with pytest.raises(ValueError):
+        MemoryThread.from_arrays(["a", "b"], emotional_charges=[0.1, 0.2, 0.3])
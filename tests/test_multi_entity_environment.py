@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from consciousness_environment import ConsciousnessEnvironment
+from law_core import Law
+from multi_entity_environment import MultiEntityEnvironment
+from tick_snapshots import SnapshotPolicy
+
+
+@pytest.fixture
+def no_noise(monkeypatch):
+    # Random draws differ in shape and order between one realm and N environments;
+    # make them deterministic so the two can be compared entity by entity
+    monkeypatch.setattr(np.random, "rand", lambda *shape: np.full(shape, 0.3))
+    monkeypatch.setattr(np.random, "normal", lambda loc=0.0, scale=1.0, size=None:
+                        float(loc) if size is None else np.full(size, loc, dtype=float))
+
+
+def gravity_drift(ctx):
+    ctx["gravity"] = ctx["gravity"] * 0.98 + ctx["entropy"] * 0.1
+    ctx["incoming_entropy"] = ctx["entropy"] * 3  # trips the ethics firewall for the third entity
+    return ctx
+
+
+def test_entities_match_separate_environments(no_noise):
+    realm = MultiEntityEnvironment(3)
+    realm.waveforms = np.random.default_rng(0).random((3, 128))
+    envs = [ConsciousnessEnvironment(label) for label in realm.labels]
+    for row, env in enumerate(envs):
+        env.identity.identity_waveform = realm.waveforms[row].copy()
+        env.context["entropy"] = realm.columns["entropy"][row] = 0.1 * (row + 1)
+        env.law_engine.register_law(Law("drift", "", gravity_drift))
+    realm.law_engine.register_law(Law("drift", "", gravity_drift))
+
+    realm.imprint_memory("Awoke", 0.7, 0.1, "origin")
+    realm.imprint_memory("Contact", -0.2, 0.4, "contact", rows=[0, 2])
+    realm.inject_emotion("curiosity", intensity=0.8, volatility=0.02)
+    for row, env in enumerate(envs):
+        env.imprint_memory("Awoke", 0.7, 0.1, "origin")
+        if row != 1:
+            env.imprint_memory("Contact", -0.2, 0.4, "contact")
+        env.inject_emotion("curiosity", intensity=0.8, volatility=0.02)
+
+    for _ in range(5):
+        realm.simulate_tick()
+        for env in envs:
+            env.simulate_tick()
+    for row, env in enumerate(envs):
+        context = realm.entity_context(row)
+        assert context.keys() == env.context.keys()
+        for key, value in env.context.items():
+            assert context[key] == pytest.approx(value), key
+        assert np.allclose(realm.waveforms[row], env.identity.identity_waveform)
+    assert realm.ledger.count_events("ethics_violation") == 5
+    assert [env.ledger.count_events("ethics_violation") for env in envs] == [0, 0, 5]
+
+
+def test_keyframe_replay_restores_columns(no_noise):
+    realm = MultiEntityEnvironment(4, snapshot_policy=SnapshotPolicy.keyframes(interval=3))
+    history = [{key: column.copy() for key, column in realm.simulate_tick().items()} for _ in range(7)]
+    for tick in (1, 4, 6):
+        replayed = realm.replay_tick(tick)
+        assert all(np.array_equal(replayed[key], history[tick - 1][key]) for key in history[tick - 1])
+    assert realm.summarize()["tick"] == 7
@@ -0,0 +1,77 @@
+import math
+
+import numpy as np
+import pytest
+
+import payload_codec
+from payload_codec import decode_payload, encode_payload
+
+CONTEXT = {"entropy": np.float64(0.1), "stability": 0.98, "gravity": 1.0, "dream_effect": False,
+           "emotion": 0.51, "cohesion": 1.0, "joy": 0.0}
+
+
+@pytest.mark.parametrize("payload", [
+    None, True, 0, -5, 2 ** 70, 1.5, "text", b"\x00raw", [1, "a", None], (1, 2.0),
+    {"b": 1, "a": [2, 3]}, {3: "x", (1, 2): "y"}, {1, 2, 3},
+    {"context_snapshot": CONTEXT, "waveform": np.arange(6.0).reshape(2, 3), "ints": np.arange(3, dtype=np.int32)},
+])
+def test_round_trip(payload):
+    encoded = encode_payload(payload)
+    decoded = decode_payload(encoded)
+    assert encode_payload(decoded) == encoded
+    if not isinstance(payload, dict):
+        assert decoded == payload
+
+
+def test_dict_order_does_not_matter():
+    reordered = dict(reversed(list(CONTEXT.items())))
+    assert encode_payload(CONTEXT) == encode_payload(reordered)
+    assert encode_payload({"x": {1: 2, "y": 3}}) == encode_payload({"x": {"y": 3, 1: 2}})
+
+
+def test_equal_floats_encode_alike():
+    assert encode_payload(0.0) == encode_payload(-0.0) == encode_payload(np.float64(-0.0))
+    assert encode_payload(float("nan")) == encode_payload(-np.float64("nan"))
+    assert encode_payload(np.array([-0.0, np.nan])) == encode_payload(np.array([0.0, -np.nan]))
+    assert encode_payload(dict(CONTEXT, joy=-0.0)) == encode_payload(CONTEXT)
+    assert encode_payload(dict(CONTEXT, joy=math.nan)) == encode_payload(dict(CONTEXT, joy=-np.float64("nan")))
+
+
+def test_equal_keys_of_different_types_encode_alike():
+    assert encode_payload({1: 0}) == encode_payload({True: 0}) == encode_payload({1.0: 0})
+    assert encode_payload({0: "a"}) == encode_payload({-0.0: "a"})
+    assert encode_payload({True, 2}) == encode_payload({1, 2.0})
+    assert decode_payload(encode_payload({True: 0})) == {1: 0}
+
+
+def test_values_keep_their_type():
+    assert encode_payload(1) != encode_payload(1.0) != encode_payload(True)
+    assert decode_payload(encode_payload({"flag": np.True_, "level": np.float32(0.5)})) == {"flag": True, "level": 0.5}
+
+
+@pytest.mark.parametrize("context", [
+    CONTEXT,  # floats and bools: packed in one call
+    dict(CONTEXT, gravity=math.inf, cohesion=-math.inf),  # fsum fails: item by item
+    dict(CONTEXT, label="calm", count=3),  # other types: item by item
+])
+def test_dict_encoding_is_sorted_concatenation(context):
+    expected = b"D" + len(context).to_bytes(4, "little") + b"".join(
+        encode_payload(key) + encode_payload(context[key]) for key in sorted(context, key=encode_payload))
+    assert encode_payload(context) == expected
+
+
+@pytest.mark.parametrize("payload", [
+    {"aa": 1.0, "b": 2.0},
+    {"b": "x", "aa": [1], "ccc": None, "": True},
+    dict(CONTEXT, zz=0.5, a=1.5),
+])
+def test_str_key_layout_matches_generic_path(payload, monkeypatch):
+    fast = encode_payload(payload)
+    monkeypatch.setattr(payload_codec, "_layout", lambda value: None)
+    assert encode_payload(payload) == fast
+
+
+def test_str_keys_sort_by_their_encoding():
+    encoded = encode_payload({"aa": 1.0, "b": 2.0})
+    assert encoded.index(encode_payload("b")) < encoded.index(encode_payload("aa"))
+    assert encode_payload({"aa": 1.0, "b": 2.0, 1: 0})[5:] == encode_payload({1: 0})[5:] + encoded[5:]
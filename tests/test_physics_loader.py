@@ -0,0 +1,123 @@
+import os
+import threading
+
+import pytest
+import yaml
+
+from law_expressions import ExpressionError
+from physics_loader import EXAMPLE_PACK, PhysicsLoader
+
+
+def write(path, pack):
+    # Replace the file in one step, as editors do
+    with open(str(path) + ".tmp", "w") as file:
+        file.write(pack if isinstance(pack, str) else yaml.safe_dump(pack))
+    os.replace(str(path) + ".tmp", str(path))
+
+
+def test_example_pack_loads_and_fuses(tmp_path):
+    path = tmp_path / "example_physics.yaml"
+    write(path, EXAMPLE_PACK)
+    loader = PhysicsLoader(str(path))
+    laws = loader.load()
+    assert [law.name for law in laws] == ["gravity", "entropy_gate", "stability_damping"]
+    context = {"gravity": 1.0, "entropy": 0.2, "time_flow": 1, "stability": 1.0}
+    sequential = dict(context)
+    for law in laws:
+        sequential = law.apply(sequential)
+    assert loader.fused_law().apply(dict(context)) == sequential
+
+
+def test_reload_recompiles_only_changed_entries(tmp_path):
+    path = tmp_path / "pack.yaml"
+    pack = {f"rule_{i}": {"set": {f"x{i}": f"x{i} + {i}"}, "defaults": {f"x{i}": 0}} for i in range(3)}
+    write(path, pack)
+    loader = PhysicsLoader(str(path))
+    before = dict(zip((law.name for law in loader.load()), loader.law_list))
+
+    pack["rule_1"]["set"]["x1"] = "x1 * 2"
+    pack["rule_3"] = {"set": {"y": "1"}}
+    del pack["rule_0"]
+    write(path, pack)
+    assert loader.reload() == {"added": ["rule_3"], "changed": ["rule_1"], "removed": ["rule_0"]}
+    after = {law.name: law for law in loader.law_list}
+    assert after["rule_2"] is before["rule_2"]
+    assert after["rule_1"].apply({"x1": 3}) == {"x1": 6}
+    assert loader.reload() == {"added": [], "changed": [], "removed": []}
+
+
+def test_cached_load_matches_compiled_load(tmp_path):
+    path = tmp_path / "pack.yaml"
+    write(path, EXAMPLE_PACK)
+    cold = PhysicsLoader(str(path)).load()
+    assert any(name.endswith(".marshal") for name in os.listdir(tmp_path / "__physcache__"))
+    warm_loader = PhysicsLoader(str(path))
+    warm = warm_loader.load()
+    context = {"gravity": 3.0, "entropy": 0.7, "time_flow": 1, "stability": 1.0}
+    for cold_law, warm_law in zip(cold, warm):
+        assert cold_law.apply(dict(context)) == warm_law.apply(dict(context))
+    assert [rule.name for rule in warm_loader.rules] == ["gravity", "entropy_gate", "stability_damping"]
+
+
+def test_packs_sharing_a_stem_keep_their_caches(tmp_path):
+    yaml_path, json_path = tmp_path / "pack.yaml", tmp_path / "pack.json"
+    write(yaml_path, {"a": {"set": {"x": "x + 1"}}})
+    json_path.write_text('{"b": {"set": {"y": "y * 2"}}}')
+    PhysicsLoader(str(yaml_path)).load()
+    PhysicsLoader(str(json_path)).load()
+    write(yaml_path, {"a": {"set": {"x": "x + 2"}}})
+    PhysicsLoader(str(yaml_path)).load()  # replaces the stale pack.yaml cache only
+    caches = sorted(name.split(".")[1] for name in os.listdir(tmp_path / "__physcache__"))
+    assert caches == ["json", "yaml"]
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX file ownership")
+def test_cache_writable_by_others_is_not_trusted(tmp_path):
+    path = tmp_path / "pack.yaml"
+    write(path, {"a": {"set": {"x": "x + 1"}}})
+    loader = PhysicsLoader(str(path))
+    loader.load()
+    cache_path = loader._cache_path(loader.digest)
+    assert loader._read_cache(loader.digest) is not None
+    os.chmod(cache_path, 0o666)
+    assert loader._read_cache(loader.digest) is None
+    os.chmod(cache_path, 0o644)
+    os.chmod(tmp_path / "__physcache__", 0o777)
+    assert loader._read_cache(loader.digest) is None
+    assert PhysicsLoader(str(path)).load()[0].apply({"x": 1}) == {"x": 2}
+
+
+def test_cache_for_other_content_is_ignored(tmp_path):
+    path = tmp_path / "pack.yaml"
+    write(path, {"a": {"set": {"x": "x + 1"}}})
+    loader = PhysicsLoader(str(path))
+    loader.load()
+    stale = loader.digest
+    write(path, {"a": {"set": {"x": "x + 2"}}})
+    fresh = PhysicsLoader(str(path))
+    fresh.load()
+    os.replace(loader._cache_path(fresh.digest), loader._cache_path(stale))
+    assert loader._read_cache(stale) is None
+
+
+def test_watch_reports_reloads_and_errors(tmp_path):
+    path = tmp_path / "pack.yaml"
+    write(path, {"a": {"set": {"x": "x + 1"}}})
+    loader = PhysicsLoader(str(path), use_cache=False)
+    events, ready = [], threading.Event()
+
+    def callback(loader, changes):
+        events.append(changes)
+        ready.set()
+
+    loader.watch(interval=0.01, callback=callback)
+    try:
+        for pack in ({"a": {"set": {"x": "x *"}}}, {"a": {"set": {"x": "x + 2"}}}):
+            ready.clear()
+            write(path, pack)
+            assert ready.wait(5)
+    finally:
+        loader.stop_watch()
+    assert isinstance(events[0], ExpressionError)
+    assert events[1] == {"added": [], "changed": ["a"], "removed": []}
+    assert loader.law_list[0].apply({"x": 1}) == {"x": 3}
@@ -0,0 +1,52 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from consciousness_environment import ConsciousnessEnvironment
+from realm_runner import METRICS, RealmRunner
+
+
+def seeded_realm(index):
+    realm = ConsciousnessEnvironment(f"Realm-{index}")
+    realm.inject_emotion("curiosity", intensity=0.8, volatility=0.02)
+    return realm
+
+
+def run_state(processes, calls=(3, 2)):
+    with RealmRunner(5, processes=processes, factory=seeded_realm, history=8, seed=3) as runner:
+        for ticks in calls:
+            runner.run(ticks)
+        metrics = runner.metric("entropy"), runner.metric("stability")
+        return runner.waveforms.copy(), runner.contexts.copy(), metrics
+
+
+def test_state_does_not_depend_on_the_process_count():
+    single, sharded = run_state(1), run_state(2)
+    assert np.array_equal(single[0], sharded[0])
+    assert np.array_equal(single[1], sharded[1], equal_nan=True)
+    for one, two in zip(single[2], sharded[2]):
+        assert np.array_equal(one, two)
+    assert np.array_equal(run_state(2, calls=(5,))[0], single[0])  # nor on how ticks are split
+
+
+def test_metrics_ring_buffer_keeps_the_last_ticks():
+    with RealmRunner(2, processes=1, history=4) as runner:
+        runner.run(6)
+        assert runner.metric("tick_us").shape == (4, 2)
+        assert runner.metric("entropy", last=2).shape == (2, 2)
+        assert np.array_equal(runner.metric("cohesion", last=1)[0], runner.context("cohesion"))
+        assert runner.metrics.shape == (4, 2, len(METRICS))
+
+
+def test_dead_worker_raises_and_releases_shared_memory():
+    runner = RealmRunner(4, processes=2, history=4)
+    names = [block.name for block in runner._blocks]
+    runner._workers[1][0].kill()
+    runner._workers[1][0].join()
+    with pytest.raises(RuntimeError, match="shard 1"):
+        runner.run(1)
+    assert runner._workers == []
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
@@ -0,0 +1,85 @@
+import numpy as np
+
+from resonance_index import ResonanceIndex
+
+
+def test_repeated_key_in_batch_keeps_last_waveform():
+    rng = np.random.default_rng(0)
+    first, last = rng.random(128), rng.random(128)
+    index = ResonanceIndex()
+    index.add_many(["a", "b", "a"], [first, rng.random(128), last])
+    assert len(index) == 2
+    assert int(index._alive.sum()) == 2
+    keys = [key for key, _ in index.exact_query(last, k=10)]
+    assert sorted(keys) == ["a", "b"]
+    key, resonance = index.exact_query(last, k=1)[0]
+    assert key == "a" and np.isclose(resonance, 1.0)
+
+
+def test_readding_key_retires_old_slot():
+    rng = np.random.default_rng(1)
+    index = ResonanceIndex()
+    index.add("a", rng.random(128))
+    index.add_many(["a", "a"], rng.random((2, 128)))
+    assert len(index) == 1
+    assert int(index._alive.sum()) == 1
+    assert len(index.exact_query(rng.random(128), k=5)) == 1
+
+
+def test_query_is_exact_by_default():
+    rng = np.random.default_rng(2)
+    waveforms = rng.random((2000, 128))
+    index = ResonanceIndex()
+    index.add_many([str(i) for i in range(len(waveforms))], waveforms)
+    probe = rng.random(128)
+    assert index.query(probe, k=10) == index.exact_query(probe, k=10)
+
+
+def test_exact_query_skips_removed_slots():
+    rng = np.random.default_rng(3)
+    waveforms = rng.random((50, 128))
+    index = ResonanceIndex()
+    index.add_many([str(i) for i in range(50)], waveforms)
+    index.remove("7")
+    keys = [key for key, _ in index.exact_query(waveforms[7], k=50)]
+    assert "7" not in keys and len(keys) == 49
+
+
+def test_approximate_recall_on_clustered_waveforms():
+    rng = np.random.default_rng(4)
+    centers = rng.random((50, 128))
+    waveforms = np.clip(centers[rng.integers(50, size=5000)] + rng.normal(0, 0.05, (5000, 128)), 0, 1)
+    index = ResonanceIndex(approximate=True)
+    index.add_many([str(i) for i in range(len(waveforms))], waveforms)
+    recalls = []
+    for probe in waveforms[:20] + rng.normal(0, 0.05, (20, 128)):
+        approx = {key for key, _ in index.query(probe, k=10)}
+        exact = {key for key, _ in index.exact_query(probe, k=10)}
+        recalls.append(len(approx & exact) / 10)
+    assert np.mean(recalls) >= 0.9
+
+
+def test_save_load_round_trip(tmp_path):
+    rng = np.random.default_rng(5)
+    index = ResonanceIndex()
+    index.add_many([str(i) for i in range(100)], rng.random((100, 128)))
+    index.remove("3")
+    path = tmp_path / "index.npz"
+    index.save(path)
+    loaded = ResonanceIndex.load(path)
+    probe = rng.random(128)
+    assert loaded.exact_query(probe, k=5) == index.exact_query(probe, k=5)
+    assert "3" not in loaded and len(loaded) == 99
+
+
+def test_save_load_keeps_query_mode(tmp_path):
+    rng = np.random.default_rng(6)
+    index = ResonanceIndex(approximate=True)
+    index.add_many([str(i) for i in range(50)], rng.random((50, 128)))
+    path = tmp_path / "approximate.npz"
+    index.save(path)
+    loaded = ResonanceIndex.load(path)
+    probe = rng.random(128)
+    assert loaded.approximate and loaded.query(probe, k=5) == index.query(probe, k=5)
+    ResonanceIndex().save(tmp_path / "exact.npz")
+    assert not ResonanceIndex.load(tmp_path / "exact.npz").approximate
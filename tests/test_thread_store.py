@@ -0,0 +1,73 @@
+import json
+import os
+import uuid
+
+import numpy as np
+import pytest
+
+from memory_threads import MemoryThread
+from thread_store import MappedThreadCluster
+
+
+def snapshot(cluster):
+    return [(t.id, t.content, t.origin_label, t.entropy, t.emotional_charge, t.timestamp) for t in cluster.threads]
+
+
+def test_reopen_and_append_round_trip(tmp_path):
+    path = str(tmp_path / "threads")
+    with MappedThreadCluster(path, capacity=2) as cluster:
+        for i in range(3):  # grows the mapped columns
+            cluster.add_thread(MemoryThread(f"memory {i}", emotional_charge=0.1 * i, entropy=0.2, origin_label="hope"))
+        cluster.add_arrays(["ünïcode", "plain"], np.array([-0.5, 0.5]), np.array([0.3, 0.4]), ["dread", "hope"])
+        cluster.decay_all(0.01)
+        expected = snapshot(cluster)
+        totals = cluster.entropy_total, cluster.emotion_total
+
+    reopened = MappedThreadCluster.open(path)
+    try:
+        assert snapshot(reopened) == expected
+        assert (reopened.entropy_total, reopened.emotion_total) == totals
+        assert reopened.find(expected[4][0]).content == "plain"
+        assert [t.content for t in reopened.threads_by_origin("hope")] == ["memory 0", "memory 1", "memory 2", "plain"]
+        reopened.add_arrays(["after reopen"], 0.9, 0.05, "calm")
+        expected.append(snapshot(reopened)[-1])
+    finally:
+        reopened.close()
+
+    with MappedThreadCluster.open(path) as again:
+        assert snapshot(again) == expected
+        assert again.entropy_total == pytest.approx(float(np.sum(again.entropy_values())))
+        assert again.emotion_total == pytest.approx(float(np.sum(again.emotion_values())))
+
+
+def test_view_edits_reach_the_store(tmp_path):
+    path = str(tmp_path / "threads")
+    with MappedThreadCluster(path) as cluster:
+        cluster.add_arrays(["first", "second"], 0.1, 0.2)
+        cluster.threads[0].content = "first, rewritten"
+        cluster.threads[1].id = thread_id = str(uuid.uuid4())
+        assert cluster.find(thread_id).content == "second"
+    with MappedThreadCluster.open(path) as reopened:
+        assert [t.content for t in reopened.threads] == ["first, rewritten", "second"]
+        assert reopened.threads[1].id == thread_id
+        with pytest.raises(ValueError, match="UUID"):
+            reopened.threads[0].id = "not-a-uuid"
+
+
+def test_rejects_non_uuid_ids_and_unknown_versions(tmp_path):
+    path = str(tmp_path / "threads")
+    with MappedThreadCluster(path) as cluster:
+        thread = MemoryThread("memory")
+        thread.id = "not-a-uuid"
+        with pytest.raises(ValueError, match="UUID"):
+            cluster.add_thread(thread)
+        assert len(cluster.threads) == 0 and os.path.getsize(cluster._contents.path) == 0
+        cluster.add_thread(MemoryThread("kept"))
+        assert cluster.threads[0].content == "kept" and cluster._ids[0] is None
+    meta_path = os.path.join(path, "meta.json")
+    with open(meta_path) as file:
+        meta = json.load(file)
+    with open(meta_path, "w") as file:
+        json.dump(dict(meta, version=99), file)
+    with pytest.raises(ValueError, match="version"):
+        MappedThreadCluster.open(path)
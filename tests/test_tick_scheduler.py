@@ -0,0 +1,100 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from tick_scheduler import BCIFrameQueue, TickScheduler
+
+
+def fill(queue, values):
+    return [queue.put_nowait(np.full(2, value)) for value in values]
+
+
+def drain(queue):
+    frames = []
+    while (frame := queue.get_nowait()) is not None:
+        frames.append(frame[0])
+    return frames
+
+
+def test_drop_oldest_keeps_the_freshest_frames():
+    queue = BCIFrameQueue(maxsize=3, policy="drop_oldest")
+    assert fill(queue, range(5)) == [True] * 5
+    assert drain(queue) == [2, 3, 4]
+    assert queue.stats() == {"policy": "drop_oldest", "queued": 0, "accepted": 5, "dropped": 2, "coalesced": 0}
+
+
+def test_drop_newest_rejects_arriving_frames():
+    queue = BCIFrameQueue(maxsize=3, policy="drop_newest")
+    assert fill(queue, range(5)) == [True, True, True, False, False]
+    assert drain(queue) == [0, 1, 2]
+    assert (queue.accepted, queue.dropped) == (3, 2)
+
+
+def test_coalesce_averages_into_the_newest_frame():
+    queue = BCIFrameQueue(maxsize=2, policy="coalesce")
+    assert fill(queue, [0, 1, 2, 6]) == [True] * 4
+    assert drain(queue) == [0, 3]  # mean of 1, 2 and 6
+    assert (queue.accepted, queue.dropped, queue.coalesced) == (2, 0, 2)
+
+
+def test_block_waits_for_space():
+    async def scenario():
+        queue = BCIFrameQueue(maxsize=1, policy="block")
+        await queue.put(np.zeros(2))
+        with pytest.raises(asyncio.QueueFull):
+            queue.put_nowait(np.ones(2))
+        waiting = asyncio.ensure_future(queue.put(np.ones(2)))
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+        assert queue.get_nowait()[0] == 0
+        assert await asyncio.wait_for(waiting, 1) is True
+        return drain(queue)
+
+    assert asyncio.run(scenario()) == [1]
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError, match="policy"):
+        BCIFrameQueue(policy="spill")
+
+
+class CountingEnvironment:
+    # Just the parts of ConsciousnessEnvironment the scheduler uses
+    def __init__(self):
+        self.tick = 0
+        self.injected = []
+
+    def inject_bci_input(self, frame):
+        self.injected.append((self.tick, frame[0]))
+
+    def simulate_tick(self):
+        self.tick += 1
+        return {"tick": self.tick}
+
+
+def test_scheduler_ticks_and_feeds_frames():
+    env = CountingEnvironment()
+    queue = BCIFrameQueue(maxsize=8)
+    fill(queue, range(5))
+    seen = []
+    scheduler = TickScheduler(env, rate_hz=500, frames=queue, max_frames_per_tick=2,
+                              on_tick=lambda tick, context: seen.append(context["tick"]))
+    asyncio.run(scheduler.run(ticks=4))
+    assert env.tick == 4 and seen == [1, 2, 3, 4]
+    assert env.injected == [(0, 0), (0, 1), (1, 2), (1, 3), (2, 4)]
+    stats = scheduler.stats()
+    assert stats["ticks"] == 4 and stats["frames_injected"] == 5 and stats["queue"]["queued"] == 0
+    assert stats["target_hz"] == 500 and stats["achieved_hz"] > 0
+
+
+def test_scheduler_stops_on_request_or_duration():
+    env = CountingEnvironment()
+    scheduler = TickScheduler(env, rate_hz=1000)
+    scheduler.on_tick = lambda tick, context: tick == 3 and scheduler.stop()
+    asyncio.run(scheduler.run())
+    assert env.tick == 3
+
+    timed = TickScheduler(CountingEnvironment(), rate_hz=100)
+    asyncio.run(timed.run(duration=0.045))  # slots at 0, 10, ..., 40 ms
+    assert 1 <= timed.ticks <= 5
@@ -0,0 +1,102 @@
+import math
+
+import numpy as np
+import pytest
+
+from consciousness_blockchain import ConsciousnessLedger
+from tick_snapshots import SnapshotPolicy
+
+
+def scripted_contexts(ticks=70, scalars_only=False):
+    # Mostly stable scalars, with a dense float, a sparse int, a key that comes and
+    # goes, a type change, a float flipping to -0.0 and back and an in-place edited
+    # list (left out for scalars_only, which keeps the buffered scalar path in use)
+    rng = np.random.default_rng(1)
+    context = {"entropy": 0.1, "stability": 1.0, "dream_effect": False, "phase": 0, "label": "calm", "drift": 0.0}
+    if not scalars_only:
+        context["trail"] = [0]
+    for tick in range(1, ticks + 1):
+        context["entropy"] = float(rng.random())
+        if tick % 7 == 0:
+            context["phase"] += 1
+        if tick % 11 == 0:
+            context["dream_effect"] = not context["dream_effect"]
+        if tick == 20:
+            context["theme"] = 1.5
+        if tick == 30:
+            del context["theme"]
+        if tick == 40:
+            context["stability"] = 1  # float -> int
+        if tick == 45:
+            context["stability"] = -0.0
+        if tick in (12, 33):
+            context["drift"] = -context["drift"]  # 0.0 -> -0.0 -> 0.0, equal under ==
+        if 50 <= tick < 55 and not scalars_only:
+            context["trail"].append(tick)
+        if tick == 60:
+            context["entropy"] = math.nan
+        yield tick, context
+
+
+def record_all(policy, ticks=70, scalars_only=False):
+    ledger, history = ConsciousnessLedger(), {}
+    for tick, context in scripted_contexts(ticks, scalars_only):
+        history[tick] = {key: list(value) if isinstance(value, list) else value for key, value in context.items()}
+        policy.record(ledger, tick, context)
+    policy.flush(ledger)
+    return ledger, history
+
+
+def same_value(x, y):
+    if isinstance(x, float) and isinstance(y, float):
+        return (x != x and y != y) or (x == y and math.copysign(1, x) == math.copysign(1, y))
+    return x == y and type(x) is type(y)
+
+
+def same_context(a, b):
+    return a.keys() == b.keys() and all(same_value(a[k], b[k]) for k in a)
+
+
+@pytest.mark.parametrize("scalars_only", [False, True])
+@pytest.mark.parametrize("interval", [1, 5, 16, 100])
+def test_keyframe_replay_is_exact_for_every_tick(interval, scalars_only):
+    policy = SnapshotPolicy.keyframes(interval)
+    ledger, history = record_all(policy, scalars_only=scalars_only)
+    for tick, expected in history.items():
+        assert same_context(policy.replay(ledger, tick), expected), tick
+
+
+def test_keyframes_store_far_less_than_full_snapshots():
+    full, _ = record_all(SnapshotPolicy())
+    keyframes, _ = record_all(SnapshotPolicy.keyframes(16))
+    assert len(full.chain) == 71
+    assert len(keyframes.chain) == 1 + 2 * 5
+
+
+def test_dense_columns_omit_ticks():
+    policy = SnapshotPolicy.keyframes(16)
+    ledger, _ = record_all(policy, ticks=16)
+    changes = next(ledger.events("tick_delta")).payload["changes"]
+    assert set(changes["entropy"]) == {"values"} and len(changes["entropy"]["values"]) == 15
+    assert changes["phase"]["ticks"].tolist() == [7, 14] and changes["phase"]["values"] == [1, 2]
+
+
+def test_replay_before_anything_was_recorded():
+    policy = SnapshotPolicy.keyframes(8)
+    assert policy.replay(ConsciousnessLedger(), 3) is None
+
+
+def test_sampled_replay_returns_latest_sample():
+    policy = SnapshotPolicy.sampled(10)
+    ledger, history = record_all(policy, ticks=45)
+    assert len(ledger.chain) == 1 + 5
+    assert same_context(policy.replay(ledger, 25), history[21])
+
+
+def test_full_snapshots_keep_the_original_payload():
+    policy = SnapshotPolicy()
+    ledger, history = record_all(policy, ticks=12)
+    assert all(block.payload.keys() == {"context_snapshot"} for block in ledger.events("tick"))
+    assert same_context(policy.replay(ledger, 7), history[7])
+    assert same_context(policy.replay(ledger, 50), history[12])
+    assert policy.replay(ledger, 0) is None